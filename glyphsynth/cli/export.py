@@ -1,4 +1,5 @@
 import logging
+from pathlib import Path
 
 import rich.traceback
 import typer
@@ -40,7 +41,9 @@ logging.basicConfig(
 @app.command(no_args_is_help=True)
 def export(
     fqcn: str = typer.Argument(help="FQCN of drawing(s) to export"),
-    output_path: str = typer.Argument(help="Output path (file or folder)"),
+    output_path: str = typer.Argument(
+        help="Output path (file, folder or archive)"
+    ),
     output_modpath: bool = typer.Option(
         False,
         "--output-modpath",
@@ -56,12 +59,53 @@ def export(
         "--png",
         help="Write .png to folder (Linux only)",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        help="Number of worker processes for exporting deferred specs",
+    ),
+    shard: str = typer.Option(
+        None,
+        "--shard",
+        metavar="INDEX/COUNT",
+        help="Only export the given 0-based shard of COUNT shards, e.g. `0/4`",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Skip drawings already exported with matching parameters",
+    ),
 ):
     export_drawings(
-        fqcn, output_path, output_modpath=output_modpath, svg=svg, png=png
+        fqcn,
+        Path(output_path),
+        output_modpath=output_modpath,
+        svg=svg,
+        png=png,
+        jobs=jobs,
+        shard=_parse_shard(shard) if shard else None,
+        resume=resume,
     )
 
 
+def _parse_shard(shard: str) -> tuple[int, int]:
+    try:
+        index, count = (int(s) for s in shard.split("/"))
+    except ValueError:
+        raise typer.BadParameter(
+            f"Expected INDEX/COUNT, got: {shard}", param_hint="--shard"
+        )
+
+    if not 0 <= index < count:
+        raise typer.BadParameter(
+            f"Index must be in range [0, {count}), got: {index}",
+            param_hint="--shard",
+        )
+
+    return (index, count)
+
+
 def run():
     app()
 
@@ -0,0 +1,66 @@
+"""
+Top-level CLI, providing each command as a subcommand.
+"""
+
+from pathlib import Path
+
+import typer
+
+from ..drawing.export import merge_manifests
+from ..drawing.serve import DEFAULT_ALLOW, RenderService, serve_drawings
+from .export import export
+
+app = typer.Typer(
+    rich_markup_mode="markdown",
+    no_args_is_help=True,
+    add_completion=False,
+)
+
+app.command(no_args_is_help=True)(export)
+
+
+@app.command(no_args_is_help=True)
+def merge(
+    output_path: str = typer.Argument(help="Output path of sharded export"),
+    count: int = typer.Argument(help="Number of shards"),
+):
+    """
+    Merge manifests written by each shard of a sharded export.
+    """
+    files = merge_manifests(Path(output_path), count)
+    typer.echo(f"Merged {count} manifests: {len(files)} files")
+
+
+@app.command()
+def serve(
+    port: int = typer.Option(8000, "--port", help="Port to bind"),
+    cache_mb: int = typer.Option(
+        64, "--cache-mb", help="Maximum size of rendered content cache in MiB"
+    ),
+    raster_jobs: int = typer.Option(
+        4, "--raster-jobs", help="Maximum number of concurrent rasterizations"
+    ),
+    allow: list[str] = typer.Option(
+        list(DEFAULT_ALLOW),
+        "--allow",
+        help="Module prefix from which drawings may be imported (repeatable)",
+    ),
+):
+    """
+    Serve drawings rendered on request at http://127.0.0.1, e.g.
+    `/module.MyDrawing.svg?param=value&scale=2&fmt=png`.
+    """
+    service = RenderService(
+        cache_limit=cache_mb * 1024 * 1024,
+        raster_jobs=raster_jobs,
+        allow=allow,
+    )
+    serve_drawings(port=port, service=service)
+
+
+def run():
+    app()
+
+
+if __name__ == "__main__":
+    run()
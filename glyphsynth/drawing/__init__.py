@@ -1,8 +1,9 @@
 from pyrollup import rollup
 
-from . import drawing, export, graphics
+from . import drawing, export, graphics, serve
 from .drawing import *  # noqa
 from .export import *  # noqa
 from .graphics import *  # noqa
+from .serve import *  # noqa
 
-__all__ = rollup(drawing, graphics, export)
+__all__ = rollup(drawing, graphics, export, serve)
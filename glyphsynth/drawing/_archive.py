@@ -0,0 +1,96 @@
+"""
+Writing of exported files directly into an archive.
+"""
+from __future__ import annotations
+
+import io
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from types import TracebackType
+
+TAR_MODES: dict[str, str] = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+"""
+Mapping of tar archive suffixes to the corresponding `tarfile` mode.
+"""
+
+ZIP_SUFFIX = ".zip"
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Check whether the path has a supported archive suffix.
+    """
+    return _get_suffix(path) is not None
+
+
+class ArchiveWriter:
+    """
+    Streams files into a tar or zip archive as they're exported, without
+    writing individual files.
+    """
+
+    _tar: tarfile.TarFile | None = None
+    _zip: zipfile.ZipFile | None = None
+
+    def __init__(self, path: Path):
+        suffix = _get_suffix(path)
+        assert suffix is not None, f"Not an archive: {path}"
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if suffix == ZIP_SUFFIX:
+            self._zip = zipfile.ZipFile(
+                path, "w", compression=zipfile.ZIP_DEFLATED
+            )
+        else:
+            self._tar = tarfile.open(path, TAR_MODES[suffix])
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ):
+        self.close()
+
+    def write(self, name: str, data: bytes):
+        """
+        Write a file with the given path within the archive.
+        """
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        else:
+            assert self._tar is not None
+
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+
+def _get_suffix(path: Path) -> str | None:
+    name = path.name.lower()
+
+    for suffix in [*TAR_MODES.keys(), ZIP_SUFFIX]:
+        if name.endswith(suffix):
+            return suffix
+
+    return None
@@ -1,27 +1,67 @@
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from functools import cached_property
-from typing import Any, Iterable, cast
+from typing import Any, Generator, Iterable, cast
+from xml.etree import ElementTree
 
+import svgwrite.base
 import svgwrite.container
 from pydantic import ConfigDict
 
 from ._utils import extract_type_param
-from .graphics._container import BaseGraphicsContainer
+from .graphics._container import BaseGraphicsContainer, _get_elem_kwargs
 from .graphics._export import ExportContainer
 from .graphics._model import BaseFieldsModel
 from .graphics.elements._factory import ElementFactory
 from .graphics.elements._mixins import PresentationMixin, TransformMixin
+from .graphics.elements.base import BaseElement
+from .graphics.geometry import BBox, get_bbox, get_version
 from .graphics.properties import Properties
+from .graphics.spatial import SpatialIndex
 
 __all__ = [
     "BaseParams",
     "BaseDrawing",
+    "DrawingFragment",
     "EmptyParams",
     "Drawing",
+    "output_scale",
 ]
 
+_output_scale: ContextVar[float] = ContextVar("output_scale", default=1.0)
+"""
+Output scale of the canonical user units of the drawing currently being
+drawn, or of top-level drawings.
+"""
+
+
+@contextmanager
+def output_scale(scale: float) -> Generator[None, None, None]:
+    """
+    Set the scale from user units to output pixels of top-level drawings
+    created within this context, e.g. to create a thumbnail with less
+    detail. See {obj}`BaseDrawing.output_scale`.
+
+    Example:
+
+    ```python
+    with output_scale(0.1):
+        drawing = MyDrawing()
+
+    drawing.export_png(path, scale=0.1)
+    ```
+    """
+    token = _output_scale.set(scale)
+    try:
+        yield
+    finally:
+        _output_scale.reset(token)
+
 
 class BaseParams(BaseFieldsModel):
     """
@@ -86,11 +126,33 @@ class BaseDrawing[ParamsT: BaseParams](
     if no type parameter provided.
     """
 
+    output_scale: float
+    """
+    Expected scale from this drawing's canonical user units to output
+    pixels, available in {obj}`BaseDrawing.draw` in order to choose a level
+    of detail. It's the product of the scale set by {obj}`output_scale`
+    and, for drawings created while drawing a parent drawing, the parent's
+    output scale, along with the scale from this drawing's canonical size
+    to its size. Transforms applied after drawing aren't accounted for.
+    """
+
     _nested_glyphs: list[BaseDrawing]
     """
     List of glyphs nested under this one, mostly for debugging.
     """
 
+    _elements: list[BaseElement]
+    """
+    List of elements created by this drawing's draw APIs.
+    """
+
+    _spatial_index: tuple[
+        int, SpatialIndex[BaseDrawing | BaseElement]
+    ] | None = None
+    """
+    Spatial index with the geometry version with which it was built.
+    """
+
     def __init__(
         self,
         *,
@@ -108,6 +170,7 @@ class BaseDrawing[ParamsT: BaseParams](
         super().__init__(drawing_id, properties, size_)
 
         self._nested_glyphs = []
+        self._elements = []
 
         # set params
         params_cls = cast(ParamsT, type(self).get_params_cls())
@@ -122,8 +185,19 @@ class BaseDrawing[ParamsT: BaseParams](
         # invoke post-init since canonical_size may be set in init()
         self._post_init()
 
+        # nested drawings created while drawing are scaled along with this
+        # drawing
+        self.output_scale = _output_scale.get() * self._get_wrapper_scale()
+        token = _output_scale.set(self.output_scale)
+
         # invoke subclass's drawing logic
-        self.draw()
+        try:
+            self.draw()
+        finally:
+            _output_scale.reset(token)
+
+        if self.auto_size and self.canonical_size is None:
+            self.fit_to_content()
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(drawing_id={self.drawing_id})"
@@ -168,6 +242,41 @@ class BaseDrawing[ParamsT: BaseParams](
         """
         return (self.canonical_width / 2, self.canonical_height / 2)
 
+    @property
+    def spatial_index(self) -> SpatialIndex[BaseDrawing | BaseElement]:
+        """
+        Index of nested drawings and elements placed directly in this
+        drawing, by bounding box in canonical coordinates. Built upon first
+        access and rebuilt upon access after any mutation of its content.
+        """
+        # group is an ancestor of all content, including its canonical svg
+        version = get_version(self._group)
+
+        if self._spatial_index is None or self._spatial_index[0] != version:
+            index = SpatialIndex(self._iter_placed_children())
+            self._spatial_index = (version, index)
+
+        return self._spatial_index[1]
+
+    def get_children_at(
+        self, x: float, y: float
+    ) -> list[BaseDrawing | BaseElement]:
+        """
+        Get nested drawings and elements placed directly in this drawing
+        whose bounding box contains the point, given in canonical
+        coordinates. They're returned in the order they were placed, so
+        the topmost is last.
+        """
+        return self.spatial_index.query_point(x, y)
+
+    def get_children_in(self, region: BBox) -> list[BaseDrawing | BaseElement]:
+        """
+        Get nested drawings and elements placed directly in this drawing
+        whose bounding box intersects the region, given in canonical
+        coordinates. They're returned in the order they were placed.
+        """
+        return self.spatial_index.query_rect(region)
+
     @classmethod
     def get_params_cls(cls) -> type[ParamsT]:
         """
@@ -180,7 +289,7 @@ class BaseDrawing[ParamsT: BaseParams](
         ...
 
     def insert_drawing[
-        DrawingT: BaseDrawing
+        DrawingT: BaseDrawing | DrawingFragment
     ](
         self,
         drawing: DrawingT,
@@ -212,6 +321,47 @@ class BaseDrawing[ParamsT: BaseParams](
     def _container(self) -> svgwrite.container.SVG:
         return self._svg
 
+    def _iter_placed_children(
+        self,
+    ) -> Generator[tuple[BBox, BaseDrawing | BaseElement], None, None]:
+        """
+        Get bounding box of each nested drawing and element placed directly
+        in this drawing's canonical svg.
+        """
+        children: dict[int, BaseDrawing | BaseElement] = {
+            id(elem._element): elem for elem in self._elements
+        }
+
+        for drawing in self._nested_glyphs:
+            if drawing._parent is self and drawing._wrapper_insert is not None:
+                children[id(drawing._wrapper_insert)] = drawing
+
+        for elem in self._svg.elements:
+            if (child := children.get(id(elem))) is None:
+                continue
+
+            bbox = get_bbox(
+                elem,
+                self._canonical_size_norm,
+                ancestors=(self._group, self._svg),
+            )
+
+            if bbox is not None:
+                yield (bbox, child)
+
+    def _get_wrapper_scale(self) -> float:
+        """
+        Get scale from canonical user units to user units of this drawing's
+        size, preserving aspect ratio.
+        """
+        if self._size is None or self.canonical_size is None:
+            return 1.0
+
+        return min(
+            self._size[0] / float(self.canonical_size[0]),
+            self._size[1] / float(self.canonical_size[1]),
+        )
+
     def _pre_init(self):
         """
         Can be overridden by subclass for any init needed before user's init().
@@ -219,6 +369,84 @@ class BaseDrawing[ParamsT: BaseParams](
         ...
 
 
+@dataclass(frozen=True, eq=False)
+class DrawingFragment:
+    """
+    Element tree of a drawing as it's placed in a parent drawing, detached
+    from the drawing itself. It can be inserted or defined as a symbol in
+    place of the drawing, e.g. to combine many drawings without keeping
+    each of them in memory.
+
+    Example:
+
+    ```python
+    fragment = DrawingFragment.new(MyDrawing(drawing_id="my-drawing"))
+
+    # insert the drawing's output, releasing the drawing itself
+    drawing = Drawing()
+    drawing.insert_drawing(fragment, (100, 100))
+    ```
+    """
+
+    drawing_id: str | None
+    cls_name: str
+    """
+    Name of the drawing's class, from which element classes are derived.
+    """
+
+    size: tuple[float, float]
+    xml: ElementTree.Element
+    """
+    Element tree of the drawing's group for placement in a parent.
+    """
+
+    @classmethod
+    def new(cls, drawing: BaseDrawing) -> DrawingFragment:
+        return cls(
+            drawing.drawing_id,
+            type(drawing).__name__,
+            drawing.size,
+            drawing._group.get_xml(),
+        )
+
+    @property
+    def width(self) -> float:
+        return self.size[0]
+
+    @property
+    def height(self) -> float:
+        return self.size[1]
+
+    @property
+    def _id_norm(self) -> str:
+        return self.drawing_id or self.cls_name
+
+    def _get_elem_kwargs(self, suffix: str | None = None) -> dict[str, str]:
+        return _get_elem_kwargs(self.drawing_id, self.cls_name, suffix)
+
+    def _create_element(self) -> svgwrite.base.BaseElement:
+        return _FragmentElement(self.xml)
+
+
+class _FragmentElement(svgwrite.base.BaseElement):
+    """
+    `svgwrite` element with the content of an element tree. Its children are
+    copied upon each output, as export replaces ids in place.
+    """
+
+    def __init__(self, xml: ElementTree.Element):
+        super().__init__()
+
+        self.elementname = xml.tag
+        self.attribs = dict(xml.attrib)
+        self.elements = list(xml)
+
+    def get_xml(self) -> ElementTree.Element:
+        xml = ElementTree.Element(self.elementname, self.attribs)
+        xml.extend(copy.deepcopy(self.elements))
+        return xml
+
+
 class EmptyParams(BaseParams):
     pass
 
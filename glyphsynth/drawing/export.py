@@ -2,22 +2,43 @@
 Export functionality, wrapped by CLI and can be used programmatically.
 """
 
+from __future__ import annotations
+
+import hashlib
 import importlib
+import json
 import logging
 import os
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Callable, Iterable, cast
+from typing import Any, Callable, Generator, Iterable, TextIO, cast
 
-from .drawing import BaseDrawing
+from ._archive import ArchiveWriter, is_archive
+from .drawing import BaseDrawing, BaseParams
+from .graphics.properties import Properties
 
 __all__ = [
     "ExportSpec",
+    "DeferredExportSpec",
+    "LazyExportSpec",
+    "FileExportSpec",
     "export_drawings",
+    "merge_manifests",
 ]
 
-type DrawingObjType = type[BaseDrawing] | BaseDrawing | ExportSpec
+type DrawingObjType = type[
+    BaseDrawing
+] | BaseDrawing | ExportSpec | DeferredExportSpec | LazyExportSpec | FileExportSpec
 """
 Represents a drawing to be exported. If a BaseDrawing subclass or instance is
 provided, an ExportSpec is automatically created using the output path.
@@ -32,6 +53,8 @@ Recursive type to represent an object which can be handled by exporter.
 
 INDENT = 4
 
+MANIFEST_FILENAME = "manifest.json"
+
 
 @dataclass
 class ExportSpec:
@@ -45,6 +68,164 @@ class ExportSpec:
     module: str | None = None
 
 
+@dataclass
+class DeferredExportSpec:
+    """
+    Container for the information needed to construct a drawing, and path in
+    which to place the exported artifact. The drawing is only constructed upon
+    export, so the spec is cheap to pickle and send to a worker process.
+
+    The drawing class is pickled by reference, so it must be importable from
+    its module when exporting with multiple jobs.
+    """
+
+    drawing_cls: type[BaseDrawing]
+    path: Path
+    module: str | None = None
+    drawing_id: str | None = None
+    params: dict[str, Any] | None = None
+    properties: dict[str, Any] | None = None
+    size: tuple[float, float] | None = None
+
+    @classmethod
+    def new(
+        cls,
+        drawing_cls: type[BaseDrawing],
+        path: Path,
+        drawing_id: str | None = None,
+        params: BaseParams | None = None,
+        properties: Properties | None = None,
+        size: tuple[float | int, float | int] | None = None,
+        module: str | None = None,
+    ) -> DeferredExportSpec:
+        """
+        Create a spec from params and properties, serializing them via their
+        respective models.
+        """
+        params_fields = drawing_cls.get_params_cls().model_fields.keys()
+
+        params_ = (
+            {
+                k: v
+                for k, v in params.model_dump(exclude_unset=True).items()
+                if k in params_fields
+            }
+            if params is not None
+            else None
+        )
+        properties_ = (
+            properties.model_dump(exclude_unset=True)
+            if properties is not None
+            else None
+        )
+        size_ = (float(size[0]), float(size[1])) if size else None
+
+        return cls(
+            drawing_cls,
+            path,
+            module=module,
+            drawing_id=drawing_id,
+            params=params_,
+            properties=properties_,
+            size=size_,
+        )
+
+    def create_drawing(self) -> BaseDrawing:
+        """
+        Construct the drawing described by this spec.
+        """
+        params_cls = self.drawing_cls.get_params_cls()
+
+        params = (
+            params_cls.model_validate(self.params)
+            if self.params is not None
+            else None
+        )
+        properties = (
+            Properties.model_validate(self.properties)
+            if self.properties is not None
+            else None
+        )
+
+        return self.drawing_cls(
+            drawing_id=self.drawing_id,
+            params=params,
+            properties=properties,
+            size=self.size,
+        )
+
+
+@dataclass
+class LazyExportSpec:
+    """
+    Container for a function which constructs a drawing, and path in which
+    to place the exported artifact. As with {obj}`DeferredExportSpec`, the
+    drawing is only constructed upon export, so specs skipped when sharding
+    or resuming are never constructed.
+
+    The function is called in the exporting process, so unlike a deferred
+    spec it may share state with other specs, e.g. drawings constructed for
+    previous specs.
+    """
+
+    create: Callable[[], BaseDrawing]
+    path: Path
+    drawing_id: str
+    """
+    Normalized id of the drawing to be constructed, which determines its
+    filename.
+    """
+
+    values: Any
+    """
+    Values which determine the drawing, serializable as JSON, used to detect
+    changes when resuming.
+    """
+
+    module: str | None = None
+
+    def create_drawing(self) -> BaseDrawing:
+        """
+        Construct the drawing described by this spec.
+        """
+        drawing = self.create()
+
+        assert (
+            drawing._id_norm == self.drawing_id
+        ), f"Drawing id mismatch: {drawing._id_norm} != {self.drawing_id}"
+
+        return drawing
+
+
+@dataclass
+class FileExportSpec:
+    """
+    Container for content of a non-drawing file, e.g. an index of other
+    exported files, and path of the file to create including its filename.
+    """
+
+    path: Path
+    content: bytes
+    module: str | None = None
+
+    @classmethod
+    def from_json(
+        cls, path: Path, obj: Any, module: str | None = None
+    ) -> FileExportSpec:
+        """
+        Create a spec with the object serialized as JSON.
+        """
+        return cls(path, json.dumps(obj, indent=INDENT).encode(), module)
+
+
+type ExportSpecType = (
+    ExportSpec | DeferredExportSpec | LazyExportSpec | FileExportSpec
+)
+"""
+Normalized export spec, as handled by exporter.
+"""
+
+
 def export_drawings(
     fqcn: str,
     output_path: Path,
@@ -52,12 +233,15 @@ def export_drawings(
     svg: bool = False,
     png: bool = False,
     in_place_raster: bool = False,
+    jobs: int = 1,
+    shard: tuple[int, int] | None = None,
+    resume: bool = False,
 ):
     """
     Export all drawings from the object imported from the fully-qualified
     class name, which may be any of the following:
 
-    - ExportSpec
+    - ExportSpec, DeferredExportSpec or LazyExportSpec
     - BaseDrawing subclass or instance
     - Iterable
     - Callable
@@ -65,32 +249,486 @@ def export_drawings(
 
     The object imported from the FQCN is recursed to collect all drawing objects.
     If a `BaseDrawing` is encountered,
+
+    A `FileExportSpec` is written as-is to its path, with its path
+    qualified by the module if `output_modpath` is set.
+
+    If `jobs` is greater than 1, drawings from `DeferredExportSpec` instances
+    are constructed and exported in a pool of worker processes. Other specs
+    are exported in this process.
+
+    If `shard` is provided as `(index, count)`{l=python}, only the specs
+    assigned to the 0-based shard index are exported. Specs are assigned by
+    a stable hash of their output path, so each of `count` machines can
+    export a disjoint subset without coordination. Drawings of deferred and
+    lazy specs assigned to other shards are never constructed. A manifest
+    of exported files is written to the output path for each shard; use
+    {obj}`merge_manifests` to combine them.
+
+    Each completed export is recorded in a journal in the output path. If
+    `resume` is set, specs recorded as completed with the same parameters,
+    and whose files still exist, are skipped. Deferred and lazy specs are
+    compared by the values describing them, so the drawings of skipped
+    specs are never constructed.
+
+    If the output path is an archive (`.tar`, `.tar.gz`, `.tgz`, `.tar.bz2`,
+    `.tar.xz` or `.zip`), each exported file is streamed into the archive
+    with the same layout as it would have in an output folder. In this case
+    the journal and manifests are placed alongside the archive, and
+    resuming is not supported.
     """
 
     logging.info(f"Exporting '{fqcn}' -> '{output_path}'")
 
-    containers: list[ExportSpec] = _extract_containers(fqcn)
+    if shard is not None:
+        index, count = shard
+        if not 0 <= index < count:
+            raise ValueError(f"Invalid shard: {index}/{count}")
+
+    archive = is_archive(output_path)
+    if archive and resume:
+        raise ValueError(f"Cannot resume export to archive: {output_path}")
+
+    base_path = _get_base_path(output_path)
+    meta_path = _get_meta_path(output_path)
 
-    for container in containers:
-        export_path: Path
+    journal = _Journal(meta_path, _get_shard_filename("journal.jsonl", shard))
+    manifest: list[str] = []
 
-        if output_modpath:
-            # if enabled, include drawing's modpath in output path hierarchy
-            module = container.module or container.drawing.__module__
-            export_path = (
-                output_path / module.replace(".", "/") / container.path
+    def iter_jobs() -> Generator[_ExportJob, None, None]:
+        for container in _extract_containers(fqcn):
+            job = _ExportJob.new(
+                container, output_path, base_path, output_modpath, svg, png
             )
-        else:
-            export_path = output_path / container.path
 
-        _export_drawing(
-            container.drawing,
+            if shard is not None:
+                index, count = shard
+                if _get_shard_index(job.rel_path, count) != index:
+                    continue
+
+            manifest.extend(job.files)
+
+            if resume and journal.is_completed(job):
+                logging.info(f"Skipping completed export: '{job.rel_path}'")
+                continue
+
+            yield job
+
+    with journal.open(resume), (
+        ArchiveWriter(output_path) if archive else nullcontext()
+    ) as writer:
+        worker: Callable[[ExportSpecType, Path], list[tuple[Path, bytes]]]
+
+        # when writing to an archive, workers return file content to be
+        # written here; otherwise they write files directly
+        worker = partial(
+            _render_spec if archive else _export_spec,
+            svg=svg,
+            png=png,
+            in_place_raster=in_place_raster,
+        )
+
+        def on_complete(job: _ExportJob, files: list[tuple[Path, bytes]]):
+            if writer is not None:
+                for path, data in files:
+                    writer.write(path.relative_to(base_path).as_posix(), data)
+
+            journal.record(job)
+
+        _run_jobs(iter_jobs(), worker, on_complete, jobs)
+
+    if shard is not None:
+        _write_manifest(meta_path, shard, manifest)
+
+
+def merge_manifests(output_path: Path, count: int) -> list[str]:
+    """
+    Merge manifests written by each of `count` shards into a single
+    manifest in the output path, returning the combined list of files.
+
+    :raises ValueError: If a shard's manifest is missing or shards
+    exported overlapping files
+    """
+
+    files: set[str] = set()
+
+    for index in range(count):
+        shard_path = output_path / _get_shard_filename(
+            MANIFEST_FILENAME, (index, count)
+        )
+
+        if not shard_path.exists():
+            raise ValueError(f"Missing manifest for shard {index}/{count}")
+
+        shard_files: list[str] = json.loads(shard_path.read_text())["files"]
+
+        if overlap := files.intersection(shard_files):
+            raise ValueError(
+                f"Files exported by multiple shards: {sorted(overlap)}"
+            )
+
+        files.update(shard_files)
+
+    files_sorted = sorted(files)
+
+    with (output_path / MANIFEST_FILENAME).open("w") as fh:
+        json.dump({"files": files_sorted}, fh, indent=INDENT)
+
+    return files_sorted
+
+
+@dataclass
+class _ExportJob:
+    """
+    Export spec with its resolved output paths.
+    """
+
+    container: ExportSpecType
+    export_path: Path
+
+    rel_path: Path
+    """
+    Path of exported file relative to the base output path, without
+    extension if the export path is a folder.
+    """
+
+    files: list[str]
+    """
+    Paths of files written by this job relative to the base output path.
+    """
+
+    key: str
+    """
+    Fingerprint of the drawing's parameters and export formats.
+    """
+
+    @classmethod
+    def new(
+        cls,
+        container: ExportSpecType,
+        output_path: Path,
+        base_path: Path,
+        output_modpath: bool,
+        svg: bool,
+        png: bool,
+    ) -> _ExportJob:
+        export_path = _get_export_path(container, output_path, output_modpath)
+        rel_path = export_path.relative_to(base_path)
+
+        files: list[str]
+
+        if isinstance(container, FileExportSpec):
+            assert export_path.suffix, f"File path has no suffix: {export_path}"
+
+        if export_path.suffix:
+            files = [rel_path.as_posix()]
+        else:
+            rel_path /= _get_drawing_id_norm(container)
+            files = [
+                f"{rel_path.as_posix()}.{suffix}"
+                for suffix, enabled in (("svg", svg), ("png", png))
+                if enabled
+            ]
+
+        return cls(
+            container,
             export_path,
-            svg,
-            png,
-            in_place_raster,
+            rel_path,
+            files,
+            _get_fingerprint(container, files),
+        )
+
+
+class _Journal:
+    """
+    Append-only record of completed exports, one JSON object per line.
+    """
+
+    _base_path: Path
+    _path: Path
+    _completed: dict[str, str]
+    _fh: TextIO | None = None
+
+    def __init__(self, base_path: Path, filename: str):
+        self._base_path = base_path
+        self._path = base_path / filename
+        self._completed = {}
+
+    @contextmanager
+    def open(self, resume: bool) -> Generator[_Journal, None, None]:
+        """
+        Open journal for appending, loading completed exports if resuming
+        or truncating it otherwise.
+        """
+        if resume and self._path.exists():
+            self._load()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._path.open("a" if resume else "w") as fh:
+            self._fh = fh
+            try:
+                yield self
+            finally:
+                self._fh = None
+
+    def is_completed(self, job: _ExportJob) -> bool:
+        """
+        Check whether the job was completed with the same fingerprint and
+        its files still exist, which doesn't require constructing its
+        drawing.
+        """
+        return self._completed.get(job.rel_path.as_posix()) == job.key and all(
+            (self._base_path / f).exists() for f in job.files
         )
 
+    def record(self, job: _ExportJob):
+        assert self._fh is not None
+
+        entry = {"path": job.rel_path.as_posix(), "key": job.key}
+        self._fh.write(json.dumps(entry) + "\n")
+        self._fh.flush()
+
+    def _load(self):
+        with self._path.open() as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # last line may be truncated if export was interrupted
+                    logging.warning(f"Ignoring invalid journal entry: {line}")
+                    continue
+
+                self._completed[entry["path"]] = entry["key"]
+
+
+def _get_export_path(
+    container: ExportSpecType, output_path: Path, output_modpath: bool
+) -> Path:
+    if output_modpath:
+        # if enabled, include drawing's modpath in output path hierarchy
+        module = container.module or _get_drawing_module(container)
+        return output_path / module.replace(".", "/") / container.path
+
+    return output_path / container.path
+
+
+def _get_base_path(output_path: Path) -> Path:
+    """
+    Get folder or archive relative to which exported files are recorded,
+    accounting for output path being a file.
+    """
+    if output_path.suffix and not is_archive(output_path):
+        return output_path.parent
+    return output_path
+
+
+def _get_meta_path(output_path: Path) -> Path:
+    """
+    Get folder in which to place journal and manifests.
+    """
+    return output_path.parent if output_path.suffix else output_path
+
+
+def _get_drawing_module(container: ExportSpecType) -> str:
+    # get module without constructing a deferred drawing
+    if isinstance(container, (LazyExportSpec, FileExportSpec)):
+        raise ValueError(f"Module required for spec: {container.path}")
+    elif isinstance(container, DeferredExportSpec):
+        return container.drawing_cls.__module__
+    return container.drawing.__module__
+
+
+def _get_drawing_id_norm(container: ExportSpecType) -> str:
+    # get drawing id without constructing a deferred drawing
+    if isinstance(container, DeferredExportSpec):
+        return container.drawing_id or container.drawing_cls.__name__
+    elif isinstance(container, LazyExportSpec):
+        return container.drawing_id
+    return container.drawing._id_norm
+
+
+def _get_fingerprint(container: ExportSpecType, files: list[str]) -> str:
+    """
+    Get a hash of everything which determines the exported files, without
+    constructing a deferred drawing.
+    """
+    values: dict[str, Any]
+
+    if isinstance(container, FileExportSpec):
+        values = {"content": hashlib.sha256(container.content).hexdigest()}
+    elif isinstance(container, DeferredExportSpec):
+        values = {
+            "cls": _get_qualname(container.drawing_cls),
+            "params": container.params,
+            "properties": container.properties,
+            "size": container.size,
+        }
+    elif isinstance(container, LazyExportSpec):
+        values = {"values": container.values}
+    else:
+        drawing = container.drawing
+        values = {
+            "cls": _get_qualname(type(drawing)),
+            "params": drawing.params.model_dump(exclude_unset=True),
+            "properties": drawing.properties.model_dump(exclude_unset=True),
+            "size": drawing._size,
+        }
+
+    values["files"] = files
+
+    values_json = json.dumps(values, sort_keys=True, default=repr)
+    return hashlib.sha256(values_json.encode()).hexdigest()
+
+
+def _get_qualname(drawing_cls: type[BaseDrawing]) -> str:
+    return f"{drawing_cls.__module__}.{drawing_cls.__qualname__}"
+
+
+def _get_shard_index(rel_path: Path, count: int) -> int:
+    """
+    Get shard to which the output path is assigned using a stable hash,
+    independent of the interpreter's hash seed.
+    """
+    digest = hashlib.sha256(rel_path.as_posix().encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def _get_shard_filename(filename: str, shard: tuple[int, int] | None) -> str:
+    """
+    Get filename for metadata, qualified by shard if applicable.
+    """
+    if shard is None:
+        return filename
+
+    index, count = shard
+    stem, suffix = filename.split(".", 1)
+
+    return f"{stem}-{index}-{count}.{suffix}"
+
+
+def _write_manifest(
+    base_path: Path, shard: tuple[int, int], manifest: list[str]
+):
+    base_path.mkdir(parents=True, exist_ok=True)
+
+    with (base_path / _get_shard_filename(MANIFEST_FILENAME, shard)).open(
+        "w"
+    ) as fh:
+        json.dump({"shard": list(shard), "files": manifest}, fh, indent=INDENT)
+
+
+def _run_jobs(
+    jobs_iter: Iterable[_ExportJob],
+    worker: Callable[[ExportSpecType, Path], list[tuple[Path, bytes]]],
+    on_complete: Callable[[_ExportJob, list[tuple[Path, bytes]]], None],
+    jobs: int,
+):
+    """
+    Run worker for each job, using a process pool for deferred specs if
+    multiple jobs are requested. The number of specs in flight is bounded
+    so they can be consumed lazily.
+    """
+
+    if jobs <= 1:
+        for job in jobs_iter:
+            on_complete(job, worker(job.container, job.export_path))
+        return
+
+    pending: dict[Future, _ExportJob] = {}
+
+    def wait_pending(return_when: str):
+        done, _ = wait(pending, return_when=return_when)
+
+        for future in done:
+            # propagate any exceptions from workers
+            on_complete(pending.pop(future), future.result())
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for job in jobs_iter:
+            if not isinstance(job.container, DeferredExportSpec):
+                on_complete(job, worker(job.container, job.export_path))
+                continue
+
+            future = executor.submit(worker, job.container, job.export_path)
+            pending[future] = job
+
+            if len(pending) >= jobs * 2:
+                wait_pending(FIRST_COMPLETED)
+
+        wait_pending(ALL_COMPLETED)
+
+
+def _get_drawing(
+    container: ExportSpec | DeferredExportSpec | LazyExportSpec,
+) -> BaseDrawing:
+    return (
+        container.create_drawing()
+        if isinstance(container, (DeferredExportSpec, LazyExportSpec))
+        else container.drawing
+    )
+
+
+def _export_spec(
+    container: ExportSpecType,
+    export_path: Path,
+    svg: bool,
+    png: bool,
+    in_place_raster: bool,
+) -> list[tuple[Path, bytes]]:
+    """
+    Export files for the spec, returning an empty list as there's nothing
+    left to write.
+    """
+    if isinstance(container, FileExportSpec):
+        logging.info(f"Writing file: '{export_path}'")
+
+        export_path.parent.mkdir(parents=True, exist_ok=True)
+        export_path.write_bytes(container.content)
+
+        return []
+
+    drawing = _get_drawing(container)
+    _export_drawing(drawing, export_path, svg, png, in_place_raster)
+
+    return []
+
+
+def _render_spec(
+    container: ExportSpecType,
+    export_path: Path,
+    svg: bool,
+    png: bool,
+    in_place_raster: bool,
+) -> list[tuple[Path, bytes]]:
+    """
+    Render files for the spec, returning each file's path and content.
+    """
+    if isinstance(container, FileExportSpec):
+        return [(export_path, container.content)]
+
+    drawing = _get_drawing(container)
+    files: list[tuple[Path, bytes]] = []
+
+    def render(path: Path, out_format: str) -> bytes:
+        logging.info(f"Rendering {out_format}: {drawing} -> '{path}'")
+
+        if out_format == "svg":
+            return drawing.render_svg().encode()
+        elif out_format == "png":
+            return drawing.render_png()
+        raise ValueError(f"Invalid format: {out_format}")
+
+    if export_path.suffix:
+        files.append((export_path, render(export_path, export_path.suffix[1:])))
+    else:
+        for out_format, enabled in (("svg", svg), ("png", png)):
+            if enabled:
+                path = export_path / f"{drawing._id_norm}.{out_format}"
+                files.append((path, render(path, out_format)))
+
+    return files
+
 
 def _export_drawing(
     drawing: BaseDrawing,
@@ -118,7 +756,7 @@ def _export_drawing(
         drawing.export_png(export_path, in_place_raster=in_place_raster)
 
 
-def _extract_containers(fqcn: str) -> list[ExportSpec]:
+def _extract_containers(fqcn: str) -> Generator[ExportSpecType, None, None]:
     """
     Extract all drawings from the provided FQCN, which may be any of the
     following:
@@ -128,14 +766,15 @@ def _extract_containers(fqcn: str) -> list[ExportSpec]:
     - Callable which returns any of the above
     - Module containing any of the above, with symbol names provided via
       `__all__`
+
+    Specs are yielded as they're extracted, so iterables such as variant
+    factories are consumed lazily.
     """
 
     drawing_specs: list[DrawingSpecType]
 
     drawing_specs = _import_drawing_specs(fqcn)
-    containers: list[ExportSpec] = _normalize_drawing_specs(drawing_specs)
-
-    return containers
+    yield from _normalize_drawing_specs(drawing_specs)
 
 
 def _import_drawing_specs(fqcn: str) -> list[DrawingSpecType]:
@@ -176,53 +815,54 @@ def _import_drawing_specs(fqcn: str) -> list[DrawingSpecType]:
 
 def _normalize_drawing_specs(
     drawing_specs: list[DrawingSpecType],
-) -> list[ExportSpec]:
+) -> Generator[ExportSpecType, None, None]:
     """
-    Take an object and return a list of ExportSpec instances.
+    Take an object and yield export spec instances.
     """
 
-    containers: list[ExportSpec] = []
-
     for drawing_spec in drawing_specs:
-        containers_extract = _recurse_drawing_spec(drawing_spec)
-
         # validate returned objects
-        for container in containers_extract:
-            assert isinstance(container, ExportSpec)
-            containers.append(container)
-
-    return containers
+        for container in _recurse_drawing_spec(drawing_spec):
+            assert isinstance(
+                container,
+                (
+                    ExportSpec,
+                    DeferredExportSpec,
+                    LazyExportSpec,
+                    FileExportSpec,
+                ),
+            )
+            yield container
 
 
 def _recurse_drawing_spec(
     drawing_spec: DrawingSpecType,
-) -> list[DrawingSpecType]:
+) -> Generator[ExportSpecType, None, None]:
     """
     Recurse into drawing spec until we find a drawing class, drawing instance, or
     export spec. A container will be created if not found.
     """
 
-    ret: list[ExportSpec] = []
-
-    if isinstance(drawing_spec, ExportSpec):
-        ret.append(drawing_spec)
+    if isinstance(
+        drawing_spec,
+        (ExportSpec, DeferredExportSpec, LazyExportSpec, FileExportSpec),
+    ):
+        yield drawing_spec
 
     elif isinstance(drawing_spec, BaseDrawing):
-        ret.append(ExportSpec(drawing_spec, Path()))
+        yield ExportSpec(drawing_spec, Path())
 
     elif isinstance(drawing_spec, Iterable):
         for spec in drawing_spec:
-            ret += _recurse_drawing_spec(spec)
+            yield from _recurse_drawing_spec(spec)
 
     # function, BaseDrawing subclass, or BaseVariantFactory subclass
     elif isinstance(drawing_spec, Callable):
-        ret += _recurse_drawing_spec(drawing_spec())
+        yield from _recurse_drawing_spec(drawing_spec())
 
     else:
         raise Exception(f"Invalid drawing_spec: {drawing_spec}")
 
-    return ret
-
 
 def _import_all(module: ModuleType) -> list[Any]:
     all_: list[str] | None = None
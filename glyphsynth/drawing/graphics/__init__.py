@@ -2,11 +2,17 @@ import os
 
 from pyrollup import rollup
 
-from . import elements, properties
+from . import elements, geometry, optimize, path, properties, spatial
 from .elements import *  # noqa
+from .geometry import *  # noqa
+from .optimize import *  # noqa
+from .path import *  # noqa
 from .properties import *  # noqa
+from .spatial import *  # noqa
 
-__all__ = ["RASTER_SUPPORT"] + rollup(elements, properties)
+__all__ = ["RASTER_SUPPORT"] + rollup(
+    elements, geometry, optimize, path, properties, spatial
+)
 
 RASTER_SUPPORT: bool = os.name == "posix"
 """
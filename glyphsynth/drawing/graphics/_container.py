@@ -6,6 +6,7 @@ from svgwrite.container import SVG, Group
 from svgwrite.drawing import Drawing
 
 from .elements._mixins import TransformMixin
+from .geometry import BBox, _set_parent, get_bbox, get_content_bbox, invalidate
 from .properties import Properties
 
 
@@ -73,6 +74,12 @@ class BaseGraphicsContainer(TransformMixin):
     this field is not `None`.
     """
 
+    auto_size: bool = False
+    """
+    Whether to fit the canonical size to the content after drawing, if no
+    canonical size was set. See {obj}`fit_to_content`.
+    """
+
     _id: str | None
     """
     Unique id for this container.
@@ -101,6 +108,21 @@ class BaseGraphicsContainer(TransformMixin):
     as <svg> does not support transformations in SVG 1.1.
     """
 
+    _wrapper_scale: SVG | None = None
+    """
+    Wrapper SVG container to handle scaling, if a size was provided.
+    """
+
+    _wrapper_insert: SVG | None = None
+    """
+    Wrapper SVG container for placement, if inserted in a parent drawing.
+    """
+
+    _parent: BaseGraphicsContainer | None = None
+    """
+    Drawing in which this drawing was inserted, if any.
+    """
+
     def __init__(
         self,
         id_: str | None,
@@ -158,6 +180,63 @@ class BaseGraphicsContainer(TransformMixin):
     def center(self) -> tuple[float, float]:
         return (self.center_x, self.center_y)
 
+    @property
+    def bbox(self) -> BBox | None:
+        """
+        Bounding box of this drawing's rendered content including stroke,
+        clipped to its size. If inserted in a parent drawing, it's given in
+        the coordinate system of the container in which it was inserted,
+        including transforms of this drawing; otherwise it's given in this
+        drawing's own coordinate system. Returns `None`{l=python} if there
+        is no content.
+        """
+        if self._wrapper_insert is not None:
+            assert self._parent is not None
+            return get_bbox(
+                self._wrapper_insert, self._parent._canonical_size_norm
+            )
+
+        return BBox.union_all(
+            get_bbox(elem, self._size_norm) for elem in self._drawing.elements
+        )
+
+    @property
+    def content_bbox(self) -> BBox | None:
+        """
+        Bounding box of this drawing's content including stroke, in
+        canonical coordinates and not clipped to its canonical size. Returns
+        `None`{l=python} if there is no content.
+        """
+        return get_content_bbox(
+            self._svg, self._canonical_size_norm, ancestors=(self._group,)
+        )
+
+    def fit_to_content(self, padding: float = 0.0):
+        """
+        Set the canonical size to that of the content's bounding box plus
+        padding on each side, positioning the content at the top-left of
+        this drawing.
+
+        :raises ValueError: If this drawing has no content
+        """
+        if (bbox := self.content_bbox) is None:
+            raise ValueError(f"Drawing has no content: {self}")
+
+        bbox_ = bbox.inflate(padding)
+
+        self.canonical_size = bbox_.size
+        self._svg["width"] = str(bbox_.width)
+        self._svg["height"] = str(bbox_.height)
+        self._svg.viewbox(*bbox_.rect)
+
+        if self._wrapper_scale is not None:
+            self._rescale_svg(self._wrapper_scale, self._size)
+
+        self._drawing["width"] = str(self.size[0])
+        self._drawing["height"] = str(self.size[1])
+
+        invalidate(self._svg)
+
     @property
     def _canonical_size_norm(self) -> tuple[float, float] | None:
         return (
@@ -175,15 +254,7 @@ class BaseGraphicsContainer(TransformMixin):
         return self._id or type(self).__name__
 
     def _get_elem_kwargs(self, suffix: str | None = None) -> dict[str, str]:
-        kwargs: dict[str, str] = {}
-        suffix_ = "" if suffix is None else f"-{suffix}"
-
-        if self._id:
-            kwargs["id_"] = f"{self._id}{suffix_}"
-
-        kwargs["class_"] = f"{type(self).__name__}{suffix_}"
-
-        return kwargs
+        return _get_elem_kwargs(self._id, type(self).__name__, suffix)
 
     def _post_init(self):
         # create canonical svg
@@ -200,11 +271,15 @@ class BaseGraphicsContainer(TransformMixin):
             # no scaling needed, add svg directly
             self._drawing.add(self._svg)
             self._group.add(self._svg)
+            _set_parent([self._svg], self._drawing)
+            _set_parent([self._svg], self._group)
         else:
             # create wrapper svg and rescale
-            svg_wrapper: SVG = self._create_wrapper_scale()
-            self._drawing.add(svg_wrapper)
-            self._group.add(svg_wrapper)
+            self._wrapper_scale = self._create_wrapper_scale()
+            self._drawing.add(self._wrapper_scale)
+            self._group.add(self._wrapper_scale)
+            _set_parent([self._wrapper_scale], self._drawing)
+            _set_parent([self._wrapper_scale], self._group)
 
         # set top-level dimensions explicitly as larger SVGs
         # are unexpectedly truncated when sized to 100% (default)
@@ -212,6 +287,8 @@ class BaseGraphicsContainer(TransformMixin):
             self._drawing["width"] = str(self.size[0])
             self._drawing["height"] = str(self.size[1])
 
+        invalidate(self._svg)
+
     def _create_wrapper_scale(self) -> SVG:
         """
         Create SVG wrapper for canonical SVG object to handle scaling.
@@ -227,6 +304,7 @@ class BaseGraphicsContainer(TransformMixin):
         )
         self._rescale_svg(wrapper_scale, self._size)
         wrapper_scale.add(self._svg)
+        _set_parent([self._svg], wrapper_scale)
 
         return wrapper_scale
 
@@ -236,6 +314,7 @@ class BaseGraphicsContainer(TransformMixin):
         size: tuple[float, float] | tuple[str, str] | None,
         from_size: tuple[float, float] | None = None,
         set_size: bool = False,
+        from_origin: tuple[float, float] = (0.0, 0.0),
     ):
         if size is not None:
             from_size_norm = from_size or self.canonical_size
@@ -245,8 +324,8 @@ class BaseGraphicsContainer(TransformMixin):
 
             if from_size_norm is not None:
                 svg.viewbox(
-                    0,
-                    0,
+                    from_origin[0],
+                    from_origin[1],
                     from_size_norm[0],
                     from_size_norm[1],
                 )
@@ -255,3 +334,21 @@ class BaseGraphicsContainer(TransformMixin):
     @property
     def _mixin_size(self) -> tuple[float, float] | None:
         return self._size_norm
+
+
+def _get_elem_kwargs(
+    id_: str | None, cls_name: str, suffix: str | None
+) -> dict[str, str]:
+    """
+    Get id and class of an element generated for a drawing, qualified by
+    the suffix if provided.
+    """
+    kwargs: dict[str, str] = {}
+    suffix_ = "" if suffix is None else f"-{suffix}"
+
+    if id_:
+        kwargs["id_"] = f"{id_}{suffix_}"
+
+    kwargs["class_"] = f"{cls_name}{suffix_}"
+
+    return kwargs
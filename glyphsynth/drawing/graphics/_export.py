@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import copy
+import hashlib
 import logging
+import math
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
 import xml.dom.minidom as minidom
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal, cast
 from xml.etree import ElementTree
@@ -16,6 +18,13 @@ from svgwrite.drawing import Drawing
 
 from . import RASTER_SUPPORT
 from ._container import BaseGraphicsContainer
+from .geometry import BBox, cull
+from .optimize import ExportOptions, dedupe_gradients, optimize_xml
+
+TILES_OVERVIEW_FILENAME = "overview.svg"
+"""
+Filename of overview stitched from tiles at the lowest zoom level.
+"""
 
 
 class ExportContainer(BaseGraphicsContainer):
@@ -35,23 +44,26 @@ class ExportContainer(BaseGraphicsContainer):
         path: Path,
         size: tuple[str, str] | None = None,
         background: str | None = None,
+        region: tuple[float, float, float, float] | None = None,
+        options: ExportOptions | None = None,
     ):
         """
         :param path: Path to destination file or folder
+        :param region: Region to export as `(x, y, width, height)`{l=python} in user units of this drawing; content entirely outside it is omitted
+        :param options: Optimizations to apply to the exported document
         """
 
         path_norm: Path = self._normalize_path(path, "svg")
-        drawing = (
-            self._rescale_drawing(size) if size else copy.copy(self._drawing)
-        )
-
-        if background:
-            drawing.elements.insert(
-                0, drawing.rect(fill=background, size=("100%", "100%"))
-            )
 
         with path_norm.open("w") as fh:
-            fh.write(self._get_svg(drawing))
+            fh.write(
+                self.render_svg(
+                    size=size,
+                    background=background,
+                    region=region,
+                    options=options,
+                )
+            )
 
     def export_png(
         self,
@@ -61,33 +73,222 @@ class ExportContainer(BaseGraphicsContainer):
         dpi: tuple[int, int] = (96, 96),
         scale: float | int = 1,
         in_place_raster: bool = False,
+        region: tuple[float, float, float, float] | None = None,
+        options: ExportOptions | None = None,
     ):
         """
         :param path: Path to destination file or folder
         :param size: Size of image with concrete units (px/in/...), e.g. `("1in", "1in")`{l=python}, or `None`{l=python} to use provided scale factor
         :param dpi: Pixels per inch
         :param scale: Factor by which to scale user units to concrete pixels, only if `size is None`{l=python}
+        :param region: Region to export as `(x, y, width, height)`{l=python} in user units of this drawing; content entirely outside it is omitted
+        :param options: Optimizations to apply to the document being rasterized
         """
 
         path_norm: Path = self._normalize_path(path, "png")
+        path_svg = (
+            path_norm.parent / f"{path_norm.name}.temp.svg"
+            if in_place_raster
+            else None
+        )
+        size_raster: tuple[str, str] | None = size or self._get_size_raster(
+            float(scale), region
+        )
+
+        png = self._rasterize(
+            size_raster, background, dpi, path_svg, region, options
+        )
+
+        with path_norm.open("wb") as fh:
+            fh.write(png)
+
+    def export_tiles(
+        self,
+        path: Path,
+        tile_size: int = 256,
+        zoom_levels: int | None = None,
+        background: str | None = "#ffffff",
+        dpi: tuple[int, int] = (96, 96),
+        scale: float | int = 1,
+        jobs: int | None = None,
+        options: ExportOptions | None = None,
+    ):
+        """
+        Export a pyramid of square .png tiles as `{z}/{x}/{y}.png`, where
+        zoom level `z` is `0` for the lowest resolution. Each tile is
+        rasterized from a view of the drawing cropped to the tile, so no
+        single rasterization covers the full drawing. An overview stitched
+        from the tiles at the lowest zoom level is written as
+        `overview.svg`.
+
+        :param path: Path to destination folder
+        :param tile_size: Width and height of each tile in pixels
+        :param zoom_levels: Number of zoom levels, or `None`{l=python} to add levels until the drawing fits in a single tile
+        :param scale: Factor by which to scale user units to concrete pixels at the highest zoom level
+        :param jobs: Maximum number of concurrent rasterizations, or `None`{l=python} to use the default number of threads
+        :param options: Optimizations to apply to the document rasterized for each tile
+        """
+
+        if not self.has_size:
+            raise ValueError(
+                f"Drawing must have a size to export tiles: {self}"
+            )
+
+        max_zoom = (
+            zoom_levels - 1
+            if zoom_levels is not None
+            else max(
+                math.ceil(math.log2(max(self.size) * scale / tile_size)), 0
+            )
+        )
+        assert max_zoom >= 0, f"Invalid zoom levels: {zoom_levels}"
+
+        path_rsvg_convert = self._get_rsvg_convert()
+        path_temp = Path(tempfile.mkdtemp())
+        futures: list[Future] = []
+
+        # write each cropped .svg and rasterize in the background, as
+        # rasterization is done out of process
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for z in range(max_zoom + 1):
+                zoom_scale = scale * 2 ** (z - max_zoom)
+
+                # size of tile in user units
+                extent = tile_size / zoom_scale
+                cols, rows = self._get_tile_counts(tile_size, zoom_scale)
+
+                for x in range(cols):
+                    for y in range(rows):
+                        path_svg = path_temp / f"{z}-{x}-{y}.svg"
+                        path_png = path / str(z) / str(x) / f"{y}.png"
+
+                        drawing = self._rescale_drawing(
+                            (f"{tile_size}px", f"{tile_size}px"),
+                            region=(x * extent, y * extent, extent, extent),
+                        )
+
+                        with path_svg.open("w") as fh:
+                            fh.write(self._get_svg(drawing, options))
+
+                        path_png.parent.mkdir(parents=True, exist_ok=True)
+
+                        futures.append(
+                            executor.submit(
+                                self._rasterize_tile,
+                                path_rsvg_convert,
+                                path_svg,
+                                path_png,
+                                background,
+                                dpi,
+                            )
+                        )
+
+        shutil.rmtree(path_temp)
+
+        # propagate any errors
+        for future in futures:
+            future.result()
+
+        self._write_tiles_overview(path, tile_size, scale * 2**-max_zoom)
+
+    def render_svg(
+        self,
+        size: tuple[str, str] | None = None,
+        background: str | None = None,
+        region: tuple[float, float, float, float] | None = None,
+        options: ExportOptions | None = None,
+    ) -> str:
+        """
+        Get the content of the .svg which would be exported by
+        {obj}`export_svg`.
+        """
+
+        drawing: Drawing
+
+        if region is not None:
+            drawing = self._rescale_drawing(
+                size or (str(region[2]), str(region[3])), region=region
+            )
+        elif size is not None:
+            drawing = self._rescale_drawing(size)
+        else:
+            drawing = self._drawing.copy()
+
+        if background:
+            drawing.elements.insert(
+                0,
+                drawing.rect(
+                    insert=(region[0], region[1]) if region else (0, 0),
+                    fill=background,
+                    size=("100%", "100%"),
+                ),
+            )
+
+        return self._get_svg(drawing, options)
+
+    def render_png(
+        self,
+        size: tuple[str, str] | None = None,
+        background: str | None = "#ffffff",
+        dpi: tuple[int, int] = (96, 96),
+        scale: float | int = 1,
+        region: tuple[float, float, float, float] | None = None,
+        options: ExportOptions | None = None,
+    ) -> bytes:
+        """
+        Get the content of the .png which would be exported by
+        {obj}`export_png`.
+        """
+
         size_raster: tuple[str, str] | None = size or self._get_size_raster(
-            float(scale)
+            float(scale), region
         )
 
-        self._rasterize(
-            path_norm, size_raster, background, dpi, in_place_raster
+        return self._rasterize(
+            size_raster, background, dpi, None, region, options
         )
 
-    def _get_svg(self, drawing: Drawing | None = None) -> str:
+    def get_geometry_hash(self) -> str:
         """
-        Get a string containing the full XML content.
+        Get a hash of the content which would be exported by
+        {obj}`export_svg`, independent of drawing ids. Drawings which render
+        identically aside from their ids have the same hash.
+        """
+
+        xml = self._drawing.get_xml()
+        dedupe_gradients(xml)
+        xml = self._fixup_xml(xml)
+
+        # remove ids derived from drawing ids, keeping generated ids which
+        # may be referenced
+        for elem in xml.iter():
+            if (id_ := elem.get("id")) is not None and not re.match(
+                r"^id\d+$", id_
+            ):
+                del elem.attrib["id"]
+
+        return hashlib.sha256(ElementTree.tostring(xml)).hexdigest()
+
+    def _get_svg(
+        self,
+        drawing: Drawing | None = None,
+        options: ExportOptions | None = None,
+    ) -> str:
+        """
+        Get a string containing the full XML content, optimized with the
+        provided options.
         """
 
         # if no drawing provided, default to drawing for this drawing
         drawing_: Drawing = drawing or self._drawing
 
-        # get xml tree
-        xml = self._fixup_xml(drawing_.get_xml())
+        # get xml tree, sharing identical gradients among drawings
+        xml = drawing_.get_xml()
+        dedupe_gradients(xml)
+        xml = self._fixup_xml(xml)
+
+        if options is not None:
+            optimize_xml(xml, options)
 
         # get as string
         xml_bytes = cast(
@@ -153,32 +354,24 @@ class ExportContainer(BaseGraphicsContainer):
 
     def _rasterize(
         self,
-        path_png: Path,
         size_raster: tuple[str, str] | None,
         background: str | None,
         dpi: tuple[int, int],
-        in_place_raster: bool,
-    ):
-        # ensure rsvg-convert is supported and available
-        if not RASTER_SUPPORT:
-            sys.exit(
-                "Conversion to .png only supported on Linux due to availability of rsvg-convert"
-            )
-
-        if (path_rsvg_convert := shutil.which("rsvg-convert")) is None:
-            sys.exit("Could not find path to rsvg-convert")
+        path_svg: Path | None,
+        region: tuple[float, float, float, float] | None = None,
+        options: ExportOptions | None = None,
+    ) -> bytes:
+        """
+        Rasterize this drawing and return the .png content. The temp .svg is
+        written to the provided path and kept, or written to a temp folder
+        and removed if no path is provided.
+        """
 
-        logging.debug(f"Found path to rsvg-convert: {path_rsvg_convert}")
+        path_rsvg_convert = self._get_rsvg_convert()
 
         # create temp svg file scaled appropriately
-        path_svg: Path
-
-        path_svg_dir = (
-            path_png.parent if in_place_raster else Path(tempfile.mkdtemp())
-        )
-
-        path_svg = path_svg_dir / f"{path_png.name}.temp.svg"
-        self._create_svg_temp(path_svg, size_raster)
+        path_svg_temp = path_svg or Path(tempfile.mkdtemp()) / "drawing.svg"
+        self._create_svg_temp(path_svg_temp, size_raster, region, options)
 
         if size_raster is None:
             logging.warning(
@@ -186,9 +379,58 @@ class ExportContainer(BaseGraphicsContainer):
             )
 
         logging.debug(
-            f"Rasterizing: {path_svg} -> {path_png}, size_raster={size_raster}, dpi={dpi}"
+            f"Rasterizing: {path_svg_temp}, size_raster={size_raster}, dpi={dpi}"
+        )
+
+        png = self._run_rsvg_convert(
+            path_rsvg_convert, path_svg_temp, background, dpi
+        )
+
+        # clean up temp dir
+        if path_svg is None:
+            shutil.rmtree(path_svg_temp.parent)
+
+        return png
+
+    def _rasterize_tile(
+        self,
+        path_rsvg_convert: str,
+        path_svg: Path,
+        path_png: Path,
+        background: str | None,
+        dpi: tuple[int, int],
+    ):
+        png = self._run_rsvg_convert(
+            path_rsvg_convert, path_svg, background, dpi
         )
 
+        with path_png.open("wb") as fh:
+            fh.write(png)
+
+    def _get_rsvg_convert(self) -> str:
+        """
+        Get path to rsvg-convert, exiting if it's not supported or available.
+        """
+
+        if not RASTER_SUPPORT:
+            sys.exit(
+                "Conversion to .png only supported on Linux due to availability of rsvg-convert"
+            )
+
+        if (path_rsvg_convert := shutil.which("rsvg-convert")) is None:
+            sys.exit("Could not find path to rsvg-convert")
+
+        logging.debug(f"Found path to rsvg-convert: {path_rsvg_convert}")
+
+        return path_rsvg_convert
+
+    def _run_rsvg_convert(
+        self,
+        path_rsvg_convert: str,
+        path_svg: Path,
+        background: str | None,
+        dpi: tuple[int, int],
+    ) -> bytes:
         background_args = (
             ["--background-color", background] if background else []
         )
@@ -201,30 +443,94 @@ class ExportContainer(BaseGraphicsContainer):
                 f"{dpi[0]}",
                 "--dpi-y",
                 f"{dpi[1]}",
-                "-o",
-                str(path_png),
                 str(path_svg),
             ]
         )
 
         logging.debug(f"Running: {' '.join(args)}")
 
-        subprocess.check_call(args)
+        return subprocess.check_output(args)
 
-        # clean up temp dir
-        if not in_place_raster:
-            shutil.rmtree(path_svg.parent)
-
-    def _rescale_drawing(self, size: tuple[str, str]) -> Drawing:
+    def _rescale_drawing(
+        self,
+        size: tuple[str, str] | None,
+        region: tuple[float, float, float, float] | None = None,
+    ) -> Drawing:
         """
-        Rescale this drawing.
+        Rescale this drawing, optionally cropping it to a region given as
+        `(x, y, width, height)` in user units. Content entirely outside the
+        region is omitted.
         """
-        drawing: Drawing = copy.copy(self._drawing)
-        self._rescale_svg(drawing, size, self._size_norm, set_size=True)
+
+        if region is None:
+            # copy attributes as well, since they're modified
+            drawing: Drawing = self._drawing.copy()
+            self._rescale_svg(drawing, size, self._size_norm, set_size=True)
+        else:
+            drawing = cull(
+                self._drawing, BBox.from_rect(*region), self._size_norm
+            )
+            self._rescale_svg(
+                drawing,
+                size,
+                (region[2], region[3]),
+                set_size=True,
+                from_origin=(region[0], region[1]),
+            )
+
         return drawing
 
+    def _get_tile_counts(
+        self, tile_size: int, zoom_scale: float
+    ) -> tuple[int, int]:
+        """
+        Get number of tile columns and rows needed to cover this drawing at
+        the given scale.
+        """
+        assert self.has_size
+
+        return (
+            max(math.ceil(self.size[0] * zoom_scale / tile_size), 1),
+            max(math.ceil(self.size[1] * zoom_scale / tile_size), 1),
+        )
+
+    def _write_tiles_overview(
+        self, path: Path, tile_size: int, zoom_scale: float
+    ):
+        """
+        Write overview referencing the tiles at the lowest zoom level,
+        cropped to the size of this drawing.
+        """
+        assert self.has_size
+
+        cols, rows = self._get_tile_counts(tile_size, zoom_scale)
+        size = (
+            round(self.size[0] * zoom_scale),
+            round(self.size[1] * zoom_scale),
+        )
+
+        overview = Drawing(size=(f"{size[0]}px", f"{size[1]}px"))
+        overview.viewbox(0, 0, size[0], size[1])
+
+        for x in range(cols):
+            for y in range(rows):
+                overview.add(
+                    overview.image(
+                        f"0/{x}/{y}.png",
+                        insert=(x * tile_size, y * tile_size),
+                        size=(tile_size, tile_size),
+                    )
+                )
+
+        with (path / TILES_OVERVIEW_FILENAME).open("w") as fh:
+            fh.write(self._get_svg(overview))
+
     def _create_svg_temp(
-        self, path_svg: Path, size_raster: tuple[str, str] | None
+        self,
+        path_svg: Path,
+        size_raster: tuple[str, str] | None,
+        region: tuple[float, float, float, float] | None = None,
+        options: ExportOptions | None = None,
     ):
         """
         Create temp .svg for rasterizing.
@@ -233,17 +539,27 @@ class ExportContainer(BaseGraphicsContainer):
         # create temp drawing (top-level <svg>) and set size in order to
         # set output size
         # - required even if size provided to rsvg-convert
-        drawing_tmp = self._rescale_drawing(size_raster)
+        drawing_tmp = self._rescale_drawing(size_raster, region)
 
         with path_svg.open("w") as fh:
-            fh.write(self._get_svg(drawing_tmp))
+            fh.write(self._get_svg(drawing_tmp, options))
 
-    def _get_size_raster(self, scale: float) -> tuple[str, str] | None:
-        if not self.has_size:
+    def _get_size_raster(
+        self,
+        scale: float,
+        region: tuple[float, float, float, float] | None = None,
+    ) -> tuple[str, str] | None:
+        size: tuple[float, float]
+
+        if region is not None:
+            size = (region[2], region[3])
+        elif self.has_size:
+            size = self.size
+        else:
             return None
 
-        x = int(self.size[0] * scale)
-        y = int(self.size[1] * scale)
+        x = int(size[0] * scale)
+        y = int(size[1] * scale)
 
         return (f"{x}px", f"{y}px")
 
@@ -2,19 +2,39 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
+from numbers import Real
 from typing import TYPE_CHECKING
 
+import numpy as np
 import svgwrite.base
 import svgwrite.container
+from numpy.typing import NDArray
 
+from ..geometry import (
+    _format_numbers,
+    _format_points,
+    _set_parent,
+    invalidate,
+    simplify_points,
+)
+from ..path import PathCommand, encode_path
 from ..properties import ShapeProperties
 from .base import BaseElement
 from .gradients import LinearGradient, RadialGradient, StopColor
-from .shapes import Circle, Ellipse, Line, Polygon, Polyline, Rect
+from .shapes import (
+    Circle,
+    Ellipse,
+    Line,
+    Path,
+    Polygon,
+    Polyline,
+    Rect,
+    _PolylineElement,
+)
 
 if TYPE_CHECKING:
-    from ...drawing import BaseDrawing
-    from .containers import Group
+    from ...drawing import BaseDrawing, DrawingFragment
+    from .containers import Group, Symbol, Use
 
 __all__ = [
     "ElementFactory",
@@ -50,11 +70,19 @@ class ElementFactory(ABC):
         self,
         points: Iterable[tuple[float, float]],
         properties: ShapeProperties | None = None,
+        simplify: float | None = None,
     ) -> Polyline:
+        """
+        :param simplify: Tolerance within which to omit points, see {obj}`simplify_points`
+        """
         return Polyline(
             self._glyph,
             self._container,
-            points=[p for p in points],
+            points=(
+                [p for p in points]
+                if simplify is None
+                else simplify_points(points, simplify).tolist()
+            ),
             **self._get_extra(properties),
         )
 
@@ -62,11 +90,36 @@ class ElementFactory(ABC):
         self,
         points: Iterable[tuple[float, float]],
         properties: ShapeProperties | None = None,
+        simplify: float | None = None,
     ) -> Polygon:
+        """
+        :param simplify: Tolerance within which to omit points, see {obj}`simplify_points`
+        """
         return Polygon(
             self._glyph,
             self._container,
-            points=[p for p in points],
+            points=(
+                [p for p in points]
+                if simplify is None
+                else simplify_points(points, simplify).tolist()
+            ),
+            **self._get_extra(properties),
+        )
+
+    def draw_path(
+        self,
+        commands: str | Iterable[PathCommand],
+        properties: ShapeProperties | None = None,
+    ) -> Path:
+        """
+        Draw a path given by its commands, e.g.
+        `[("M", 0, 0), ("L", 10, 0), ("Q", 15, 5, 10, 10), ("Z",)]`{l=python},
+        or path data. The path data is encoded compactly.
+        """
+        return Path(
+            self._glyph,
+            self._container,
+            d=encode_path(commands),
             **self._get_extra(properties),
         )
 
@@ -116,6 +169,101 @@ class ElementFactory(ABC):
             **self._get_extra(properties),
         )
 
+    def draw_lines(
+        self,
+        starts: Iterable[tuple[float, float]] | NDArray[np.float64],
+        ends: Iterable[tuple[float, float]] | NDArray[np.float64],
+        properties: ShapeProperties | None = None,
+    ) -> list[Line]:
+        """
+        Draw lines between corresponding start and end points, e.g. for
+        hatching. Points may be provided as arrays with shape `(n, 2)`;
+        properties are resolved once for all lines and coordinates are
+        formatted at once.
+        """
+        starts_, ends_ = _get_points(starts), _get_points(ends)
+        assert starts_.shape == ends_.shape, f"Inconsistent points: {ends_}"
+
+        coords = _format_numbers(np.concatenate([starts_, ends_], axis=1))
+        template = self._glyph._drawing.line(**self._get_extra(properties))
+        elements: list[svgwrite.base.BaseElement] = []
+
+        for x1, y1, x2, y2 in coords.tolist():
+            element = template.copy()
+            element.attribs.update(x1=x1, y1=y1, x2=x2, y2=y2)
+            elements.append(element)
+
+        return self._add_batch(Line, elements)
+
+    def draw_polylines(
+        self,
+        points: Iterable[Iterable[tuple[float, float]] | NDArray[np.float64]],
+        properties: ShapeProperties | None = None,
+    ) -> list[Polyline]:
+        """
+        Draw polylines, each given by its points, e.g. as an array with
+        shape `(n, 2)`. Properties are resolved once for all polylines and
+        points are formatted at once.
+        """
+        arrays = [_get_points(p) for p in points]
+        lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+        ends = np.cumsum(lengths)
+
+        points_str = _format_points(
+            np.concatenate(arrays) if arrays else np.zeros((0, 2))
+        )
+
+        template = _PolylineElement(
+            factory=self._glyph._drawing, **self._get_extra(properties)
+        )
+        elements: list[svgwrite.base.BaseElement] = []
+
+        for array, start, end in zip(
+            arrays, (ends - lengths).tolist(), ends.tolist()
+        ):
+            element = template.copy()
+            element.points = array
+            element._points_str = " ".join(points_str[start:end])
+            elements.append(element)
+
+        return self._add_batch(Polyline, elements)
+
+    def draw_circles(
+        self,
+        centers: Iterable[tuple[float, float]] | NDArray[np.float64],
+        radii: float | Iterable[float] | NDArray[np.float64],
+        properties: ShapeProperties | None = None,
+    ) -> list[Circle]:
+        """
+        Draw circles with the corresponding centers and radii, e.g. for
+        halftone patterns; a single radius may be provided for all circles.
+        Properties are resolved once for all circles and coordinates are
+        formatted at once.
+        """
+        centers_ = _get_points(centers)
+        radii_ = np.broadcast_to(
+            np.asarray(
+                radii
+                if isinstance(radii, (Real, np.generic, np.ndarray))
+                else list(radii),
+                dtype=np.float64,
+            ),
+            (len(centers_),),
+        )
+
+        coords = _format_numbers(
+            np.concatenate([centers_, radii_[:, np.newaxis]], axis=1)
+        )
+        template = self._glyph._drawing.circle(**self._get_extra(properties))
+        elements: list[svgwrite.base.BaseElement] = []
+
+        for cx, cy, r in coords.tolist():
+            element = template.copy()
+            element.attribs.update(cx=cx, cy=cy, r=r)
+            elements.append(element)
+
+        return self._add_batch(Circle, elements)
+
     def create_group(self, properties: ShapeProperties | None = None) -> Group:
         from .containers import Group
 
@@ -162,27 +310,177 @@ class ElementFactory(ABC):
         gradient._configure(colors)
         return gradient
 
-    # TODO: if drawing has drawing_id, add to defs (if not present) and insert <use>
+    def create_symbol(self, drawing: BaseDrawing | DrawingFragment) -> Symbol:
+        """
+        Define the drawing as a symbol in this drawing's `<defs>`, to be
+        referenced by {obj}`insert_reference`. The drawing must have a
+        drawing id, from which the symbol's id is derived.
+        """
+        from .containers import Symbol
+
+        assert drawing.drawing_id is not None, f"No drawing id: {drawing}"
+
+        symbol = Symbol(
+            self._glyph,
+            self._glyph._svg.defs,
+            **drawing._get_elem_kwargs(suffix="symbol"),
+        )
+        symbol.viewbox(0, 0, drawing.width, drawing.height)
+        symbol._element.add(self._adopt_drawing(drawing, symbol._element))
+        invalidate(symbol._element)
+
+        return symbol
+
+    def insert_reference(
+        self,
+        href: str | Symbol,
+        size: tuple[float, float],
+        insert: tuple[float | int, float | int] | None = None,
+    ) -> Use:
+        """
+        Insert a reference to a symbol, either a {obj}`Symbol` or its IRI.
+        The IRI may refer to a symbol in another document, e.g.
+        `"library.svg#my-drawing-symbol"`{l=python}.
+        """
+        from .containers import Symbol, Use
+
+        href_ = href.iri if isinstance(href, Symbol) else href
+
+        return Use(
+            self._glyph,
+            self._container,
+            href_,
+            insert=insert or (0, 0),
+            size=size,
+        )
+
     def insert_drawing[
-        DrawingT: BaseDrawing
+        DrawingT: BaseDrawing | DrawingFragment
     ](
         self,
         drawing: DrawingT,
         insert: tuple[float | int, float | int] | None = None,
     ) -> DrawingT:
-        self._glyph._nested_glyphs.append(drawing)
-
+        """
+        Insert a drawing, or the output of one given as a
+        {obj}`DrawingFragment`.
+        """
         # add group to self, using wrapper svg for placement
         wrapper_insert: svgwrite.container.SVG = self._glyph._drawing.svg(
             **drawing._get_elem_kwargs(suffix="wrapper-insert"),
             insert=insert,
         )
 
-        wrapper_insert.add(drawing._group)
+        wrapper_insert.add(
+            self._adopt_drawing(drawing, wrapper_insert, inserted=True)
+        )
         self._container.add(wrapper_insert)
+        _set_parent([wrapper_insert], self._container)
+        invalidate(self._container)
 
         return drawing
 
+    def insert_drawings[
+        DrawingT: BaseDrawing | DrawingFragment
+    ](
+        self,
+        drawings: Iterable[DrawingT],
+        inserts: Iterable[tuple[float | int, float | int]]
+        | NDArray[np.float64],
+    ) -> list[DrawingT]:
+        """
+        Insert drawings at the corresponding insert points, e.g. as computed
+        in bulk by a layout. Insert points may be provided as an array with
+        shape `(n, 2)`, converted to floats at once.
+        """
+        # convert arrays to nested lists of python floats
+        inserts_ = (
+            inserts.tolist() if isinstance(inserts, np.ndarray) else inserts
+        )
+
+        factory = self._glyph._drawing
+        container = self._container
+
+        if container.debug:
+            container.validator.check_valid_children(
+                container.elementname, "svg"
+            )
+
+        wrappers: list[svgwrite.container.SVG] = []
+        drawings_: list[DrawingT] = []
+
+        for drawing, insert in zip(drawings, inserts_, strict=True):
+            # add group to self, using wrapper svg for placement
+            wrapper_insert: svgwrite.container.SVG = factory.svg(
+                **drawing._get_elem_kwargs(suffix="wrapper-insert"),
+                insert=tuple(insert),
+            )
+            wrapper_insert.add(
+                self._adopt_drawing(drawing, wrapper_insert, inserted=True)
+            )
+
+            wrappers.append(wrapper_insert)
+            drawings_.append(drawing)
+
+        container.elements.extend(wrappers)
+        _set_parent(wrappers, container)
+        invalidate(container)
+
+        return drawings_
+
+    def _adopt_drawing(
+        self,
+        drawing: BaseDrawing | DrawingFragment,
+        parent: svgwrite.base.BaseElement,
+        inserted: bool = False,
+    ) -> svgwrite.base.BaseElement:
+        """
+        Get the element with which to add the drawing to the parent,
+        recording the drawing as nested in this one. A fragment gets a new
+        element, as there's no drawing to record.
+        """
+        from ...drawing import DrawingFragment
+
+        if isinstance(drawing, DrawingFragment):
+            element = drawing._create_element()
+        else:
+            self._glyph._nested_glyphs.append(drawing)
+            element = drawing._group
+
+            if inserted:
+                drawing._wrapper_insert = parent
+                drawing._parent = self._glyph
+
+        _set_parent([element], parent)
+        return element
+
+    def _add_batch[
+        ElementT: BaseElement
+    ](
+        self,
+        element_cls: type[ElementT],
+        elements: list[svgwrite.base.BaseElement],
+    ) -> list[ElementT]:
+        """
+        Add elements created in bulk, copied from a template whose shared
+        attributes were validated upon its creation.
+        """
+        container = self._container
+
+        if container.debug:
+            container.validator.check_valid_children(
+                container.elementname, element_cls._api_name
+            )
+
+        wrappers = [element_cls._wrap(self._glyph, e) for e in elements]
+
+        self._glyph._elements.extend(wrappers)
+        container.elements.extend(elements)
+        _set_parent(elements, container)
+        invalidate(container)
+
+        return wrappers
+
     def _get_extra(self, properties: ShapeProperties | None) -> dict[str, str]:
         """
         Get extra kwargs to pass to svgwrite APIs.
@@ -203,3 +501,16 @@ class ElementFactory(ABC):
 def _normalize_inherit(inherit: str | BaseElement | None) -> str | None:
     if isinstance(inherit, BaseElement):
         return inherit.iri
+
+
+def _get_points(
+    points: Iterable[tuple[float, float]] | NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Get points as an array with shape `(n, 2)`.
+    """
+    array = np.asarray(
+        points if isinstance(points, np.ndarray) else list(points),
+        dtype=np.float64,
+    )
+    return array.reshape(-1, 2)
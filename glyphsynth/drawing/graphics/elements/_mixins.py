@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Literal, Self
 import svgwrite.mixins
 
 from ..._utils import normalize_str
+from ..geometry import Affine, invalidate, parse_transform
 
 if TYPE_CHECKING:
     from .gradients import BaseGradient
@@ -45,10 +46,12 @@ class ViewBoxMixin(BaseWrapperMixin[svgwrite.mixins.ViewBox]):
         self, min_x: float, min_y: float, width: float, height: float
     ) -> Self:
         self._mixin_obj.viewbox(min_x, min_y, width, height)
+        invalidate(self._mixin_obj)
         return self
 
     def stretch(self) -> Self:
         self._mixin_obj.stretch()
+        invalidate(self._mixin_obj)
         return self
 
     def fit(
@@ -58,14 +61,61 @@ class ViewBoxMixin(BaseWrapperMixin[svgwrite.mixins.ViewBox]):
         scale: Literal["meet", "slice"] = "meet",
     ) -> Self:
         self._mixin_obj.fit(horiz=horiz, vert=vert, scale=scale)
+        invalidate(self._mixin_obj)
         return self
 
 
 class TransformMixin(BaseWrapperMixin[svgwrite.mixins.Transform]):
-    def translate(self, x: float | int, y: float | int | None = None) -> Self:
-        self._mixin_obj.translate(x, y)
+    """
+    Provides transform APIs. Transforms are composed into a single affine
+    transform, emitted as one `matrix(...)`; set
+    {obj}`preserve_transform_chain` to instead emit each transform as
+    invoked.
+    """
+
+    preserve_transform_chain: bool = False
+    """
+    Whether to emit the chain of transforms as invoked, e.g.
+    `rotate(90,50,50) translate(10)`, rather than a single matrix. May be
+    set on the class or instance before any transforms are applied.
+    """
+
+    _transform: Affine | None = None
+    """
+    Composition of all transforms applied, or `None`{l=python} if none have
+    been applied through this API.
+    """
+
+    @property
+    def transform(self) -> Affine:
+        """
+        Composition of all transforms applied to this object.
+        """
+        if self._transform is None:
+            return parse_transform(self._mixin_obj.attribs.get("transform"))
+        return self._transform
+
+    def set_transform(self, transform: Affine) -> Self:
+        """
+        Replace any transforms applied to this object.
+        """
+        self._transform = transform
+
+        if transform.is_identity:
+            self._mixin_obj.attribs.pop("transform", None)
+        else:
+            self._mixin_obj["transform"] = transform.to_svg()
+
+        invalidate(self._mixin_obj)
         return self
 
+    def translate(self, x: float | int, y: float | int | None = None) -> Self:
+        if self.preserve_transform_chain:
+            self._mixin_obj.translate(x, y)
+            return self._update_transform()
+
+        return self._compose(Affine.translation(x, y or 0))
+
     def rotate(
         self,
         angle: float | int,
@@ -76,20 +126,32 @@ class TransformMixin(BaseWrapperMixin[svgwrite.mixins.Transform]):
             if (size := self._mixin_size) is not None:
                 center = (size[0] / 2, size[1] / 2)
 
-        self._mixin_obj.rotate(angle, center=center)
-        return self
+        if self.preserve_transform_chain:
+            self._mixin_obj.rotate(angle, center=center)
+            return self._update_transform()
+
+        return self._compose(Affine.rotation(angle, center=center))
 
     def scale(self, x: float | int, y: float | int | None = None) -> Self:
-        self._mixin_obj.scale(x, y)
-        return self
+        if self.preserve_transform_chain:
+            self._mixin_obj.scale(x, y)
+            return self._update_transform()
+
+        return self._compose(Affine.scaling(x, y))
 
     def skew_x(self, angle: float | int) -> Self:
-        self._mixin_obj.skewX(angle)
-        return self
+        if self.preserve_transform_chain:
+            self._mixin_obj.skewX(angle)
+            return self._update_transform()
+
+        return self._compose(Affine.skewing_x(angle))
 
     def skew_y(self, angle: float | int) -> Self:
-        self._mixin_obj.skewY(angle)
-        return self
+        if self.preserve_transform_chain:
+            self._mixin_obj.skewY(angle)
+            return self._update_transform()
+
+        return self._compose(Affine.skewing_y(angle))
 
     def matrix(
         self,
@@ -100,10 +162,16 @@ class TransformMixin(BaseWrapperMixin[svgwrite.mixins.Transform]):
         translate_x: float | int,
         translate_y: float | int,
     ) -> Self:
-        self._mixin_obj.matrix(
-            scale_x, scale_y, skew_x, skew_y, translate_x, translate_y
+        if self.preserve_transform_chain:
+            self._mixin_obj.matrix(
+                scale_x, scale_y, skew_x, skew_y, translate_x, translate_y
+            )
+            return self._update_transform()
+
+        # components are in the order of svg's matrix(a, b, c, d, e, f)
+        return self._compose(
+            Affine(scale_x, scale_y, skew_x, skew_y, translate_x, translate_y)
         )
-        return self
 
     # TODO: flip(): scale to create mirror image across given axes
 
@@ -114,6 +182,22 @@ class TransformMixin(BaseWrapperMixin[svgwrite.mixins.Transform]):
         """
         return None
 
+    def _compose(self, transform: Affine) -> Self:
+        """
+        Apply transform after any existing transforms.
+        """
+        return self.set_transform(self.transform @ transform)
+
+    def _update_transform(self) -> Self:
+        """
+        Update composed transform from the chain of transforms.
+        """
+        self._transform = parse_transform(
+            self._mixin_obj.attribs.get("transform")
+        )
+        invalidate(self._mixin_obj)
+        return self
+
 
 class PresentationMixin(BaseWrapperMixin[svgwrite.mixins.Presentation]):
     def fill(
@@ -130,6 +214,7 @@ class PresentationMixin(BaseWrapperMixin[svgwrite.mixins.Presentation]):
                 opacity_pct / 100 if opacity_pct is not None else None
             ),
         )
+        invalidate(self._mixin_obj)
         return self
 
     def stroke(
@@ -153,6 +238,7 @@ class PresentationMixin(BaseWrapperMixin[svgwrite.mixins.Presentation]):
             linejoin=normalize_str(linejoin),
             miterlimit=normalize_str(miterlimit),
         )
+        invalidate(self._mixin_obj)
         return self
 
     def dasharray(
@@ -163,6 +249,7 @@ class PresentationMixin(BaseWrapperMixin[svgwrite.mixins.Presentation]):
         self._mixin_obj.dasharray(
             dasharray=dasharray, offset=normalize_str(offset)
         )
+        invalidate(self._mixin_obj)
         return self
 
 
@@ -2,10 +2,11 @@
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, cast
+from typing import TYPE_CHECKING, Callable, Self, cast
 
 import svgwrite.base
 
+from ..geometry import BBox, _set_parent, get_bbox, invalidate
 from ._mixins import BaseWrapperMixin
 
 if TYPE_CHECKING:
@@ -46,6 +47,7 @@ class BaseElement[ElementT: svgwrite.base.BaseElement](BaseWrapperMixin):
         """
 
         self._glyph_obj = drawing
+        drawing._elements.append(self)
 
         api_attr = getattr(drawing._drawing, self._api_name)
         api = cast(Callable[..., ElementT], api_attr)
@@ -54,6 +56,29 @@ class BaseElement[ElementT: svgwrite.base.BaseElement](BaseWrapperMixin):
         self._mixin_obj = self._element
 
         container.add(self._element)
+        _set_parent([self._element], container)
+        invalidate(container)
+
+    @classmethod
+    def _wrap(cls, drawing: BaseDrawing, element: ElementT) -> Self:
+        """
+        Wrap an `svgwrite` element created by the caller, e.g. in bulk. The
+        caller is responsible for adding it to its container and to the
+        drawing's elements.
+        """
+        obj = cls.__new__(cls)
+        obj._glyph_obj = drawing
+        obj._element = element
+        obj._mixin_obj = element
+        return obj
+
+    @property
+    def bbox(self) -> BBox | None:
+        """
+        Bounding box of this element in the coordinate system of its
+        container, including its stroke and transform.
+        """
+        return get_bbox(self._element, self._glyph_obj._canonical_size_norm)
 
     @property
     def iri(self) -> str:
@@ -5,14 +5,16 @@ from typing import TYPE_CHECKING
 import svgwrite.container
 
 from ._factory import ElementFactory
-from ._mixins import PresentationMixin, TransformMixin
+from ._mixins import PresentationMixin, TransformMixin, ViewBoxMixin
 from .base import BaseElement
 
 if TYPE_CHECKING:
-    from ...drawing import BaseDrawing
+    from ...drawing import BaseDrawing, DrawingFragment
 
 __all__ = [
     "Group",
+    "Symbol",
+    "Use",
 ]
 
 
@@ -31,3 +33,34 @@ class Group(
     @property
     def _container(self) -> svgwrite.container.Group:
         return self._element
+
+
+class Symbol(
+    BaseElement[svgwrite.container.Symbol],
+    ViewBoxMixin,
+):
+    """
+    Definition of a drawing which can be referenced by {obj}`Use`
+    elements, in this document or others.
+    """
+
+    _api_name = "symbol"
+
+    @staticmethod
+    def get_id(drawing: BaseDrawing | DrawingFragment) -> str:
+        """
+        Get id of the symbol defining the drawing.
+        """
+        return f"{drawing._id_norm}-symbol"
+
+
+class Use(
+    BaseElement[svgwrite.container.Use],
+    TransformMixin,
+    PresentationMixin,
+):
+    """
+    Reference to a {obj}`Symbol` or other element by IRI.
+    """
+
+    _api_name = "use"
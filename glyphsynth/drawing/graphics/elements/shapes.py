@@ -1,4 +1,7 @@
+import numpy as np
+import svgwrite.path
 import svgwrite.shapes
+from numpy.typing import NDArray
 
 from ._mixins import MarkersMixin, PresentationMixin, TransformMixin
 from .base import BaseElement
@@ -10,6 +13,7 @@ __all__ = [
     "Ellipse",
     "Polyline",
     "Polygon",
+    "Path",
 ]
 
 
@@ -56,3 +60,28 @@ class Polygon(
     MarkersMixin,
 ):
     _api_name = "polygon"
+
+
+class Path(
+    BaseElement[svgwrite.path.Path],
+    TransformMixin,
+    PresentationMixin,
+    MarkersMixin,
+):
+    _api_name = "path"
+
+
+class _PolylineElement(svgwrite.shapes.Polyline):
+    """
+    Polyline whose points are provided as an array along with their
+    formatted string, which is used as-is rather than formatting each point
+    upon export.
+    """
+
+    points: NDArray[np.float64]
+    _points_str: str
+
+    def points_to_string(self, points) -> str:
+        if points is self.points:
+            return self._points_str
+        return super().points_to_string(points)
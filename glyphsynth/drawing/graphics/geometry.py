@@ -0,0 +1,1547 @@
+"""
+Geometry of SVG elements: affine transforms and bounding boxes, computed
+from the element tree without rendering.
+
+Bounding boxes account for stroke width, linecaps, linejoins and the
+miter limit. They're tight for lines, polylines, polygons, rects and circles
+under any transform, as well as paths consisting of lines; for rounded rects,
+stroked ellipses and paths with curves or arcs they may exceed the painted
+area, but never fall short of it.
+
+Extents of containers are cached per element and reused until
+{obj}`invalidate` is called for the element or one of its descendants,
+which glyphsynth APIs do upon mutating them.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import math
+import re
+import weakref
+from dataclasses import dataclass, replace
+from typing import Any, Iterable, Mapping
+from xml.etree import ElementTree
+
+import numpy as np
+import svgwrite.base
+from numpy.typing import NDArray
+
+__all__ = [
+    "Affine",
+    "BBox",
+    "parse_transform",
+    "get_bbox",
+    "get_content_bbox",
+    "cull",
+    "simplify_points",
+    "invalidate",
+    "get_version",
+]
+
+type Element = svgwrite.base.BaseElement | ElementTree.Element
+"""
+Element of an `svgwrite` tree or of its XML output.
+"""
+
+CONTAINER_ELEMENTS = ("svg", "g", "a")
+"""
+Elements whose children are rendered in their coordinate system.
+"""
+
+NON_RENDERING_ELEMENTS = (
+    "defs",
+    "symbol",
+    "style",
+    "title",
+    "desc",
+    "metadata",
+    "linearGradient",
+    "radialGradient",
+    "pattern",
+    "clipPath",
+    "mask",
+    "marker",
+    "filter",
+)
+"""
+Elements which aren't rendered directly, so have no extent.
+"""
+
+UNITS: dict[str, float] = {
+    "": 1.0,
+    "px": 1.0,
+    "in": 96.0,
+    "cm": 96.0 / 2.54,
+    "mm": 96.0 / 25.4,
+    "pt": 96.0 / 72.0,
+    "pc": 16.0,
+}
+"""
+Size of each absolute unit in user units.
+"""
+
+MITER_JOINS = ("miter", "miter-clip", "arcs")
+"""
+Linejoins which extend to the miter limit.
+"""
+
+_version: int = 0
+"""
+Incremented upon invalidating all cached extents.
+"""
+
+_versions: weakref.WeakKeyDictionary[Element, int] = weakref.WeakKeyDictionary()
+"""
+Version of each element, incremented upon invalidating it or any of its
+descendants.
+"""
+
+_parents: weakref.WeakKeyDictionary[
+    Element, weakref.WeakSet[Element]
+] = weakref.WeakKeyDictionary()
+"""
+Containers to which each element was added through glyphsynth APIs. An
+element may have multiple, e.g. a drawing's canonical `<svg>` is added to
+both its standalone document and its group for placement.
+"""
+
+_cache: weakref.WeakKeyDictionary[
+    Element,
+    tuple[tuple[Any, ...], BBox | None, bool],
+] = weakref.WeakKeyDictionary()
+"""
+Extents of containers in their parent's coordinate system, with the version,
+viewport and inherited stroke with which they were computed.
+"""
+
+_TRANSFORM_PATTERN = re.compile(
+    r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)"
+)
+_LENGTH_PATTERN = re.compile(
+    r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-z%]*)\s*$"
+)
+
+
+@dataclass(frozen=True)
+class Affine:
+    """
+    Affine transform given by the components of SVG's
+    `matrix(a, b, c, d, e, f)`, mapping `(x, y)` to
+    `(a * x + c * y + e, b * x + d * y + f)`.
+
+    Transforms are composed with `@`{l=python}: `(t1 @ t2).apply(x, y)`
+    applies `t2` and then `t1`, matching the order of a transform list.
+    """
+
+    a: float = 1.0
+    b: float = 0.0
+    c: float = 0.0
+    d: float = 1.0
+    e: float = 0.0
+    f: float = 0.0
+
+    @classmethod
+    def identity(cls) -> Affine:
+        return cls()
+
+    @classmethod
+    def translation(cls, x: float, y: float = 0.0) -> Affine:
+        return cls(e=x, f=y)
+
+    @classmethod
+    def scaling(cls, x: float, y: float | None = None) -> Affine:
+        return cls(a=x, d=x if y is None else y)
+
+    @classmethod
+    def rotation(
+        cls, angle: float, center: tuple[float, float] | None = None
+    ) -> Affine:
+        """
+        Get rotation by the angle in degrees, clockwise in SVG's coordinate
+        system, about the center if provided or the origin otherwise.
+        """
+        rad = math.radians(angle)
+        cos, sin = math.cos(rad), math.sin(rad)
+        rotation = cls(a=cos, b=sin, c=-sin, d=cos)
+
+        if center is None:
+            return rotation
+
+        return (
+            cls.translation(*center)
+            @ rotation
+            @ cls.translation(-center[0], -center[1])
+        )
+
+    @classmethod
+    def skewing_x(cls, angle: float) -> Affine:
+        return cls(c=math.tan(math.radians(angle)))
+
+    @classmethod
+    def skewing_y(cls, angle: float) -> Affine:
+        return cls(b=math.tan(math.radians(angle)))
+
+    def __matmul__(self, other: Affine) -> Affine:
+        return Affine(
+            a=self.a * other.a + self.c * other.b,
+            b=self.b * other.a + self.d * other.b,
+            c=self.a * other.c + self.c * other.d,
+            d=self.b * other.c + self.d * other.d,
+            e=self.a * other.e + self.c * other.f + self.e,
+            f=self.b * other.e + self.d * other.f + self.f,
+        )
+
+    @property
+    def is_identity(self) -> bool:
+        return self == Affine()
+
+    @property
+    def determinant(self) -> float:
+        return self.a * self.d - self.b * self.c
+
+    @property
+    def max_scale(self) -> float:
+        """
+        Largest factor by which this transform scales any distance.
+        """
+        sum_sq = self.a**2 + self.b**2 + self.c**2 + self.d**2
+        disc = max(sum_sq**2 - 4 * self.determinant**2, 0.0)
+        return math.sqrt((sum_sq + math.sqrt(disc)) / 2)
+
+    def apply(self, x: float, y: float) -> tuple[float, float]:
+        return (
+            self.a * x + self.c * y + self.e,
+            self.b * x + self.d * y + self.f,
+        )
+
+    def invert(self) -> Affine:
+        """
+        Get the inverse of this transform.
+
+        :raises ValueError: If this transform isn't invertible
+        """
+        det = self.determinant
+
+        if det == 0:
+            raise ValueError(f"Transform is not invertible: {self}")
+
+        return Affine(
+            a=self.d / det,
+            b=-self.b / det,
+            c=-self.c / det,
+            d=self.a / det,
+            e=(self.c * self.f - self.d * self.e) / det,
+            f=(self.b * self.e - self.a * self.f) / det,
+        )
+
+    def to_svg(self) -> str:
+        """
+        Get as value of a `transform` attribute.
+        """
+        values = ",".join(
+            _format_number(v)
+            for v in (self.a, self.b, self.c, self.d, self.e, self.f)
+        )
+        return f"matrix({values})"
+
+
+@dataclass(frozen=True)
+class BBox:
+    """
+    Axis-aligned bounding box.
+    """
+
+    x_min: float
+    y_min: float
+    x_max: float
+    y_max: float
+
+    @classmethod
+    def from_rect(cls, x: float, y: float, width: float, height: float) -> BBox:
+        return cls(x, y, x + width, y + height)
+
+    @classmethod
+    def from_points(cls, points: Iterable[tuple[float, float]]) -> BBox | None:
+        """
+        Get bounding box of points, or `None`{l=python} if there are none.
+        """
+        xs: list[float] = []
+        ys: list[float] = []
+
+        for x, y in points:
+            xs.append(x)
+            ys.append(y)
+
+        if not len(xs):
+            return None
+
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    @classmethod
+    def union_all(cls, bboxes: Iterable[BBox | None]) -> BBox | None:
+        """
+        Get bounding box of all provided bounding boxes, ignoring
+        `None`{l=python}.
+        """
+        result: BBox | None = None
+
+        for bbox in bboxes:
+            if bbox is not None:
+                result = bbox if result is None else result.union(bbox)
+
+        return result
+
+    @property
+    def width(self) -> float:
+        return self.x_max - self.x_min
+
+    @property
+    def height(self) -> float:
+        return self.y_max - self.y_min
+
+    @property
+    def size(self) -> tuple[float, float]:
+        return (self.width, self.height)
+
+    @property
+    def center(self) -> tuple[float, float]:
+        return ((self.x_min + self.x_max) / 2, (self.y_min + self.y_max) / 2)
+
+    @property
+    def rect(self) -> tuple[float, float, float, float]:
+        """
+        Get as `(x, y, width, height)`.
+        """
+        return (self.x_min, self.y_min, self.width, self.height)
+
+    @property
+    def corners(self) -> list[tuple[float, float]]:
+        return [
+            (self.x_min, self.y_min),
+            (self.x_max, self.y_min),
+            (self.x_max, self.y_max),
+            (self.x_min, self.y_max),
+        ]
+
+    def union(self, other: BBox) -> BBox:
+        return BBox(
+            min(self.x_min, other.x_min),
+            min(self.y_min, other.y_min),
+            max(self.x_max, other.x_max),
+            max(self.y_max, other.y_max),
+        )
+
+    def intersection(self, other: BBox) -> BBox | None:
+        """
+        Get the overlapping area, or `None`{l=python} if there is none.
+        """
+        if not self.intersects(other):
+            return None
+
+        return BBox(
+            max(self.x_min, other.x_min),
+            max(self.y_min, other.y_min),
+            min(self.x_max, other.x_max),
+            min(self.y_max, other.y_max),
+        )
+
+    def intersects(self, other: BBox) -> bool:
+        """
+        Check whether this bounding box overlaps or touches the other.
+        """
+        return (
+            self.x_min <= other.x_max
+            and other.x_min <= self.x_max
+            and self.y_min <= other.y_max
+            and other.y_min <= self.y_max
+        )
+
+    def contains(self, other: BBox) -> bool:
+        return (
+            self.x_min <= other.x_min
+            and self.y_min <= other.y_min
+            and other.x_max <= self.x_max
+            and other.y_max <= self.y_max
+        )
+
+    def contains_point(self, x: float, y: float) -> bool:
+        return self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max
+
+    def inflate(self, distance: float) -> BBox:
+        return BBox(
+            self.x_min - distance,
+            self.y_min - distance,
+            self.x_max + distance,
+            self.y_max + distance,
+        )
+
+    def transform(self, transform: Affine) -> BBox:
+        """
+        Get bounding box of this bounding box's corners with the transform
+        applied.
+        """
+        if transform.is_identity:
+            return self
+
+        bbox = BBox.from_points(transform.apply(x, y) for x, y in self.corners)
+        assert bbox is not None
+
+        return bbox
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_transform(value: str | None) -> Affine:
+    """
+    Parse the value of a `transform` attribute into a single transform.
+    Results are cached, as the same transforms are commonly repeated.
+
+    :raises ValueError: If the value is invalid
+    """
+    result = Affine()
+
+    if not value:
+        return result
+
+    for name, args_str in _TRANSFORM_PATTERN.findall(value):
+        args = [float(a) for a in re.split(r"[\s,]+", args_str.strip()) if a]
+        result = result @ _get_transform(name, args)
+
+    return result
+
+
+def get_bbox(
+    element: Element,
+    viewport: tuple[float, float] | None = None,
+    ancestors: Iterable[Element] = (),
+) -> BBox | None:
+    """
+    Get bounding box of the element in its parent's coordinate system,
+    including stroke and the element's own transform. Returns
+    `None`{l=python} if the element has no rendered geometry; elements
+    whose geometry can't be determined, e.g. text, are ignored.
+
+    :param viewport: Size of the viewport established by the parent, used to resolve percentage lengths
+    :param ancestors: Ancestors of the element, outermost first, from which stroke properties are inherited
+    """
+    stroke = _Stroke()
+
+    for ancestor in ancestors:
+        stroke = stroke.update(ancestor, viewport)
+
+    bbox, _ = _get_extents(element, Affine(), viewport, stroke)
+    return bbox
+
+
+def get_content_bbox(
+    element: Element,
+    viewport: tuple[float, float] | None = None,
+    ancestors: Iterable[Element] = (),
+) -> BBox | None:
+    """
+    Get bounding box of the container element's children in its own
+    coordinate system, not clipped to its viewport.
+
+    :param viewport: Size of the viewport established by the element
+    :param ancestors: Ancestors of the element, outermost first
+    """
+    stroke = _Stroke()
+
+    for ancestor in [*ancestors, element]:
+        stroke = stroke.update(ancestor, viewport)
+
+    return BBox.union_all(
+        _get_extents(child, Affine(), viewport, stroke)[0]
+        for child in _get_children(element)
+    )
+
+
+def invalidate(element: Element | None = None):
+    """
+    Invalidate cached extents of the element and its ancestors, or all
+    cached extents if no element is provided. Must be called without an
+    element after mutating `svgwrite` elements directly rather than through
+    glyphsynth APIs.
+    """
+    global _version
+
+    if element is None:
+        _version += 1
+        return
+
+    elements: list[Element] = [element]
+    visited: set[int] = set()
+
+    while elements:
+        element_ = elements.pop()
+
+        if id(element_) in visited:
+            continue
+
+        visited.add(id(element_))
+        _versions[element_] = _versions.get(element_, 0) + 1
+
+        if (parents := _parents.get(element_)) is not None:
+            elements.extend(parents)
+
+
+def get_version(element: Element | None = None) -> int:
+    """
+    Get the version of cached extents of the element, incremented upon
+    invalidating it or any of its descendants, or upon invalidating all
+    cached extents. Can be used to invalidate other state derived from
+    extents.
+    """
+    node_version = _versions.get(element, 0) if element is not None else 0
+    return _version + node_version
+
+
+def _set_parent(elements: Iterable[Element], parent: Element):
+    """
+    Record the container to which elements were added, so invalidating them
+    also invalidates it.
+    """
+    for element in elements:
+        if (parents := _parents.get(element)) is None:
+            parents = _parents[element] = weakref.WeakSet()
+        parents.add(parent)
+
+
+def cull[
+    ElementT: svgwrite.base.BaseElement
+](
+    element: ElementT,
+    region: BBox,
+    viewport: tuple[float, float] | None = None,
+) -> ElementT:
+    """
+    Get a copy of the container element omitting descendants which are
+    entirely outside the region, given in the element's coordinate system.
+    Containers are copied only as needed; elements whose geometry can't be
+    determined are kept.
+
+    :param viewport: Size of the viewport established by the element, used to resolve percentage lengths
+    """
+    return _cull_children(element, Affine(), viewport, _Stroke(), region)
+
+
+def simplify_points(
+    points: Iterable[tuple[float, float]] | NDArray[np.float64],
+    tolerance: float,
+) -> NDArray[np.float64]:
+    """
+    Simplify a polyline using the Ramer-Douglas-Peucker algorithm, omitting
+    points such that no omitted point is further than the tolerance from
+    the simplified polyline. The first and last points are always kept.
+    Returns the remaining points with shape `(n, 2)`.
+    """
+    points_ = np.asarray(
+        points if isinstance(points, np.ndarray) else list(points),
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+    keep = np.zeros(len(points_), dtype=np.bool_)
+
+    if len(points_):
+        keep[[0, -1]] = True
+
+    # ranges of points to check, given by the points kept at either end
+    ranges: list[tuple[int, int]] = [(0, len(points_) - 1)]
+
+    while ranges:
+        start, end = ranges.pop()
+
+        if end - start < 2:
+            continue
+
+        distances = _get_segment_distances(
+            points_[start + 1 : end], points_[start], points_[end]
+        )
+        index = int(np.argmax(distances))
+
+        if distances[index] > tolerance:
+            index += start + 1
+            keep[index] = True
+            ranges += [(start, index), (index, end)]
+
+    return points_[keep]
+
+
+@dataclass(frozen=True)
+class _Stroke:
+    """
+    Inherited stroke properties.
+    """
+
+    enabled: bool = False
+    width: float | None = 1.0
+    linecap: str = "butt"
+    linejoin: str = "miter"
+    miterlimit: float = 4.0
+
+    def update(
+        self,
+        element: Element,
+        viewport: tuple[float, float] | None,
+    ) -> _Stroke:
+        attribs = _get_attribs(element)
+
+        if not any(k.startswith("stroke") for k in attribs):
+            return self
+
+        changes: dict[str, Any] = {}
+
+        if (stroke := attribs.get("stroke")) is not None:
+            changes["enabled"] = str(stroke) != "none"
+        if (width := attribs.get("stroke-width")) is not None:
+            changes["width"] = _parse_length(width, _get_diagonal(viewport))
+        if (linecap := attribs.get("stroke-linecap")) is not None:
+            changes["linecap"] = str(linecap)
+        if (linejoin := attribs.get("stroke-linejoin")) is not None:
+            changes["linejoin"] = str(linejoin)
+        if (miterlimit := attribs.get("stroke-miterlimit")) is not None:
+            changes["miterlimit"] = float(miterlimit)
+
+        return replace(self, **changes)
+
+    @property
+    def half_width(self) -> float | None:
+        """
+        Half of the width of the stroke, 0 if not stroked or
+        `None`{l=python} if unknown.
+        """
+        if not self.enabled:
+            return 0.0
+
+        return self.width / 2 if self.width is not None else None
+
+
+@dataclass(frozen=True)
+class _Geometry:
+    """
+    Points and axis-aligned ellipses in local coordinates whose transformed
+    extents contain the painted area of a shape.
+    """
+
+    points: NDArray[np.float64]
+    """
+    Points with shape `(n, 2)`.
+    """
+
+    ellipses: NDArray[np.float64]
+    """
+    Ellipses as `(cx, cy, rx, ry)` with shape `(n, 4)`.
+    """
+
+    @classmethod
+    def new(
+        cls,
+        points: list[NDArray[np.float64]] | None = None,
+        ellipses: list[NDArray[np.float64]] | None = None,
+    ) -> _Geometry:
+        return cls(
+            np.concatenate(points) if points else np.zeros((0, 2)),
+            np.concatenate(ellipses) if ellipses else np.zeros((0, 4)),
+        )
+
+    def get_bbox(self, ctm: Affine) -> BBox | None:
+        a, b, c, d, e, f = ctm.a, ctm.b, ctm.c, ctm.d, ctm.e, ctm.f
+        mins: list[tuple[float, float]] = []
+        maxs: list[tuple[float, float]] = []
+
+        if len(self.points):
+            px, py = self.points[:, 0], self.points[:, 1]
+            xs, ys = a * px + c * py + e, b * px + d * py + f
+
+            mins.append((xs.min(), ys.min()))
+            maxs.append((xs.max(), ys.max()))
+
+        if len(self.ellipses):
+            cx, cy, rx, ry = self.ellipses.T
+            xs, ys = a * cx + c * cy + e, b * cx + d * cy + f
+
+            # half extents of transformed ellipses
+            hx, hy = np.hypot(a * rx, c * ry), np.hypot(b * rx, d * ry)
+
+            mins.append(((xs - hx).min(), (ys - hy).min()))
+            maxs.append(((xs + hx).max(), (ys + hy).max()))
+
+        if not len(mins):
+            return None
+
+        return BBox(
+            float(min(m[0] for m in mins)),
+            float(min(m[1] for m in mins)),
+            float(max(m[0] for m in maxs)),
+            float(max(m[1] for m in maxs)),
+        )
+
+
+def _format_number(value: float) -> str:
+    """
+    Format number compactly, removing floating-point noise e.g. from
+    trigonometric functions.
+    """
+    rounded = round(value, 10)
+    return f"{rounded if rounded != 0 else 0.0:.12g}"
+
+
+def _format_numbers(values: NDArray[np.float64]) -> NDArray[np.str_]:
+    """
+    Format array of numbers at once, as with {obj}`_format_number`.
+    """
+    # adding 0 converts negative zero
+    return np.char.mod("%.12g", np.round(values, 10) + 0.0)
+
+
+def _format_points(points: NDArray[np.float64]) -> list[str]:
+    """
+    Format points with shape `(n, 2)` as `"x,y"` strings.
+    """
+    coords = _format_numbers(points)
+    return np.char.add(np.char.add(coords[:, 0], ","), coords[:, 1]).tolist()
+
+
+def _get_segment_distances(
+    points: NDArray[np.float64],
+    start: NDArray[np.float64],
+    end: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Get distance of each point from the line segment.
+    """
+    direction = end - start
+    length_sq = float(direction @ direction)
+
+    if length_sq == 0.0:
+        return np.hypot(*(points - start).T)
+
+    # parameter of the closest point on the segment
+    t = np.clip((points - start) @ direction / length_sq, 0.0, 1.0)
+
+    return np.hypot(*(points - start - t[:, None] * direction).T)
+
+
+def _get_transform(name: str, args: list[float]) -> Affine:
+    match name, args:
+        case "matrix", [a, b, c, d, e, f]:
+            return Affine(a, b, c, d, e, f)
+        case "translate", [x]:
+            return Affine.translation(x)
+        case "translate", [x, y]:
+            return Affine.translation(x, y)
+        case "scale", [x]:
+            return Affine.scaling(x)
+        case "scale", [x, y]:
+            return Affine.scaling(x, y)
+        case "rotate", [angle]:
+            return Affine.rotation(angle)
+        case "rotate", [angle, x, y]:
+            return Affine.rotation(angle, center=(x, y))
+        case "skewX", [angle]:
+            return Affine.skewing_x(angle)
+        case "skewY", [angle]:
+            return Affine.skewing_y(angle)
+
+    raise ValueError(f"Invalid transform: {name}({args})")
+
+
+def _get_name(element: Element) -> str:
+    if isinstance(element, ElementTree.Element):
+        return element.tag
+    return element.elementname
+
+
+def _get_attribs(element: Element) -> Mapping[str, Any]:
+    if isinstance(element, ElementTree.Element):
+        return element.attrib
+    return element.attribs
+
+
+def _get_children(element: Element) -> list[Element]:
+    if isinstance(element, ElementTree.Element):
+        return list(element)
+    return element.elements
+
+
+def _get_point_array(element: Element) -> NDArray[np.float64]:
+    """
+    Get points of a polyline or polygon with shape `(n, 2)`.
+    """
+    if isinstance(element, ElementTree.Element):
+        values = re.split(r"[\s,]+", element.get("points", "").strip())
+        return np.array(
+            [float(v) for v in values if v], dtype=np.float64
+        ).reshape(-1, 2)
+
+    return np.array(element.points, dtype=np.float64).reshape(-1, 2)
+
+
+def _get_path_data(element: Element) -> str:
+    if isinstance(element, ElementTree.Element):
+        return element.get("d", "")
+    return " ".join(str(c) for c in element.commands)
+
+
+def _parse_length(value: Any, reference: float | None) -> float | None:
+    """
+    Parse length in user units, resolving percentages relative to the
+    reference. Returns `None`{l=python} if the length can't be resolved.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    if (match := _LENGTH_PATTERN.match(str(value))) is None:
+        return None
+
+    number, unit = float(match.group(1)), match.group(2)
+
+    if unit == "%":
+        return number / 100 * reference if reference is not None else None
+
+    return number * UNITS[unit] if unit in UNITS else None
+
+
+def _get_diagonal(viewport: tuple[float, float] | None) -> float | None:
+    """
+    Get reference length for percentages which aren't horizontal or
+    vertical.
+    """
+    if viewport is None:
+        return None
+    return math.sqrt((viewport[0] ** 2 + viewport[1] ** 2) / 2)
+
+
+def _get_lengths(
+    element: Element,
+    viewport: tuple[float, float] | None,
+    **names: tuple[str, float | None],
+) -> dict[str, float | None]:
+    """
+    Get lengths by attribute name, given the axis ("x", "y" or "xy") for
+    percentages and a default value.
+    """
+    refs = {
+        "x": viewport[0] if viewport else None,
+        "y": viewport[1] if viewport else None,
+        "xy": _get_diagonal(viewport),
+    }
+
+    lengths: dict[str, float | None] = {}
+
+    for name, (axis, default) in names.items():
+        value = _get_attribs(element).get(name)
+        lengths[name] = (
+            default if value is None else _parse_length(value, refs[axis])
+        )
+
+    return lengths
+
+
+def _get_viewport_transform(
+    element: Element,
+    viewport: tuple[float, float] | None,
+) -> tuple[Affine, BBox | None, tuple[float, float] | None] | None:
+    """
+    Get transform to coordinate system established by a nested `<svg>`,
+    its viewport in the parent's coordinate system if known, and the
+    viewport size for its children. Returns `None`{l=python} if the
+    coordinate system can't be determined.
+    """
+    # width and height default to 100%
+    lengths = _get_lengths(
+        element,
+        viewport,
+        x=("x", 0.0),
+        y=("y", 0.0),
+        width=("x", viewport[0] if viewport else None),
+        height=("y", viewport[1] if viewport else None),
+    )
+    x, y = lengths["x"], lengths["y"]
+    width, height = lengths["width"], lengths["height"]
+
+    if x is None or y is None:
+        return None
+
+    clip = (
+        BBox.from_rect(x, y, width, height)
+        if width is not None and height is not None
+        else None
+    )
+
+    if (viewbox := _get_attribs(element).get("viewBox")) is None:
+        return (
+            Affine.translation(x, y),
+            clip,
+            (width, height)
+            if width is not None and height is not None
+            else None,
+        )
+
+    vb_x, vb_y, vb_width, vb_height = (
+        float(v) for v in re.split(r"[\s,]+", str(viewbox).strip())
+    )
+
+    if width is None or height is None or vb_width <= 0 or vb_height <= 0:
+        return None
+
+    scale_x, scale_y = width / vb_width, height / vb_height
+
+    align, _, meet_or_slice = (
+        str(_get_attribs(element).get("preserveAspectRatio", "xMidYMid meet"))
+        .replace("defer", "")
+        .strip()
+        .partition(" ")
+    )
+
+    if align != "none":
+        scale_x = scale_y = (
+            max(scale_x, scale_y)
+            if meet_or_slice == "slice"
+            else min(scale_x, scale_y)
+        )
+
+    translate_x = x - vb_x * scale_x
+    translate_y = y - vb_y * scale_y
+
+    # align viewbox within viewport
+    if "xMid" in align:
+        translate_x += (width - vb_width * scale_x) / 2
+    elif "xMax" in align:
+        translate_x += width - vb_width * scale_x
+
+    if "YMid" in align:
+        translate_y += (height - vb_height * scale_y) / 2
+    elif "YMax" in align:
+        translate_y += height - vb_height * scale_y
+
+    return (
+        Affine(a=scale_x, d=scale_y, e=translate_x, f=translate_y),
+        clip,
+        (vb_width, vb_height),
+    )
+
+
+def _get_container_transform(
+    element: Element,
+    viewport: tuple[float, float] | None,
+) -> tuple[Affine, BBox | None, tuple[float, float] | None] | None:
+    """
+    Get transform to the coordinate system of the container's children,
+    its clip region in the parent's coordinate system if any, and the
+    viewport size for its children.
+    """
+    transform = parse_transform(_get_attribs(element).get("transform"))
+
+    if _get_name(element) != "svg":
+        return (transform, None, viewport)
+
+    if (
+        viewport_transform := _get_viewport_transform(element, viewport)
+    ) is None:
+        return None
+
+    local, clip, viewport_ = viewport_transform
+    return (
+        transform @ local,
+        clip.transform(transform) if clip is not None else None,
+        viewport_,
+    )
+
+
+def _get_geometry(
+    element: Element,
+    viewport: tuple[float, float] | None,
+    stroke: _Stroke,
+) -> _Geometry | None:
+    """
+    Get geometry of the shape including its stroke, or `None`{l=python} if
+    unknown.
+    """
+    name = _get_name(element)
+
+    if (half_width := stroke.half_width) is None:
+        return None
+
+    match name:
+        case "line":
+            lengths = _get_lengths(
+                element,
+                viewport,
+                x1=("x", 0.0),
+                y1=("y", 0.0),
+                x2=("x", 0.0),
+                y2=("y", 0.0),
+            )
+            x1, y1, x2, y2 = (
+                lengths["x1"],
+                lengths["y1"],
+                lengths["x2"],
+                lengths["y2"],
+            )
+
+            if x1 is None or y1 is None or x2 is None or y2 is None:
+                return None
+
+            return _get_polyline_geometry(
+                np.array([[x1, y1], [x2, y2]]), False, half_width, stroke
+            )
+
+        case "polyline" | "polygon":
+            points = _get_point_array(element)
+            return _get_polyline_geometry(
+                points, name == "polygon", half_width, stroke
+            )
+
+        case "rect" | "image" | "use":
+            lengths = _get_lengths(
+                element,
+                viewport,
+                x=("x", 0.0),
+                y=("y", 0.0),
+                width=("x", None),
+                height=("y", None),
+                rx=("x", None),
+                ry=("y", None),
+            )
+            x, y = lengths["x"], lengths["y"]
+            width, height = lengths["width"], lengths["height"]
+
+            if x is None or y is None or width is None or height is None:
+                return None
+
+            if name != "rect":
+                return _Geometry.new(
+                    [np.array(BBox.from_rect(x, y, width, height).corners)]
+                )
+
+            # radii default to each other, limited to half of the size
+            rx, ry = lengths["rx"], lengths["ry"]
+            rx_ = rx if rx is not None else ry if ry is not None else 0.0
+            ry_ = ry if ry is not None else rx_
+
+            return _get_rect_geometry(
+                BBox.from_rect(x, y, width, height),
+                min(rx_, width / 2),
+                min(ry_, height / 2),
+                half_width,
+                stroke,
+            )
+
+        case "circle" | "ellipse":
+            lengths = _get_lengths(
+                element,
+                viewport,
+                cx=("x", 0.0),
+                cy=("y", 0.0),
+                r=("xy", 0.0),
+                rx=("x", None),
+                ry=("y", None),
+            )
+            cx, cy = lengths["cx"], lengths["cy"]
+            rx = lengths["r"] if name == "circle" else lengths["rx"]
+            ry = lengths["r"] if name == "circle" else lengths["ry"]
+
+            if cx is None or cy is None or rx is None or ry is None:
+                return None
+
+            return _Geometry.new(
+                ellipses=[
+                    np.array([[cx, cy, rx + half_width, ry + half_width]])
+                ]
+            )
+
+        case "path":
+            return _get_path_geometry(
+                _get_path_data(element), half_width, stroke
+            )
+
+    return None
+
+
+def _get_path_geometry(
+    d: str, half_width: float, stroke: _Stroke
+) -> _Geometry | None:
+    """
+    Get geometry of a path. Subpaths consisting of lines are handled as
+    polylines; curves and arcs are bounded by their control points and the
+    extent of their ellipse respectively, with their stroke bounded by the
+    miter limit or square caps.
+    """
+    from .path import _get_absolute
+
+    try:
+        commands = _get_absolute(d)
+    except ValueError:
+        return None
+
+    geometries: list[_Geometry] = []
+
+    # points of the current subpath, and whether it's only lines
+    points: list[tuple[float, float]] = []
+    lines = True
+    start = (0.0, 0.0)
+
+    def add_subpath(closed: bool):
+        if not points:
+            return
+
+        array = np.array(points, dtype=np.float64)
+
+        if lines:
+            geometries.append(
+                _get_polyline_geometry(array, closed, half_width, stroke)
+            )
+        else:
+            # bound stroke extending past each point by joins and caps
+            factor = max(
+                stroke.miterlimit if stroke.linejoin in MITER_JOINS else 1.0,
+                math.sqrt(2) if stroke.linecap == "square" else 1.0,
+            )
+            radii = np.full((len(array), 2), half_width * factor)
+            geometries.append(
+                _Geometry.new([array], [np.concatenate([array, radii], axis=1)])
+            )
+
+    for letter, args in commands:
+        # subpath continues from the start of a closed subpath
+        if letter not in ("M", "Z") and not points:
+            points = [start]
+
+        match letter:
+            case "M":
+                add_subpath(False)
+                start = (args[0], args[1])
+                points, lines = [start], True
+            case "Z":
+                add_subpath(True)
+                points, lines = [], True
+            case "L":
+                points.append((args[0], args[1]))
+            case "A":
+                points += _get_arc_points(points[-1], *args)
+                lines = False
+            case _:
+                points += [
+                    (args[i], args[i + 1]) for i in range(0, len(args), 2)
+                ]
+                lines = False
+
+    add_subpath(False)
+
+    return _merge_geometry(*geometries)
+
+
+def _get_arc_points(
+    start: tuple[float, float],
+    rx: float,
+    ry: float,
+    angle: float,
+    large: float,
+    sweep: float,
+    x: float,
+    y: float,
+) -> list[tuple[float, float]]:
+    """
+    Get corners of the rectangle bounding the arc's ellipse followed by its
+    end point, converting from endpoint to center parameterization.
+    """
+    x1, y1 = start
+
+    if rx == 0 or ry == 0:
+        return [(x, y)]
+
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    rx, ry = abs(rx), abs(ry)
+
+    # midpoint in the ellipse's coordinate system
+    dx, dy = (x1 - x) / 2, (y1 - y) / 2
+    x1_, y1_ = cos * dx + sin * dy, -sin * dx + cos * dy
+
+    # scale up radii if too small to span the endpoints
+    if (scale := (x1_ / rx) ** 2 + (y1_ / ry) ** 2) > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+
+    numerator = (rx * ry) ** 2 - (rx * y1_) ** 2 - (ry * x1_) ** 2
+    denominator = (rx * y1_) ** 2 + (ry * x1_) ** 2
+    coef = math.sqrt(max(numerator, 0.0) / denominator) if denominator else 0.0
+    coef *= -1 if large == sweep else 1
+
+    cx_, cy_ = coef * rx * y1_ / ry, -coef * ry * x1_ / rx
+    cx = cos * cx_ - sin * cy_ + (x1 + x) / 2
+    cy = sin * cx_ + cos * cy_ + (y1 + y) / 2
+
+    return [
+        (cx + i * rx * cos - j * ry * sin, cy + i * rx * sin + j * ry * cos)
+        for i, j in ((-1, -1), (1, -1), (1, 1), (-1, 1))
+    ] + [(x, y)]
+
+
+def _get_polyline_geometry(
+    points: NDArray[np.float64],
+    closed: bool,
+    half_width: float,
+    stroke: _Stroke,
+) -> _Geometry:
+    """
+    Get geometry of a stroked polyline or polygon, including the outline of
+    each segment, joins and caps.
+    """
+
+    if half_width == 0 or not len(points):
+        return _Geometry.new([points])
+
+    # remove zero-length segments
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    points_ = points[keep]
+
+    if closed and len(points_) > 1 and np.all(points_[0] == points_[-1]):
+        points_ = points_[:-1]
+
+    if len(points_) == 1:
+        return _get_cap_geometry(points_, None, half_width, stroke)
+
+    starts = points_ if closed else points_[:-1]
+    ends = np.roll(points_, -1, axis=0) if closed else points_[1:]
+
+    deltas = ends - starts
+    tangents = deltas / np.linalg.norm(deltas, axis=1)[:, None]
+    normals = np.stack([-tangents[:, 1], tangents[:, 0]], axis=1)
+    offsets = normals * half_width
+
+    outline = [
+        starts + offsets,
+        starts - offsets,
+        ends + offsets,
+        ends - offsets,
+    ]
+    geometry = _Geometry.new(outline)
+
+    # get joins between consecutive segments
+    if closed:
+        vertices = ends
+        tangents_in, tangents_out = tangents, np.roll(tangents, -1, axis=0)
+    else:
+        vertices = ends[:-1]
+        tangents_in, tangents_out = tangents[:-1], tangents[1:]
+
+    joins = _get_join_geometry(
+        vertices, tangents_in, tangents_out, half_width, stroke
+    )
+
+    if closed:
+        return _merge_geometry(geometry, joins)
+
+    caps = _get_cap_geometry(
+        np.stack([points_[0], points_[-1]]),
+        np.stack([-tangents[0], tangents[-1]]),
+        half_width,
+        stroke,
+    )
+
+    return _merge_geometry(geometry, joins, caps)
+
+
+def _get_join_geometry(
+    vertices: NDArray[np.float64],
+    tangents_in: NDArray[np.float64],
+    tangents_out: NDArray[np.float64],
+    half_width: float,
+    stroke: _Stroke,
+) -> _Geometry:
+    """
+    Get geometry of joins at vertices beyond the outline of the segments.
+    """
+
+    if not len(vertices):
+        return _Geometry.new()
+
+    if stroke.linejoin == "round":
+        return _Geometry.new(ellipses=[_get_circles(vertices, half_width)])
+
+    if stroke.linejoin not in MITER_JOINS:
+        # bevel joins don't extend beyond the segments
+        return _Geometry.new()
+
+    # outer side is opposite the direction of the turn
+    cross = (
+        tangents_in[:, 0] * tangents_out[:, 1]
+        - tangents_in[:, 1] * tangents_out[:, 0]
+    )
+    sign = np.where(cross > 0, -1.0, 1.0)[:, None]
+
+    normals_in = np.stack([-tangents_in[:, 1], tangents_in[:, 0]], axis=1)
+    normals_out = np.stack([-tangents_out[:, 1], tangents_out[:, 0]], axis=1)
+
+    # direction of miter from vertex
+    miters = (normals_in + normals_out) * sign
+    norms = np.linalg.norm(miters, axis=1)
+    valid = norms > 1e-9
+
+    directions = miters[valid] / norms[valid][:, None]
+
+    # ratio of miter length to stroke width
+    cos = np.sum(directions * normals_in[valid] * sign[valid], axis=1)
+    ratios = 1 / np.maximum(cos, 1e-9)
+    within_limit = ratios <= stroke.miterlimit
+
+    tips = (
+        vertices[valid][within_limit]
+        + directions[within_limit]
+        * (half_width * ratios[within_limit])[:, None]
+    )
+
+    return _Geometry.new([tips])
+
+
+def _get_cap_geometry(
+    points: NDArray[np.float64],
+    directions: NDArray[np.float64] | None,
+    half_width: float,
+    stroke: _Stroke,
+) -> _Geometry:
+    """
+    Get geometry of caps at end points given the outward direction of each,
+    or `None`{l=python} for zero-length subpaths.
+    """
+
+    match stroke.linecap:
+        case "round":
+            return _Geometry.new(ellipses=[_get_circles(points, half_width)])
+        case "square":
+            if directions is None:
+                # zero-length subpaths are aligned with the x-axis
+                directions = np.tile([1.0, 0.0], (len(points), 1))
+
+            normals = np.stack([-directions[:, 1], directions[:, 0]], axis=1)
+            ends = points + directions * half_width
+
+            return _Geometry.new(
+                [
+                    points - directions * half_width + normals * half_width,
+                    points - directions * half_width - normals * half_width,
+                    ends + normals * half_width,
+                    ends - normals * half_width,
+                ]
+            )
+
+    # butt caps don't extend beyond the segments
+    return _Geometry.new([points])
+
+
+def _get_rect_geometry(
+    rect: BBox,
+    rx: float,
+    ry: float,
+    half_width: float,
+    stroke: _Stroke,
+) -> _Geometry:
+    """
+    Get geometry of a stroked rect, possibly with rounded corners.
+    """
+
+    inner = BBox(
+        rect.x_min + rx, rect.y_min + ry, rect.x_max - rx, rect.y_max - ry
+    )
+
+    if rx > 0 and ry > 0:
+        # rounded corners, approximating stroke as a larger ellipse
+        return _Geometry.new(
+            ellipses=[
+                np.array(
+                    [
+                        [x, y, rx + half_width, ry + half_width]
+                        for x, y in inner.corners
+                    ]
+                )
+            ]
+        )
+
+    corners = np.array(rect.corners)
+
+    if half_width == 0:
+        return _Geometry.new([corners])
+
+    # miter length of right angles is sqrt(2) times the stroke width
+    if stroke.linejoin in MITER_JOINS and stroke.miterlimit >= math.sqrt(2):
+        return _Geometry.new([np.array(rect.inflate(half_width).corners)])
+
+    if stroke.linejoin == "round":
+        return _Geometry.new(ellipses=[_get_circles(corners, half_width)])
+
+    # beveled corners
+    return _Geometry.new(
+        [
+            np.array(
+                BBox(
+                    rect.x_min - half_width,
+                    rect.y_min,
+                    rect.x_max + half_width,
+                    rect.y_max,
+                ).corners
+            ),
+            np.array(
+                BBox(
+                    rect.x_min,
+                    rect.y_min - half_width,
+                    rect.x_max,
+                    rect.y_max + half_width,
+                ).corners
+            ),
+        ]
+    )
+
+
+def _get_circles(
+    centers: NDArray[np.float64], radius: float
+) -> NDArray[np.float64]:
+    return np.concatenate([centers, np.full((len(centers), 2), radius)], axis=1)
+
+
+def _merge_geometry(*geometries: _Geometry) -> _Geometry:
+    return _Geometry.new(
+        [g.points for g in geometries], [g.ellipses for g in geometries]
+    )
+
+
+def _get_extents(
+    element: Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    stroke: _Stroke,
+) -> tuple[BBox | None, bool]:
+    """
+    Get bounding box of the element with the transform applied, and whether
+    any of its geometry couldn't be determined.
+    """
+    name = _get_name(element)
+
+    if name in NON_RENDERING_ELEMENTS:
+        return (None, False)
+
+    if name in CONTAINER_ELEMENTS:
+        # cached extents can be transformed exactly unless rotated or skewed
+        if ctm.b != 0 or ctm.c != 0:
+            return _get_container_extents(element, ctm, viewport, stroke)
+
+        key = (get_version(element), viewport, stroke)
+        cached = _cache.get(element)
+
+        if cached is None or cached[0] != key:
+            bbox, unknown = _get_container_extents(
+                element, Affine(), viewport, stroke
+            )
+            cached = (key, bbox, unknown)
+            _cache[element] = cached
+
+        _, bbox, unknown = cached
+        return (bbox.transform(ctm) if bbox is not None else None, unknown)
+
+    stroke_ = stroke.update(element, viewport)
+
+    if (geometry := _get_geometry(element, viewport, stroke_)) is None:
+        return (None, True)
+
+    ctm_ = ctm @ parse_transform(_get_attribs(element).get("transform"))
+
+    return (geometry.get_bbox(ctm_), False)
+
+
+def _get_container_extents(
+    element: Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    stroke: _Stroke,
+) -> tuple[BBox | None, bool]:
+    if (container := _get_container_transform(element, viewport)) is None:
+        return (None, True)
+
+    stroke_ = stroke.update(element, viewport)
+    local, clip, viewport_ = container
+    ctm_ = ctm @ local
+
+    bboxes: list[BBox | None] = []
+    unknown = False
+
+    for child in _get_children(element):
+        bbox, child_unknown = _get_extents(child, ctm_, viewport_, stroke_)
+        bboxes.append(bbox)
+        unknown |= child_unknown
+
+    bbox = BBox.union_all(bboxes)
+
+    # clip to viewport of nested <svg>
+    if bbox is not None and clip is not None:
+        bbox = bbox.intersection(clip.transform(ctm))
+
+    return (bbox, unknown)
+
+
+def _cull_children[
+    ElementT: svgwrite.base.BaseElement
+](
+    element: ElementT,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    stroke: _Stroke,
+    region: BBox,
+) -> ElementT:
+    # svgwrite's copy() would assign a new id, breaking references to it
+    culled = copy.copy(element)
+    culled.attribs = dict(element.attribs)
+    culled.elements = []
+
+    for child in element.elements:
+        if (child_ := _cull(child, ctm, viewport, stroke, region)) is not None:
+            culled.elements.append(child_)
+
+    return culled
+
+
+def _cull(
+    element: svgwrite.base.BaseElement,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    stroke: _Stroke,
+    region: BBox,
+) -> svgwrite.base.BaseElement | None:
+    """
+    Get the element with any descendants outside the region omitted, or
+    `None`{l=python} if it's entirely outside the region.
+    """
+    name = element.elementname
+
+    if name in NON_RENDERING_ELEMENTS:
+        return element
+
+    stroke_ = stroke.update(element, viewport)
+
+    if name in CONTAINER_ELEMENTS:
+        if (container := _get_container_transform(element, viewport)) is None:
+            return element
+
+        local, clip, viewport_ = container
+
+        # skip nested <svg> outside region without traversing children
+        if clip is not None and not clip.transform(ctm).intersects(region):
+            return None
+
+        culled = _cull_children(
+            element, ctm @ local, viewport_, stroke_, region
+        )
+
+        # omit containers without any rendered children
+        if not any(
+            e.elementname not in NON_RENDERING_ELEMENTS for e in culled.elements
+        ):
+            return None
+
+        return culled
+
+    bbox, unknown = _get_extents(element, ctm, viewport, stroke)
+
+    if unknown or (bbox is not None and bbox.intersects(region)):
+        return element
+
+    return None
@@ -0,0 +1,1391 @@
+"""
+Optimizations applied to exported documents, configured by
+{obj}`ExportOptions`.
+
+Optimizations operate on the XML of the document being exported, so they
+never modify the drawing itself.
+"""
+from __future__ import annotations
+
+import copy
+import math
+import re
+from typing import Any, cast
+from xml.etree import ElementTree
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ._model import BaseFieldsModel
+from .geometry import (
+    CONTAINER_ELEMENTS,
+    NON_RENDERING_ELEMENTS,
+    Affine,
+    BBox,
+    _format_number,
+    _format_points,
+    _get_container_extents,
+    _get_container_transform,
+    _get_diagonal,
+    _get_lengths,
+    _get_point_array,
+    _get_viewport_transform,
+    _parse_length,
+    _Stroke,
+    get_bbox,
+    parse_transform,
+    simplify_points,
+)
+from .path import PathCommand, encode_path, transform_path
+
+__all__ = [
+    "ExportOptions",
+    "optimize_xml",
+    "dedupe_gradients",
+]
+
+INHERITED_PROPERTIES = (
+    "clip-rule",
+    "color",
+    "color-interpolation",
+    "color-interpolation-filters",
+    "color-profile",
+    "color-rendering",
+    "cursor",
+    "direction",
+    "fill",
+    "fill-opacity",
+    "fill-rule",
+    "font",
+    "font-family",
+    "font-size",
+    "font-size-adjust",
+    "font-stretch",
+    "font-style",
+    "font-variant",
+    "font-weight",
+    "glyph-orientation-horizontal",
+    "glyph-orientation-vertical",
+    "image-rendering",
+    "kerning",
+    "letter-spacing",
+    "marker",
+    "marker-end",
+    "marker-mid",
+    "marker-start",
+    "pointer-events",
+    "shape-rendering",
+    "stroke",
+    "stroke-dasharray",
+    "stroke-dashoffset",
+    "stroke-linecap",
+    "stroke-linejoin",
+    "stroke-miterlimit",
+    "stroke-opacity",
+    "stroke-width",
+    "text-anchor",
+    "text-rendering",
+    "visibility",
+    "word-spacing",
+    "writing-mode",
+)
+"""
+Properties inherited by children from their container.
+"""
+
+EFFECT_ATTRIBUTES = ("clip-path", "mask", "filter")
+"""
+Attributes referencing effects defined in the coordinate system of the
+element, which prevent it from being flattened.
+"""
+
+GROUP_ATTRIBUTES = ("opacity", "style")
+"""
+Attributes of containers which apply to their children as a whole, so are
+kept on a group when flattening.
+"""
+
+MERGED_ELEMENTS = ("line", "polyline", "path")
+"""
+Elements which may be merged into a single path.
+"""
+
+GEOMETRY_ATTRIBUTES = ("x1", "y1", "x2", "y2", "points", "d")
+"""
+Attributes giving the geometry of merged elements.
+"""
+
+MARKER_PROPERTIES = ("marker", "marker-start", "marker-mid", "marker-end")
+
+GRADIENT_ELEMENTS = ("linearGradient", "radialGradient")
+
+INHERITING_DEFINITIONS = ("clipPath", "mask", "marker", "pattern")
+"""
+Definitions whose content inherits properties from the definition's
+ancestors rather than from the referencing element.
+"""
+
+XLINK_HREF = "xlink:href"
+
+_URL_PATTERN = re.compile(r"^\s*url\(\s*#([^)\s]+)\s*\)(.*)$")
+_ID_PATTERN = re.compile(r"^id(\d+)$")
+_REFERENCE_PATTERN = re.compile(r"#([^\s)\"']+)")
+_CSS_SPECIAL_PATTERN = re.compile(r"[;{}<>&]")
+
+
+class ExportOptions(BaseFieldsModel):
+    """
+    Optimizations to apply when exporting a drawing.
+
+    Example:
+
+    ```python
+    drawing.export_svg(path, options=ExportOptions(flatten=True))
+    ```
+    """
+
+    flatten: bool = False
+    """
+    Apply all transforms and nested viewports to the coordinates of each
+    element, emitting a document without transforms or nested `<svg>`
+    elements:
+
+    - Lines, polylines and polygons have their points transformed
+    - Rects, circles and ellipses are adjusted in place if only scaled and
+      translated, otherwise converted to `<path>` elements
+    - Stroke widths are scaled by the geometric mean of the scale factors,
+      so are approximate if scaled non-uniformly
+    - Nested viewports are replaced by a clip path, only if their content
+      would otherwise overflow them
+    - Elements which can't be flattened, e.g. text, or elements and
+      containers referencing clip paths, masks or filters, keep a single
+      transform
+    - Ids and classes of dissolved containers are omitted
+    """
+
+    coalesce_paths: bool = False
+    """
+    Merge consecutive sibling lines, polylines and paths with identical
+    attributes, aside from their geometry, into a single `<path>` with a
+    subpath for each. Only elements whose rendering is unaffected are
+    merged: those without an id, markers, fill, opacity or effects.
+    """
+
+    simplify_tolerance: float | None = None
+    """
+    Simplify polylines and polygons such that omitted points are within
+    this distance of the result in output pixels, see
+    {obj}`simplify_points`. The scale of each element is determined by the
+    transforms and viewports of its ancestors; those without markers,
+    outside of definitions, are simplified.
+    """
+
+    lod_threshold: float | None = None
+    """
+    Omit elements and nested drawings whose bounding box, including stroke,
+    has both dimensions below this size in output pixels, as they'd only
+    contribute sub-pixel detail. Elements whose geometry can't be
+    determined, e.g. text, are kept, as are definitions within omitted
+    drawings which are referenced elsewhere, e.g. shared gradients.
+    """
+
+    hoist_properties: bool = False
+    """
+    Move inherited properties, e.g. `stroke` or `fill`, which are set to
+    the same value on all rendered children of a container onto the
+    container itself. Applied bottom up, so properties shared throughout
+    nested drawings are set once on their outermost common container.
+    """
+
+    style_classes: bool = False
+    """
+    Replace inherited properties of elements sharing the same set of them
+    with a class, defined in a `<style>` element, where doing so shortens
+    the document.
+
+    Neither this nor hoisting is applied to documents which already have a
+    style sheet, as its rules may take precedence differently.
+    """
+
+
+def optimize_xml(xml: ElementTree.Element, options: ExportOptions):
+    """
+    Apply optimizations to the XML of a document in place.
+    """
+    if options.flatten:
+        _Flattener(xml).flatten()
+
+    # root viewport maps user units to output pixels
+    viewport_transform = _get_viewport_transform(xml, None)
+
+    if viewport_transform is not None:
+        ctm, _, viewport = viewport_transform
+
+        if options.lod_threshold is not None:
+            dropped: list[ElementTree.Element] = []
+            _drop_details(
+                xml, ctm, viewport, options.lod_threshold, [], dropped
+            )
+            _keep_definitions(xml, dropped)
+
+        if options.simplify_tolerance is not None:
+            _simplify(xml, ctm, viewport, options.simplify_tolerance, {})
+
+    if options.coalesce_paths:
+        _coalesce_paths(xml, {})
+
+    if not any(True for _ in xml.iter("style")):
+        if options.hoist_properties:
+            _hoist_properties(xml)
+
+        if options.style_classes:
+            _extract_classes(xml)
+
+
+def dedupe_gradients(xml: ElementTree.Element):
+    """
+    Remove gradients identical to a preceding gradient in the document, in
+    place, rewriting references to the one which is kept. Gradients are
+    compared by type, attributes and stops, aside from their id; only those
+    with generated ids are removed, as others may be referenced externally.
+    """
+
+    # id of first gradient for each key and of each removed gradient
+    gradients: dict[tuple[Any, ...], str] = {}
+    id_map: dict[str, str] = {}
+
+    def rewrite(value: str) -> str:
+        return _REFERENCE_PATTERN.sub(
+            lambda m: f"#{id_map.get(m.group(1), m.group(1))}", value
+        )
+
+    for parent in xml.iter():
+        children: list[ElementTree.Element] = []
+
+        for child in parent:
+            id_ = child.get("id")
+
+            if child.tag in GRADIENT_ELEMENTS and id_ is not None:
+                # gradients may inherit from a gradient which was removed
+                if (href := child.get(XLINK_HREF)) is not None:
+                    child.set(XLINK_HREF, rewrite(href))
+
+                key = _get_key(child)
+
+                if (id_kept := gradients.get(key)) is None:
+                    gradients[key] = id_
+                elif _ID_PATTERN.match(id_):
+                    id_map[id_] = id_kept
+                    continue
+
+            children.append(child)
+
+        if len(children) < len(parent):
+            parent[:] = children
+
+    if not id_map:
+        return
+
+    for element in xml.iter():
+        for name, value in element.attrib.items():
+            if "#" in value:
+                element.set(name, rewrite(value))
+
+
+class _Flattener:
+    """
+    Dissolves containers of a document, applying their transforms to their
+    descendants.
+    """
+
+    _root: ElementTree.Element
+    _defs: ElementTree.Element
+    """
+    Definitions collected from throughout the document.
+    """
+
+    _elements: dict[str, ElementTree.Element]
+    """
+    Elements by id, used to resolve references.
+    """
+
+    _gradients: dict[tuple[str, Affine], str]
+    """
+    Id of each gradient transformed to the root coordinate system.
+    """
+
+    _defined: set[str]
+    """
+    Ids of definitions collected so far.
+    """
+
+    _replaced: set[str]
+    """
+    Ids of definitions which have been inlined or replaced.
+    """
+
+    _next_id: int
+    _uses: list[ElementTree.Element]
+    """
+    Stack of referenced elements being inlined, used to detect cycles.
+    """
+
+    def __init__(self, root: ElementTree.Element):
+        self._root = root
+        self._defs = ElementTree.Element("defs")
+        self._elements = {
+            id_: e for e in root.iter() if (id_ := e.get("id")) is not None
+        }
+        self._gradients = {}
+        self._defined = set()
+        self._replaced = set()
+        self._next_id = (
+            max(
+                (
+                    int(m.group(1))
+                    for id_ in self._elements
+                    if (m := _ID_PATTERN.match(id_))
+                ),
+                default=0,
+            )
+            + 1
+        )
+        self._uses = []
+
+    def flatten(self):
+        # root viewport is kept, so its children are in root coordinates
+        viewport_transform = _get_viewport_transform(self._root, None)
+        viewport = (
+            viewport_transform[2] if viewport_transform is not None else None
+        )
+
+        children: list[ElementTree.Element] = []
+
+        for child in list(self._root):
+            children += self._flatten(child, Affine(), viewport, {})
+
+        self._root[:] = [self._defs] + children
+        self._remove_replaced()
+
+    def _flatten(
+        self,
+        element: ElementTree.Element,
+        ctm: Affine,
+        viewport: tuple[float, float] | None,
+        inherited: dict[str, str],
+    ) -> list[ElementTree.Element]:
+        """
+        Get elements equivalent to the provided element, with the transform
+        applied.
+        """
+        name = element.tag
+
+        if name == "defs":
+            for child in element:
+                self._define(child)
+            return []
+
+        if name in NON_RENDERING_ELEMENTS:
+            self._define(element)
+            return []
+
+        if name in CONTAINER_ELEMENTS:
+            return self._flatten_container(element, ctm, viewport, inherited)
+
+        if name == "use":
+            return self._flatten_use(element, ctm, viewport, inherited)
+
+        ctm_ = ctm @ parse_transform(element.get("transform"))
+
+        flattened = (
+            None
+            if any(a in element.attrib for a in EFFECT_ATTRIBUTES)
+            else _flatten_shape(element, ctm_, viewport)
+        )
+
+        if flattened is None:
+            return [self._keep(element, ctm, inherited)]
+
+        _inherit(flattened, inherited)
+        _scale_stroke(flattened, ctm_, viewport)
+        self._transform_paint(flattened, ctm_)
+
+        return [flattened]
+
+    def _flatten_container(
+        self,
+        element: ElementTree.Element,
+        ctm: Affine,
+        viewport: tuple[float, float] | None,
+        inherited: dict[str, str],
+    ) -> list[ElementTree.Element]:
+        container = _get_container_transform(element, viewport)
+
+        if container is None or any(
+            a in element.attrib for a in EFFECT_ATTRIBUTES
+        ):
+            return [self._keep(element, ctm, inherited)]
+
+        local, clip, viewport_ = container
+
+        return self._flatten_children(
+            element,
+            list(element),
+            ctm @ local,
+            viewport_,
+            _get_inherited(element, inherited),
+            clip.transform(ctm) if clip is not None else None,
+        )
+
+    def _flatten_use(
+        self,
+        element: ElementTree.Element,
+        ctm: Affine,
+        viewport: tuple[float, float] | None,
+        inherited: dict[str, str],
+    ) -> list[ElementTree.Element]:
+        """
+        Inline a reference to an element of this document.
+        """
+        href = element.get(XLINK_HREF, element.get("href", ""))
+        target = self._elements.get(href[1:]) if href.startswith("#") else None
+
+        if (
+            target is None
+            or target in self._uses
+            or any(a in element.attrib for a in EFFECT_ATTRIBUTES)
+        ):
+            return [self._keep(element, ctm, inherited)]
+
+        lengths = _get_lengths(element, viewport, x=("x", 0.0), y=("y", 0.0))
+        x, y = lengths["x"], lengths["y"]
+
+        if x is None or y is None:
+            return [self._keep(element, ctm, inherited)]
+
+        ctm_ = (
+            ctm
+            @ parse_transform(element.get("transform"))
+            @ Affine.translation(x, y)
+        )
+        inherited_ = _get_inherited(element, inherited)
+
+        self._uses.append(target)
+        self._replaced.add(href[1:])
+
+        try:
+            if target.tag != "symbol":
+                return self._flatten(
+                    copy.deepcopy(target), ctm_, viewport, inherited_
+                )
+
+            # symbol establishes a viewport sized by the reference
+            attribs = {
+                k: v
+                for k, v in target.attrib.items()
+                if k in ("viewBox", "preserveAspectRatio")
+            }
+            attribs |= {
+                k: v
+                for k, v in element.attrib.items()
+                if k in ("width", "height")
+            }
+
+            viewport_transform = _get_viewport_transform(
+                ElementTree.Element("svg", attribs), viewport
+            )
+
+            if viewport_transform is None:
+                return [self._keep(element, ctm, inherited)]
+
+            local, clip, viewport_ = viewport_transform
+
+            return self._flatten_children(
+                target,
+                [copy.deepcopy(e) for e in target],
+                ctm_ @ local,
+                viewport_,
+                _get_inherited(target, inherited_),
+                clip.transform(ctm_) if clip is not None else None,
+            )
+        finally:
+            self._uses.pop()
+
+    def _flatten_children(
+        self,
+        element: ElementTree.Element,
+        children: list[ElementTree.Element],
+        ctm: Affine,
+        viewport: tuple[float, float] | None,
+        inherited: dict[str, str],
+        clip: BBox | None,
+    ) -> list[ElementTree.Element]:
+        """
+        Flatten children of a container, given the transform to its
+        children's coordinate system and its viewport in root coordinates if
+        it establishes one.
+        """
+
+        # check for overflow before flattening, which moves any <defs>
+        overflow = clip is not None and _get_overflow(
+            element, ctm, viewport, inherited, clip
+        )
+
+        flattened: list[ElementTree.Element] = []
+
+        for child in children:
+            flattened += self._flatten(child, ctm, viewport, inherited)
+
+        if overflow and flattened:
+            assert clip is not None
+
+            clip_path = ElementTree.SubElement(
+                self._defs, "clipPath", id=self._get_id()
+            )
+            ElementTree.SubElement(
+                clip_path,
+                "rect",
+                x=_format_number(clip.x_min),
+                y=_format_number(clip.y_min),
+                width=_format_number(clip.width),
+                height=_format_number(clip.height),
+            )
+
+            group = ElementTree.Element(
+                "g", {"clip-path": f"url(#{clip_path.get('id')})"}
+            )
+            group.extend(flattened)
+            flattened = [group]
+
+        # keep attributes which apply to children as a whole, and links
+        attribs = {
+            k: v
+            for k, v in element.attrib.items()
+            if k in GROUP_ATTRIBUTES
+            or (element.tag == "a" and k not in INHERITED_PROPERTIES)
+        }
+        attribs.pop("transform", None)
+
+        if attribs or element.tag == "a":
+            group = ElementTree.Element(
+                "a" if element.tag == "a" else "g", attribs
+            )
+            group.extend(flattened)
+            flattened = [group]
+
+        return flattened
+
+    def _keep(
+        self,
+        element: ElementTree.Element,
+        ctm: Affine,
+        inherited: dict[str, str],
+    ) -> ElementTree.Element:
+        """
+        Get element which can't be flattened with the transform of its
+        parent applied as a single transform.
+        """
+
+        if ctm.is_identity:
+            kept = element
+        else:
+            # transform of <svg> isn't supported in SVG 1.1, so wrap in a
+            # group
+            kept = ElementTree.Element("g", transform=ctm.to_svg())
+            kept.append(element)
+
+        _inherit(kept, inherited)
+        return kept
+
+    def _transform_paint(self, element: ElementTree.Element, ctm: Affine):
+        """
+        Reference copies of gradients in user space with the transform
+        applied.
+        """
+        if ctm.is_identity:
+            return
+
+        for attr in ("fill", "stroke"):
+            if (match := _URL_PATTERN.match(element.get(attr, ""))) is None:
+                continue
+
+            id_ = match.group(1)
+            gradient = self._elements.get(id_)
+
+            if (
+                gradient is None
+                or gradient.tag not in ("linearGradient", "radialGradient")
+                or gradient.get("gradientUnits") != "userSpaceOnUse"
+            ):
+                continue
+
+            if (key := (id_, ctm)) not in self._gradients:
+                gradient_ = copy.deepcopy(gradient)
+                gradient_.set("id", self._get_id())
+                gradient_.set(
+                    "gradientTransform",
+                    (
+                        ctm @ parse_transform(gradient.get("gradientTransform"))
+                    ).to_svg(),
+                )
+
+                # reference the original to inherit its stops
+                if not len(gradient_):
+                    gradient_.set(XLINK_HREF, f"#{id_}")
+
+                self._defs.append(gradient_)
+                self._replaced.add(id_)
+                self._gradients[key] = gradient_.get("id", "")
+
+            # keep any fallback
+            element.set(attr, f"url(#{self._gradients[key]}){match.group(2)}")
+
+    def _define(self, element: ElementTree.Element):
+        """
+        Add definition, skipping copies from elements inlined more than
+        once.
+        """
+        if (id_ := element.get("id")) is not None:
+            if id_ in self._defined:
+                return
+            self._defined.add(id_)
+
+        self._defs.append(element)
+
+    def _remove_replaced(self):
+        """
+        Remove definitions which have been inlined or replaced by
+        transformed copies and are no longer referenced.
+        """
+        if not self._replaced:
+            return
+
+        referenced = {
+            id_
+            for e in self._root.iter()
+            for v in e.attrib.values()
+            for id_ in re.findall(r"#([^)\s]+)", v)
+        }
+
+        self._defs[:] = [
+            e
+            for e in self._defs
+            if e.get("id") not in self._replaced or e.get("id") in referenced
+        ]
+
+    def _get_id(self) -> str:
+        id_ = f"id{self._next_id}"
+        self._next_id += 1
+        return id_
+
+
+def _drop_details(
+    element: ElementTree.Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    threshold: float,
+    ancestors: list[ElementTree.Element],
+    dropped: list[ElementTree.Element],
+):
+    """
+    Remove descendants of the container smaller than the threshold, given
+    the transform from its coordinate system to output pixels. Removed
+    elements are appended to `dropped`.
+    """
+    ancestors_ = [*ancestors, element]
+    children: list[ElementTree.Element] = []
+
+    for child in element:
+        if child.tag in NON_RENDERING_ELEMENTS:
+            children.append(child)
+            continue
+
+        bbox = get_bbox(child, viewport, ancestors_)
+
+        if bbox is not None:
+            bbox_ = bbox.transform(ctm)
+
+            if max(bbox_.width, bbox_.height) < threshold:
+                dropped.append(child)
+                continue
+
+        if child.tag in CONTAINER_ELEMENTS:
+            if (
+                container := _get_container_transform(child, viewport)
+            ) is not None:
+                local, _, viewport_ = container
+                _drop_details(
+                    child,
+                    ctm @ local,
+                    viewport_,
+                    threshold,
+                    ancestors_,
+                    dropped,
+                )
+
+        children.append(child)
+
+    element[:] = children
+
+
+def _keep_definitions(
+    xml: ElementTree.Element, dropped: list[ElementTree.Element]
+):
+    """
+    Move definitions within removed elements which are still referenced by
+    the document, e.g. gradients shared with other drawings, to the
+    definitions of the document.
+    """
+
+    definitions: dict[str, ElementTree.Element] = {
+        id_: definition
+        for element in dropped
+        for defs in element.iter("defs")
+        for definition in defs
+        if (id_ := definition.get("id")) is not None
+    }
+
+    if not definitions:
+        return
+
+    kept: list[ElementTree.Element] = []
+    pending = _get_references(xml)
+
+    # definitions may themselves reference others, e.g. inherited gradients
+    while pending:
+        if (definition := definitions.pop(pending.pop(), None)) is not None:
+            kept.append(definition)
+            pending |= _get_references(definition)
+
+    if not kept:
+        return
+
+    if (defs := xml.find("defs")) is None:
+        defs = ElementTree.Element("defs")
+        xml.insert(0, defs)
+
+    defs.extend(kept)
+
+
+def _get_references(element: ElementTree.Element) -> set[str]:
+    """
+    Get ids referenced by attributes of the element and its descendants.
+    """
+    return {
+        m.group(1)
+        for e in element.iter()
+        for value in e.attrib.values()
+        if "#" in value
+        for m in _REFERENCE_PATTERN.finditer(value)
+    }
+
+
+def _simplify(
+    element: ElementTree.Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    tolerance: float,
+    inherited: dict[str, str],
+):
+    """
+    Simplify polylines and polygons among the container's descendants,
+    given the transform from its coordinate system to output pixels.
+    """
+    inherited_ = _get_inherited(element, inherited)
+
+    for child in element:
+        if child.tag in CONTAINER_ELEMENTS:
+            if (
+                container := _get_container_transform(child, viewport)
+            ) is not None:
+                local, _, viewport_ = container
+                _simplify(child, ctm @ local, viewport_, tolerance, inherited_)
+
+        elif child.tag in ("polyline", "polygon"):
+            # markers are drawn at each point
+            if any(
+                child.get(p, inherited_.get(p, "none")) != "none"
+                for p in MARKER_PROPERTIES
+            ):
+                continue
+
+            scale = (ctm @ parse_transform(child.get("transform"))).max_scale
+
+            if scale > 0:
+                points = _get_point_array(child)
+                simplified = simplify_points(points, tolerance / scale)
+
+                if len(simplified) < len(points):
+                    child.set("points", " ".join(_format_points(simplified)))
+
+
+def _coalesce_paths(element: ElementTree.Element, inherited: dict[str, str]):
+    """
+    Merge runs of consecutive mergeable children into paths, recursively.
+    """
+
+    # merging changes the union of clip paths and masks
+    if element.tag in ("clipPath", "mask"):
+        return
+
+    inherited_ = _get_inherited(element, inherited)
+    children: list[ElementTree.Element] = []
+
+    # run of mergeable elements with the same attributes
+    run: list[tuple[ElementTree.Element, list[PathCommand]]] = []
+    run_key: tuple[tuple[str, str], ...] | None = None
+
+    def add_run():
+        if len(run) > 1:
+            attribs = dict(run_key or ())
+            attribs["d"] = encode_path(
+                [c for _, commands in run for c in commands]
+            )
+            children.append(ElementTree.Element("path", attribs))
+        else:
+            children.extend(e for e, _ in run)
+
+    for child in element:
+        commands = _get_merged_commands(child, inherited_)
+        key = (
+            tuple(
+                (k, v)
+                for k, v in sorted(child.attrib.items())
+                if k not in GEOMETRY_ATTRIBUTES
+            )
+            if commands is not None
+            else None
+        )
+
+        if key is None or key != run_key:
+            add_run()
+            run, run_key = [], key
+
+        if commands is None:
+            _coalesce_paths(child, inherited_)
+            children.append(child)
+        else:
+            run.append((child, commands))
+
+    add_run()
+    element[:] = children
+
+
+def _get_merged_commands(
+    element: ElementTree.Element, inherited: dict[str, str]
+) -> list[PathCommand] | None:
+    """
+    Get absolute path commands of an element, or `None`{l=python} if it
+    can't be merged with its siblings without affecting rendering.
+    """
+    # style sheets may apply properties which aren't resolved here
+    if element.tag not in MERGED_ELEMENTS or any(
+        a in element.attrib for a in ("id", "class", "style")
+    ):
+        return None
+
+    def get_property(name: str, default: str) -> str:
+        return element.get(name, inherited.get(name, default))
+
+    if any(get_property(p, "none") != "none" for p in MARKER_PROPERTIES):
+        return None
+
+    if any(a in element.attrib for a in EFFECT_ATTRIBUTES):
+        return None
+
+    # overlapping elements would be composited once rather than each
+    for opacity in (
+        element.get("opacity", "1"),
+        get_property("stroke-opacity", "1"),
+    ):
+        if _parse_length(opacity, None) != 1:
+            return None
+
+    # paint servers may be relative to the bounding box, which would change
+    if _URL_PATTERN.match(get_property("stroke", "none")):
+        return None
+
+    # subpaths may have their fill affected by each other
+    if element.tag != "line" and get_property("fill", "black") != "none":
+        return None
+
+    match element.tag:
+        case "line":
+            coords = [
+                _parse_length(element.get(name, 0.0), None)
+                for name in ("x1", "y1", "x2", "y2")
+            ]
+
+            if any(c is None for c in coords):
+                return None
+
+            x1, y1, x2, y2 = cast(list[float], coords)
+            return [("M", x1, y1), ("L", x2, y2)]
+
+        case "polyline":
+            points = _get_point_array(element)
+
+            if len(points) < 2:
+                return None
+
+            return [("M", *points[0].tolist())] + [
+                ("L", *p) for p in points[1:].tolist()
+            ]
+
+        case _:
+            try:
+                return transform_path(element.get("d", ""), Affine())
+            except ValueError:
+                return None
+
+
+def _hoist_properties(element: ElementTree.Element):
+    """
+    Move inherited properties shared by all rendered children of the
+    container onto it, after doing so for descendant containers.
+    """
+    for child in element:
+        if child.tag in CONTAINER_ELEMENTS:
+            _hoist_properties(child)
+
+    # properties set by style would override hoisted ones
+    if "style" in element.attrib:
+        return
+
+    rendered: list[ElementTree.Element] = []
+
+    for child in element:
+        if child.tag not in NON_RENDERING_ELEMENTS:
+            rendered.append(child)
+        elif any(e.tag in INHERITING_DEFINITIONS for e in child.iter()):
+            # definition would inherit hoisted properties
+            return
+
+    if not rendered:
+        return
+
+    for name in INHERITED_PROPERTIES:
+        values = {child.get(name) for child in rendered}
+
+        if len(values) == 1 and (value := values.pop()) is not None:
+            element.set(name, value)
+
+            for child in rendered:
+                del child.attrib[name]
+
+
+def _extract_classes(xml: ElementTree.Element):
+    """
+    Replace sets of inherited properties shared by multiple elements with
+    classes, where doing so shortens the document.
+    """
+
+    # elements by their set of properties
+    elements: dict[tuple[tuple[str, str], ...], list[ElementTree.Element]] = {}
+
+    for element in xml.iter():
+        key = tuple(
+            (k, v)
+            for k, v in sorted(element.attrib.items())
+            if k in INHERITED_PROPERTIES and not _CSS_SPECIAL_PATTERN.search(v)
+        )
+
+        if key:
+            elements.setdefault(key, []).append(element)
+
+    # avoid names of classes already in use, e.g. those of drawings
+    classes: set[str] = {
+        c for e in xml.iter() for c in e.get("class", "").split()
+    }
+    rules: list[str] = []
+    next_class = 1
+
+    for key, elements_ in elements.items():
+        while (name := f"c{next_class}") in classes:
+            next_class += 1
+
+        rule = f".{name}{{{';'.join(f'{k}:{v}' for k, v in key)}}}"
+        attribs_len = sum(len(f' {k}="{v}"') for k, v in key)
+        class_len = len(f' class="{name}"')
+
+        if len(elements_) * (attribs_len - class_len) <= len(rule):
+            continue
+
+        for element in elements_:
+            for k, _ in key:
+                del element.attrib[k]
+
+            element.set("class", f"{element.get('class', '')} {name}".strip())
+
+        rules.append(rule)
+        classes.add(name)
+
+    if rules:
+        style = ElementTree.Element("style", {"type": "text/css"})
+        style.text = "".join(rules)
+        xml.insert(0, style)
+
+
+def _get_key(element: ElementTree.Element) -> tuple[Any, ...]:
+    """
+    Get a hashable key of the element and its descendants, omitting its id.
+    """
+    return (
+        element.tag,
+        tuple(sorted((k, v) for k, v in element.attrib.items() if k != "id")),
+        (element.text or "").strip(),
+        tuple(_get_key(child) for child in element),
+    )
+
+
+def _get_inherited(
+    element: ElementTree.Element, inherited: dict[str, str]
+) -> dict[str, str]:
+    """
+    Get properties inherited by the element's children.
+    """
+    return inherited | {
+        k: v for k, v in element.attrib.items() if k in INHERITED_PROPERTIES
+    }
+
+
+def _inherit(element: ElementTree.Element, inherited: dict[str, str]):
+    """
+    Set inherited properties not overridden by the element itself.
+    """
+    for name, value in inherited.items():
+        element.attrib.setdefault(name, value)
+
+
+def _get_overflow(
+    element: ElementTree.Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+    inherited: dict[str, str],
+    clip: BBox,
+) -> bool:
+    """
+    Check whether the content of a viewport may be painted outside it.
+    """
+
+    # get stroke inherited by the content
+    stroke = _Stroke().update(ElementTree.Element("g", inherited), viewport)
+
+    # extents of the content itself, excluding the container's own viewport
+    content = ElementTree.Element("g")
+    content.extend(element)
+
+    bbox, unknown = _get_container_extents(content, ctm, viewport, stroke)
+
+    return unknown or (bbox is not None and not clip.contains(bbox))
+
+
+def _flatten_shape(
+    element: ElementTree.Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+) -> ElementTree.Element | None:
+    """
+    Get shape with the transform applied to its coordinates, or
+    `None`{l=python} if not supported.
+    """
+    attribs = {k: v for k, v in element.attrib.items() if k != "transform"}
+    aligned = ctm.b == 0 and ctm.c == 0
+
+    match element.tag:
+        case "line":
+            lengths = _get_lengths(
+                element,
+                viewport,
+                x1=("x", 0.0),
+                y1=("y", 0.0),
+                x2=("x", 0.0),
+                y2=("y", 0.0),
+            )
+
+            if any(v is None for v in lengths.values()):
+                return None
+
+            points = _transform_points(
+                np.array(list(lengths.values()), dtype=np.float64).reshape(
+                    2, 2
+                ),
+                ctm,
+            )
+
+            for i, (x, y) in enumerate(points.tolist(), start=1):
+                attribs[f"x{i}"] = _format_number(x)
+                attribs[f"y{i}"] = _format_number(y)
+
+            return ElementTree.Element("line", attribs)
+
+        case "polyline" | "polygon":
+            points = _transform_points(_get_point_array(element), ctm)
+            attribs["points"] = " ".join(_format_points(points))
+
+            return ElementTree.Element(element.tag, attribs)
+
+        case "rect":
+            lengths = _get_lengths(
+                element,
+                viewport,
+                x=("x", 0.0),
+                y=("y", 0.0),
+                width=("x", 0.0),
+                height=("y", 0.0),
+                rx=("x", None),
+                ry=("y", None),
+            )
+            x, y = lengths["x"], lengths["y"]
+            width, height = lengths["width"], lengths["height"]
+
+            if x is None or y is None or width is None or height is None:
+                return None
+
+            rx, ry = lengths["rx"], lengths["ry"]
+
+            # radii default to each other and are clamped to half the size
+            rx_ = min(rx if rx is not None else (ry or 0.0), width / 2)
+            ry_ = min(ry if ry is not None else (rx or 0.0), height / 2)
+
+            for name in ("x", "y", "width", "height", "rx", "ry"):
+                attribs.pop(name, None)
+
+            if aligned:
+                bbox = BBox.from_rect(x, y, width, height).transform(ctm)
+
+                attribs |= {
+                    "x": _format_number(bbox.x_min),
+                    "y": _format_number(bbox.y_min),
+                    "width": _format_number(bbox.width),
+                    "height": _format_number(bbox.height),
+                }
+
+                if rx_ > 0 and ry_ > 0:
+                    attribs["rx"] = _format_number(rx_ * abs(ctm.a))
+                    attribs["ry"] = _format_number(ry_ * abs(ctm.d))
+
+                return ElementTree.Element("rect", attribs)
+
+            attribs["d"] = _get_rect_path(x, y, width, height, rx_, ry_, ctm)
+            return ElementTree.Element("path", attribs)
+
+        case "circle" | "ellipse":
+            is_circle = element.tag == "circle"
+            lengths = _get_lengths(
+                element,
+                viewport,
+                cx=("x", 0.0),
+                cy=("y", 0.0),
+                r=("xy", 0.0),
+                rx=("x", 0.0),
+                ry=("y", 0.0),
+            )
+            cx, cy = lengths["cx"], lengths["cy"]
+            rx, ry = (
+                (lengths["r"], lengths["r"])
+                if is_circle
+                else (lengths["rx"], lengths["ry"])
+            )
+
+            if cx is None or cy is None or rx is None or ry is None:
+                return None
+
+            for name in ("cx", "cy", "r", "rx", "ry"):
+                attribs.pop(name, None)
+
+            if aligned:
+                cx_, cy_ = ctm.apply(cx, cy)
+                rx_, ry_ = rx * abs(ctm.a), ry * abs(ctm.d)
+
+                attribs |= {
+                    "cx": _format_number(cx_),
+                    "cy": _format_number(cy_),
+                }
+
+                if math.isclose(rx_, ry_):
+                    attribs["r"] = _format_number(rx_)
+                    return ElementTree.Element("circle", attribs)
+
+                attribs |= {
+                    "rx": _format_number(rx_),
+                    "ry": _format_number(ry_),
+                }
+                return ElementTree.Element("ellipse", attribs)
+
+            # circles are preserved by rotation and uniform scaling
+            if (
+                is_circle
+                and math.isclose(ctm.a, ctm.d)
+                and math.isclose(ctm.b, -ctm.c)
+            ):
+                cx_, cy_ = ctm.apply(cx, cy)
+                attribs |= {
+                    "cx": _format_number(cx_),
+                    "cy": _format_number(cy_),
+                    "r": _format_number(rx * math.sqrt(ctm.determinant)),
+                }
+                return ElementTree.Element("circle", attribs)
+
+            attribs["d"] = _get_ellipse_path(cx, cy, rx, ry, ctm)
+            return ElementTree.Element("path", attribs)
+
+        case "path":
+            try:
+                commands = transform_path(element.get("d", ""), ctm)
+            except ValueError:
+                return None
+
+            attribs["d"] = encode_path(commands)
+            return ElementTree.Element("path", attribs)
+
+        case "image":
+            lengths = _get_lengths(
+                element,
+                viewport,
+                x=("x", 0.0),
+                y=("y", 0.0),
+                width=("x", None),
+                height=("y", None),
+            )
+            x, y = lengths["x"], lengths["y"]
+            width, height = lengths["width"], lengths["height"]
+
+            # flipped images can't be represented without a transform
+            if (
+                not aligned
+                or ctm.a <= 0
+                or ctm.d <= 0
+                or any(v is None for v in (x, y, width, height))
+            ):
+                return None
+
+            assert x is not None and y is not None
+            assert width is not None and height is not None
+
+            bbox = BBox.from_rect(x, y, width, height).transform(ctm)
+
+            attribs |= {
+                "x": _format_number(bbox.x_min),
+                "y": _format_number(bbox.y_min),
+                "width": _format_number(bbox.width),
+                "height": _format_number(bbox.height),
+            }
+
+            return ElementTree.Element("image", attribs)
+
+    return None
+
+
+def _scale_stroke(
+    element: ElementTree.Element,
+    ctm: Affine,
+    viewport: tuple[float, float] | None,
+):
+    """
+    Scale stroke lengths of a flattened shape by the scale of the
+    transform.
+    """
+    scale = math.sqrt(abs(ctm.determinant))
+
+    if math.isclose(scale, 1.0):
+        return
+
+    reference = _get_diagonal(viewport)
+
+    width = element.get("stroke-width")
+    stroked = element.get("stroke", "none") != "none"
+
+    if width is not None or stroked:
+        width_ = _parse_length(width if width is not None else 1.0, reference)
+
+        if width_ is not None:
+            element.set("stroke-width", _format_number(width_ * scale))
+
+    if (offset := element.get("stroke-dashoffset")) is not None:
+        if (offset_ := _parse_length(offset, reference)) is not None:
+            element.set("stroke-dashoffset", _format_number(offset_ * scale))
+
+    if (dasharray := element.get("stroke-dasharray")) not in (None, "none"):
+        dashes = [
+            _parse_length(v, reference)
+            for v in re.split(r"[\s,]+", str(dasharray).strip())
+        ]
+
+        if all(d is not None for d in dashes):
+            element.set(
+                "stroke-dasharray",
+                ",".join(
+                    _format_number(d * scale) for d in dashes if d is not None
+                ),
+            )
+
+
+def _transform_points(
+    points: NDArray[np.float64], ctm: Affine
+) -> NDArray[np.float64]:
+    """
+    Apply transform to points with shape `(n, 2)`.
+    """
+    matrix = np.array([[ctm.a, ctm.b], [ctm.c, ctm.d]], dtype=np.float64)
+    return points @ matrix + np.array([ctm.e, ctm.f], dtype=np.float64)
+
+
+def _get_ellipse_path(
+    cx: float, cy: float, rx: float, ry: float, ctm: Affine
+) -> str:
+    """
+    Get path of the transformed ellipse as two arcs.
+    """
+    return encode_path(
+        transform_path(
+            [
+                ("M", cx + rx, cy),
+                ("A", rx, ry, 0, 0, 1, cx - rx, cy),
+                ("A", rx, ry, 0, 0, 1, cx + rx, cy),
+                ("Z",),
+            ],
+            ctm,
+        )
+    )
+
+
+def _get_rect_path(
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    rx: float,
+    ry: float,
+    ctm: Affine,
+) -> str:
+    """
+    Get path of the transformed rect, with rounded corners as arcs.
+    """
+    x_max, y_max = x + width, y + height
+    commands: list[PathCommand]
+
+    if rx <= 0 or ry <= 0:
+        commands = [
+            ("M", x, y),
+            ("L", x_max, y),
+            ("L", x_max, y_max),
+            ("L", x, y_max),
+            ("Z",),
+        ]
+    else:
+        # clockwise from the top left
+        commands = [
+            ("M", x + rx, y),
+            ("L", x_max - rx, y),
+            ("A", rx, ry, 0, 0, 1, x_max, y + ry),
+            ("L", x_max, y_max - ry),
+            ("A", rx, ry, 0, 0, 1, x_max - rx, y_max),
+            ("L", x + rx, y_max),
+            ("A", rx, ry, 0, 0, 1, x, y_max - ry),
+            ("L", x, y + ry),
+            ("A", rx, ry, 0, 0, 1, x + rx, y),
+            ("Z",),
+        ]
+
+    return encode_path(transform_path(commands, ctm))
@@ -0,0 +1,293 @@
+"""
+Parsing and compact encoding of path data, as used by `<path>` elements.
+"""
+from __future__ import annotations
+
+import math
+import re
+from typing import Iterable
+
+import numpy as np
+
+from .geometry import Affine, _format_number
+
+__all__ = [
+    "PathCommand",
+    "parse_path",
+    "encode_path",
+    "transform_path",
+]
+
+type PathCommand = tuple[str, *tuple[float, ...]]
+"""
+Path command given by its letter followed by its arguments, e.g.
+`("M", 0, 0)`{l=python} or `("c", 5, 0, 10, 5, 10, 10)`{l=python}.
+Uppercase letters denote absolute coordinates and lowercase letters
+denote coordinates relative to the current point.
+"""
+
+ARG_COUNTS: dict[str, int] = {
+    "M": 2,
+    "L": 2,
+    "H": 1,
+    "V": 1,
+    "C": 6,
+    "S": 4,
+    "Q": 4,
+    "T": 2,
+    "A": 7,
+    "Z": 0,
+}
+"""
+Number of arguments of each command.
+"""
+
+_NUMBER_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_FLAG_PATTERN = re.compile(r"[01]")
+_SEPARATOR_PATTERN = re.compile(r"[\s,]*")
+
+
+def parse_path(d: str) -> list[PathCommand]:
+    """
+    Parse path data into commands, with implicitly repeated commands made
+    explicit.
+
+    :raises ValueError: If the path data is invalid
+    """
+    commands: list[PathCommand] = []
+    pos = _skip_separators(d, 0)
+    letter: str | None = None
+
+    while pos < len(d):
+        if d[pos].upper() in ARG_COUNTS:
+            letter = d[pos]
+            pos = _skip_separators(d, pos + 1)
+        elif letter is None or letter in "Zz":
+            raise ValueError(f"Invalid path data at {pos}: {d}")
+
+        assert letter is not None
+
+        args: list[float] = []
+
+        for i in range(ARG_COUNTS[letter.upper()]):
+            # arc flags may be given without separators
+            pattern = (
+                _FLAG_PATTERN
+                if letter in "Aa" and i in (3, 4)
+                else _NUMBER_PATTERN
+            )
+
+            if (match := pattern.match(d, pos)) is None:
+                raise ValueError(f"Invalid path data at {pos}: {d}")
+
+            args.append(float(match.group()))
+            pos = _skip_separators(d, match.end())
+
+        commands.append((letter, *args))
+
+        # subsequent coordinates of moveto are implicit lineto
+        if letter in "Mm":
+            letter = "L" if letter == "M" else "l"
+
+    return commands
+
+
+def encode_path(commands: str | Iterable[PathCommand]) -> str:
+    """
+    Encode path commands compactly. Each command is written in absolute or
+    relative form, whichever is shorter, lines are written as horizontal
+    or vertical lines where possible, and repeated command letters are
+    omitted. Numbers are always separated, as some consumers (including
+    `svgwrite`'s validator) don't accept numbers delimited only by a sign
+    or decimal point.
+    """
+    parts: list[str] = []
+    prev: str | None = None
+    x, y = 0.0, 0.0
+    start_x, start_y = 0.0, 0.0
+
+    for letter, args in _get_absolute(commands):
+        candidates: list[tuple[str, list[float]]]
+
+        if letter == "Z":
+            parts.append("Z")
+            prev = "Z"
+            x, y = start_x, start_y
+            continue
+
+        end_x, end_y = args[-2], args[-1]
+
+        if letter == "A":
+            candidates = [
+                ("A", list(args)),
+                ("a", [*args[:5], end_x - x, end_y - y]),
+            ]
+        else:
+            candidates = [
+                (letter, list(args)),
+                (
+                    letter.lower(),
+                    [v - (y if i % 2 else x) for i, v in enumerate(args)],
+                ),
+            ]
+
+        if letter == "L":
+            if end_y == y:
+                candidates += [("H", [end_x]), ("h", [end_x - x])]
+            elif end_x == x:
+                candidates += [("V", [end_y]), ("v", [end_y - y])]
+
+        encoded = [_encode_command(c, a, prev) for c, a in candidates]
+        part, prev = min(encoded, key=lambda e: len(e[0]))
+        parts.append(part)
+
+        x, y = end_x, end_y
+
+        if letter == "M":
+            start_x, start_y = x, y
+
+    return "".join(parts)
+
+
+def transform_path(
+    commands: str | Iterable[PathCommand], transform: Affine
+) -> list[PathCommand]:
+    """
+    Apply transform to path commands, returning absolute commands.
+    Horizontal and vertical lines are converted to lines, and arcs have
+    their radii and rotation transformed.
+    """
+    transformed: list[PathCommand] = []
+
+    for letter, args in _get_absolute(commands):
+        if letter == "A":
+            rx, ry, angle, large, sweep, x, y = args
+            rx_, ry_, angle_ = _get_ellipse_axes(rx, ry, angle, transform)
+
+            # orientation is reversed by reflections
+            if transform.determinant < 0:
+                sweep = 1.0 - sweep
+
+            transformed.append(
+                ("A", rx_, ry_, angle_, large, sweep, *transform.apply(x, y))
+            )
+        else:
+            points = [
+                transform.apply(args[i], args[i + 1])
+                for i in range(0, len(args), 2)
+            ]
+            transformed.append((letter, *[v for p in points for v in p]))
+
+    return transformed
+
+
+def _skip_separators(d: str, pos: int) -> int:
+    match = _SEPARATOR_PATTERN.match(d, pos)
+    assert match is not None
+    return match.end()
+
+
+def _get_absolute(
+    commands: str | Iterable[PathCommand],
+) -> list[tuple[str, tuple[float, ...]]]:
+    """
+    Get commands with absolute coordinates, with horizontal and vertical
+    lines converted to lines.
+    """
+    commands_ = parse_path(commands) if isinstance(commands, str) else commands
+    absolute: list[tuple[str, tuple[float, ...]]] = []
+
+    x, y = 0.0, 0.0
+    start_x, start_y = 0.0, 0.0
+
+    for letter, *args in commands_:
+        letter_ = letter.upper()
+        relative = letter != letter_
+
+        if len(args) != ARG_COUNTS.get(letter_, -1):
+            raise ValueError(f"Invalid path command: {(letter, *args)}")
+
+        args_: tuple[float, ...]
+
+        match letter_:
+            case "Z":
+                absolute.append(("Z", ()))
+                x, y = start_x, start_y
+                continue
+            case "H":
+                letter_, args_ = "L", (args[0] + x if relative else args[0], y)
+            case "V":
+                letter_, args_ = "L", (x, args[0] + y if relative else args[0])
+            case "A":
+                args_ = (
+                    *args[:5],
+                    args[5] + x if relative else args[5],
+                    args[6] + y if relative else args[6],
+                )
+            case _:
+                args_ = tuple(
+                    float(v) + ((y if i % 2 else x) if relative else 0.0)
+                    for i, v in enumerate(args)
+                )
+
+        absolute.append((letter_, args_))
+        x, y = args_[-2], args_[-1]
+
+        if letter_ == "M":
+            start_x, start_y = x, y
+
+    return absolute
+
+
+def _encode_command(
+    letter: str, args: list[float], prev: str | None
+) -> tuple[str, str]:
+    """
+    Encode command given the previous command letter, returning the encoded
+    command along with its letter.
+    """
+    # letter may be omitted if repeated, or if lineto following moveto
+    implicit = (
+        (letter == prev and letter not in "Mm")
+        or (prev == "M" and letter == "L")
+        or (prev == "m" and letter == "l")
+    )
+    numbers = " ".join(_encode_number(v) for v in args)
+
+    return (f" {numbers}" if implicit else f"{letter}{numbers}", letter)
+
+
+def _encode_number(value: float) -> str:
+    """
+    Encode number compactly, omitting leading zeros.
+    """
+    number = _format_number(value)
+
+    if number.startswith("0."):
+        return number[1:]
+    elif number.startswith("-0."):
+        return f"-{number[2:]}"
+
+    return number
+
+
+def _get_ellipse_axes(
+    rx: float, ry: float, angle: float, transform: Affine
+) -> tuple[float, float, float]:
+    """
+    Get radii and rotation of an ellipse with the transform applied, given
+    its radii and rotation in degrees.
+    """
+    ctm = transform @ Affine.rotation(angle)
+    matrix = np.array(
+        [[ctm.a * rx, ctm.c * ry], [ctm.b * rx, ctm.d * ry]], dtype=np.float64
+    )
+
+    # axes of the transformed ellipse are the singular vectors
+    u, s, _ = np.linalg.svd(matrix)
+
+    return (
+        float(s[0]),
+        float(s[1]),
+        math.degrees(math.atan2(u[1, 0], u[0, 0])),
+    )
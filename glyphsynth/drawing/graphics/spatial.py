@@ -0,0 +1,204 @@
+"""
+Spatial index over bounding boxes for point and region queries.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .geometry import BBox
+
+__all__ = [
+    "SpatialIndex",
+]
+
+NODE_CAPACITY = 16
+"""
+Default maximum number of entries per node.
+"""
+
+
+@dataclass(frozen=True)
+class _Level:
+    """
+    Entries of one level of the tree.
+    """
+
+    boxes: NDArray[np.float64]
+    """
+    Bounding box of each entry as `(x_min, y_min, x_max, y_max)`, with
+    shape `(n, 4)`.
+    """
+
+    starts: NDArray[np.int64] | None
+    """
+    Start of each entry's children in the next level, or `None`{l=python}
+    for the leaf level.
+    """
+
+    ends: NDArray[np.int64] | None
+    """
+    End of each entry's children in the next level.
+    """
+
+
+class SpatialIndex[T]:
+    """
+    Static R-tree of items with bounding boxes, bulk loaded using the
+    Sort-Tile-Recursive algorithm. Queries visit `O(log n)` nodes plus
+    those containing matches.
+
+    Example:
+
+    ```python
+    index = SpatialIndex(
+        [(BBox(0, 0, 10, 10), "a"), (BBox(5, 5, 20, 20), "b")]
+    )
+
+    assert index.query_point(7, 7) == ["a", "b"]
+    assert index.query_rect(BBox(15, 15, 30, 30)) == ["b"]
+    ```
+    """
+
+    _items: list[T]
+    _levels: list[_Level]
+    """
+    Levels from the root to the leaves.
+    """
+
+    _order: NDArray[np.int64]
+    """
+    Index of the item corresponding to each leaf entry.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[tuple[BBox, T]],
+        node_capacity: int = NODE_CAPACITY,
+    ):
+        assert node_capacity > 1, f"Invalid node capacity: {node_capacity}"
+
+        items_ = list(items)
+        boxes = np.array(
+            [[b.x_min, b.y_min, b.x_max, b.y_max] for b, _ in items_],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+
+        self._items = [item for _, item in items_]
+        self._order = _get_str_order(boxes, node_capacity)
+
+        levels = [_Level(boxes[self._order], None, None)]
+
+        # group entries into parent nodes until they fit in the root
+        while len(levels[-1].boxes) > node_capacity:
+            levels.append(_get_parent_level(levels[-1].boxes, node_capacity))
+
+        self._levels = list(reversed(levels))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def query_point(self, x: float, y: float) -> list[T]:
+        """
+        Get items whose bounding box contains the point, in the order they
+        were provided.
+        """
+        return self.query_rect(BBox(x, y, x, y))
+
+    def query_rect(self, bbox: BBox) -> list[T]:
+        """
+        Get items whose bounding box intersects the provided bounding box,
+        in the order they were provided.
+        """
+        query = np.array([bbox.x_min, bbox.y_min, bbox.x_max, bbox.y_max])
+        indices: list[NDArray[np.int64]] = []
+
+        # ranges of entries to check in the current level
+        ranges: list[tuple[int, int]] = [(0, len(self._levels[0].boxes))]
+
+        for level in self._levels:
+            ranges_next: list[tuple[int, int]] = []
+
+            for start, end in ranges:
+                boxes = level.boxes[start:end]
+                hits = np.flatnonzero(
+                    (boxes[:, 0] <= query[2])
+                    & (query[0] <= boxes[:, 2])
+                    & (boxes[:, 1] <= query[3])
+                    & (query[1] <= boxes[:, 3])
+                )
+
+                if not len(hits):
+                    continue
+
+                hits += start
+
+                if level.starts is None:
+                    indices.append(self._order[hits])
+                else:
+                    assert level.ends is not None
+                    ranges_next.extend(
+                        zip(
+                            level.starts[hits].tolist(),
+                            level.ends[hits].tolist(),
+                        )
+                    )
+
+            ranges = ranges_next
+
+        if not len(indices):
+            return []
+
+        return [self._items[i] for i in np.sort(np.concatenate(indices))]
+
+
+def _get_str_order(
+    boxes: NDArray[np.float64], node_capacity: int
+) -> NDArray[np.int64]:
+    """
+    Get order of entries such that consecutive runs of `node_capacity`
+    entries are spatially close: entries are sorted into vertical slices by
+    x-center, and within each slice by y-center.
+    """
+    count = len(boxes)
+
+    if count <= node_capacity:
+        return np.arange(count)
+
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+    node_count = math.ceil(count / node_capacity)
+    slice_size = math.ceil(math.sqrt(node_count)) * node_capacity
+
+    order_x = np.argsort(centers[:, 0], kind="stable")
+    slices = [order_x[i : i + slice_size] for i in range(0, count, slice_size)]
+
+    return np.concatenate(
+        [s[np.argsort(centers[s, 1], kind="stable")] for s in slices]
+    )
+
+
+def _get_parent_level(boxes: NDArray[np.float64], node_capacity: int) -> _Level:
+    """
+    Group consecutive entries into nodes, ordering nodes for the next
+    level.
+    """
+    count = len(boxes)
+
+    starts = np.arange(0, count, node_capacity)
+    ends = np.minimum(starts + node_capacity, count)
+
+    node_boxes = np.concatenate(
+        [
+            np.minimum.reduceat(boxes[:, :2], starts),
+            np.maximum.reduceat(boxes[:, 2:], starts),
+        ],
+        axis=1,
+    )
+
+    order = _get_str_order(node_boxes, node_capacity)
+
+    return _Level(node_boxes[order], starts[order], ends[order])
@@ -0,0 +1,354 @@
+"""
+Local HTTP service to render drawings on request, wrapped by CLI and can be
+used programmatically.
+
+Drawings are requested by the FQCN of their class and output format, with
+params given as query parameters:
+
+```
+/glyphsynth.lib.alphabets.latin.runic.A.svg?color=red&stroke_pct=2.5
+/glyphsynth.lib.alphabets.latin.runic.A.png?scale=2
+```
+
+Query parameters which are repeated are passed as a list, e.g.
+`aspect_ratio=1&aspect_ratio=1`.
+
+The service is only bound to loopback addresses, and only imports drawings
+from allowed module prefixes.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import ipaddress
+import logging
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Hashable, Iterable
+from urllib.parse import parse_qs, urlsplit
+
+from pydantic import ValidationError
+
+from .drawing import BaseDrawing, BaseParams
+
+__all__ = [
+    "RenderService",
+    "serve_drawings",
+]
+
+MEDIA_TYPES: dict[str, str] = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+}
+
+RESERVED_QUERY_PARAMS = ("scale", "fmt")
+"""
+Query parameters which control rendering rather than being passed as params.
+"""
+
+DEFAULT_ALLOW = ("glyphsynth.lib",)
+"""
+Module prefixes from which drawings may be imported by default.
+"""
+
+MAX_RASTER_SIZE = 8192
+"""
+Maximum width or height of rasterized drawings in pixels.
+"""
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """
+    Rendered drawing content.
+    """
+
+    content: bytes
+    media_type: str
+    etag: str
+
+
+class RenderError(Exception):
+    """
+    Error rendering a drawing, with the corresponding HTTP status.
+    """
+
+    status: HTTPStatus
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    """
+    Renders drawings from their FQCN and query parameters, caching rendered
+    content in memory with least-recently-used eviction.
+    """
+
+    _cache: OrderedDict[tuple, RenderResult]
+    _cache_size: int
+    _cache_limit: int
+    _cache_lock: threading.Lock
+    _raster_semaphore: threading.BoundedSemaphore
+    _allow: list[str]
+
+    def __init__(
+        self,
+        cache_limit: int = 64 * 1024 * 1024,
+        raster_jobs: int = 4,
+        allow: Iterable[str] = DEFAULT_ALLOW,
+    ):
+        """
+        :param cache_limit: Maximum total size of cached content in bytes
+        :param raster_jobs: Maximum number of concurrent rasterizations
+        :param allow: Module prefixes from which drawings may be imported
+        """
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        self._cache_limit = cache_limit
+        self._cache_lock = threading.Lock()
+        self._raster_semaphore = threading.BoundedSemaphore(raster_jobs)
+        self._allow = list(allow)
+
+    def render(self, path: str, query: dict[str, list[str]]) -> RenderResult:
+        """
+        Render the drawing for the given request path and parsed query.
+
+        :raises RenderError: If the request is invalid or can't be rendered
+        """
+        fqcn, out_format = self._parse_path(path, query)
+        scale = self._parse_scale(query)
+
+        drawing_cls = self._import_drawing_cls(fqcn)
+        params = self._parse_params(drawing_cls, query)
+
+        # key by validated params, so equivalent queries share content
+        key = (fqcn, out_format, scale, _freeze(params.model_dump()))
+
+        if (result := self._get_cached(key)) is not None:
+            return result
+
+        drawing = drawing_cls(params=params)
+        content: bytes
+
+        if out_format == "svg":
+            size = (
+                (f"{drawing.width * scale}", f"{drawing.height * scale}")
+                if drawing.has_size and scale != 1
+                else None
+            )
+            content = drawing.render_svg(size=size).encode()
+        else:
+            if drawing.has_size and (
+                max(drawing.width, drawing.height) * scale > MAX_RASTER_SIZE
+            ):
+                raise RenderError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"Raster size exceeds {MAX_RASTER_SIZE}px: scale={scale}",
+                )
+
+            with self._raster_semaphore:
+                try:
+                    content = drawing.render_png(scale=scale)
+                except SystemExit as e:
+                    # rasterization exits if rsvg-convert isn't available
+                    raise RenderError(
+                        HTTPStatus.SERVICE_UNAVAILABLE, str(e.code)
+                    )
+
+        result = RenderResult(
+            content,
+            MEDIA_TYPES[out_format],
+            f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+        )
+
+        self._set_cached(key, result)
+        return result
+
+    def _parse_path(
+        self, path: str, query: dict[str, list[str]]
+    ) -> tuple[str, str]:
+        name = path.strip("/")
+
+        if "." not in name:
+            raise RenderError(HTTPStatus.NOT_FOUND, f"Invalid path: {path}")
+
+        fqcn, suffix = name.rsplit(".", 1)
+        out_format = query["fmt"][-1] if "fmt" in query else suffix
+
+        if out_format not in MEDIA_TYPES:
+            raise RenderError(
+                HTTPStatus.BAD_REQUEST, f"Invalid format: {out_format}"
+            )
+
+        return (fqcn, out_format)
+
+    def _parse_scale(self, query: dict[str, list[str]]) -> float:
+        try:
+            scale = float(query["scale"][-1]) if "scale" in query else 1.0
+        except ValueError:
+            scale = 0.0
+
+        if not (scale > 0 and math.isfinite(scale)):
+            raise RenderError(
+                HTTPStatus.BAD_REQUEST, f"Invalid scale: {query['scale']}"
+            )
+
+        return scale
+
+    def _parse_params(
+        self, drawing_cls: type[BaseDrawing], query: dict[str, list[str]]
+    ) -> BaseParams:
+        params_cls = drawing_cls.get_params_cls()
+
+        values: dict[str, Any] = {
+            k: v[0] if len(v) == 1 else v
+            for k, v in query.items()
+            if k not in RESERVED_QUERY_PARAMS
+        }
+
+        try:
+            return params_cls.model_validate(values)
+        except ValidationError as e:
+            raise RenderError(HTTPStatus.BAD_REQUEST, str(e))
+
+    def _import_drawing_cls(self, fqcn: str) -> type[BaseDrawing]:
+        if not any(fqcn.startswith(f"{prefix}.") for prefix in self._allow):
+            raise RenderError(HTTPStatus.FORBIDDEN, f"Not allowed: {fqcn}")
+
+        obj: Any = None
+
+        if "." in fqcn:
+            module_path, obj_name = fqcn.rsplit(".", 1)
+
+            try:
+                obj = getattr(importlib.import_module(module_path), obj_name)
+            except (ImportError, AttributeError):
+                pass
+
+        if not (isinstance(obj, type) and issubclass(obj, BaseDrawing)):
+            raise RenderError(
+                HTTPStatus.NOT_FOUND, f"Drawing class not found: {fqcn}"
+            )
+
+        return obj
+
+    def _get_cached(self, key: tuple) -> RenderResult | None:
+        with self._cache_lock:
+            if (result := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _set_cached(self, key: tuple, result: RenderResult):
+        size = len(result.content)
+
+        if size > self._cache_limit:
+            return
+
+        with self._cache_lock:
+            if key in self._cache:
+                return
+
+            self._cache[key] = result
+            self._cache_size += size
+
+            # evict least recently used
+            while self._cache_size > self._cache_limit:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_size -= len(evicted.content)
+
+
+def serve_drawings(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    service: RenderService | None = None,
+):
+    """
+    Serve drawings over HTTP until interrupted.
+    """
+
+    server = create_server(host, port, service or RenderService())
+
+    logging.info(f"Serving drawings at http://{host}:{server.server_port}")
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def create_server(
+    host: str, port: int, service: RenderService
+) -> ThreadingHTTPServer:
+    """
+    Create HTTP server for the render service; use port 0 to select an
+    available port.
+
+    :raises ValueError: If the host isn't a loopback address
+    """
+
+    if host != "localhost":
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            address = None
+
+        if address is None or not address.is_loopback:
+            raise ValueError(f"Host must be a loopback address: {host}")
+
+    class Handler(_RenderHandler):
+        render_service = service
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Convert value to a hashable equivalent for use in cache keys.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, Hashable):
+        return value
+    return repr(value)
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    render_service: RenderService
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+
+        try:
+            result = self.render_service.render(url.path, parse_qs(url.query))
+        except RenderError as e:
+            self.send_error(e.status, explain=str(e))
+            return
+        except Exception as e:
+            logging.exception(f"Failed to render: {self.path}")
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, explain=str(e))
+            return
+
+        if self.headers.get("If-None-Match") == result.etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", result.etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", result.media_type)
+        self.send_header("Content-Length", str(len(result.content)))
+        self.send_header("ETag", result.etag)
+        self.end_headers()
+        self.wfile.write(result.content)
+
+    def log_message(self, format: str, *args: Any):
+        logging.info(format % args)
@@ -1,9 +1,12 @@
 from pyrollup import rollup
 
-from . import array, matrix, utils
+from . import array, grid, layout, matrix, reference, utils
 from .array import *  # noqa
+from .grid import *  # noqa
+from .layout import *  # noqa
 from .matrix import *  # noqa
+from .reference import *  # noqa
 from .utils import *  # noqa
 from .variants import *  # noqa
 
-__all__ = rollup(array, matrix, variants, utils)
+__all__ = rollup(array, grid, layout, matrix, reference, variants, utils)
@@ -1,13 +1,13 @@
 from abc import ABC
 
-from ..drawing import BaseDrawing
+from .layout import LayoutMode
 
 __all__ = [
     "HArrayDrawing",
     "VArrayDrawing",
 ]
 
-from .matrix import BaseMatrixDrawing
+from .matrix import BaseMatrixDrawing, CellType
 
 
 class BaseArrayDrawing(BaseMatrixDrawing, ABC):
@@ -27,16 +27,21 @@ class BaseArrayDrawing(BaseMatrixDrawing, ABC):
     @classmethod
     def new(
         cls,
-        glyphs: list[BaseDrawing],
+        glyphs: list[CellType],
         drawing_id: str | None = None,
         spacing: float = 0.0,
         padding: float = 0.0,
         center: bool = True,
+        layout: LayoutMode = "uniform",
     ):
         rows = [glyphs] if cls._horizontal else [[g] for g in glyphs]
 
         params = cls.get_params_cls()(
-            rows=rows, spacing=spacing, padding=padding, center=center
+            rows=rows,
+            spacing=spacing,
+            padding=padding,
+            center=center,
+            layout=layout,
         )
         return cls(drawing_id=drawing_id, params=params)
 
@@ -0,0 +1,357 @@
+"""
+Declarative grids of parameter values, used to define the variants produced
+by a variant factory.
+
+Grids are composed from axes, each mapping a params field to a list of
+values, and support random access by index: they can be counted, sliced
+and partitioned without iterating over combinations or constructing any
+drawings.
+"""
+from __future__ import annotations
+
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Generator, Iterable, Sequence, overload
+
+__all__ = [
+    "ParamsGrid",
+    "Axis",
+    "ProductGrid",
+    "ZipGrid",
+]
+
+type ParamsValues = dict[str, Any]
+"""
+Mapping of params field names to values for a single combination.
+"""
+
+STRATIFIED_ATTEMPTS = 10
+"""
+Maximum number of draws per requested combination when sampling with
+stratification, bounding time spent redrawing duplicates.
+"""
+
+
+class ParamsGrid(ABC):
+    """
+    Base class for a sequence of parameter value combinations.
+
+    Example:
+
+    ```python
+    # all combinations of letters and stroke widths
+    grid = ParamsGrid.product(
+        letter1=[A, M, Y],
+        letter2=[A, M, Y],
+        stroke_pct=[2.5, 5.0, 7.5],
+    )
+
+    # omit combinations of a letter with itself
+    grid = grid.where(lambda v: v["letter1"] is not v["letter2"])
+    ```
+    """
+
+    @classmethod
+    def product(cls, *grids: ParamsGrid, **axes: Sequence[Any]) -> ProductGrid:
+        """
+        Create the cartesian product of the provided grids and axes, with the
+        last varying fastest.
+        """
+        return ProductGrid(*grids, *_get_axes(axes))
+
+    @classmethod
+    def zip(cls, *grids: ParamsGrid, **axes: Sequence[Any]) -> ZipGrid:
+        """
+        Combine the provided grids and axes in lockstep; all must have the
+        same length.
+        """
+        return ZipGrid(*grids, *_get_axes(axes))
+
+    @property
+    @abstractmethod
+    def fields(self) -> tuple[str, ...]:
+        """
+        Names of params fields set by this grid.
+        """
+        ...
+
+    @property
+    @abstractmethod
+    def shape(self) -> tuple[int, ...]:
+        """
+        Size of each dimension of this grid; the last dimension varies
+        fastest. Grids which aren't rectangular, e.g. filtered grids, have a
+        single dimension.
+        """
+        ...
+
+    def __len__(self) -> int:
+        return math.prod(self.shape)
+
+    @overload
+    def __getitem__(self, index: int) -> ParamsValues:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ParamsGrid:
+        ...
+
+    def __getitem__(self, index: int | slice) -> ParamsValues | ParamsGrid:
+        if isinstance(index, slice):
+            return _IndexGrid(self, range(len(self))[index])
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError(f"Index out of range: {index}")
+
+        return self._get(index)
+
+    def __iter__(self) -> Generator[ParamsValues, None, None]:
+        for index in range(len(self)):
+            yield self._get(index)
+
+    def where(self, predicate: Callable[[ParamsValues], bool]) -> ParamsGrid:
+        """
+        Get a grid with only the combinations for which the predicate
+        returns `True`{l=python}.
+        """
+        return _IndexGrid(
+            self, [i for i, values in enumerate(self) if predicate(values)]
+        )
+
+    def unique(self) -> ParamsGrid:
+        """
+        Get a grid with only the first occurrence of each identical
+        combination.
+        """
+        keys: set[Any] = set()
+        indices: list[int] = []
+
+        for i, values in enumerate(self):
+            key = _freeze(values)
+
+            if key not in keys:
+                keys.add(key)
+                indices.append(i)
+
+        return _IndexGrid(self, indices)
+
+    def partition(self, index: int, count: int) -> ParamsGrid:
+        """
+        Get the 0-based partition of `count` contiguous, nearly equally-sized
+        partitions of this grid.
+        """
+        if not 0 <= index < count:
+            raise ValueError(f"Invalid partition: {index}/{count}")
+
+        start = len(self) * index // count
+        end = len(self) * (index + 1) // count
+
+        return _IndexGrid(self, range(start, end))
+
+    def sample(self, count: int, seed: int | None = None) -> ParamsGrid:
+        """
+        Get a grid with a uniformly random sample of `count` combinations,
+        or all combinations if there are fewer, in the order of this grid.
+        """
+        rng = random.Random(seed)
+        indices = rng.sample(range(len(self)), min(count, len(self)))
+
+        return _IndexGrid(self, sorted(indices))
+
+    def sample_stratified(
+        self, count: int, seed: int | None = None
+    ) -> ParamsGrid:
+        """
+        Get a grid with a random sample of `count` combinations in the order
+        of this grid, with the values of each dimension represented as evenly
+        as possible.
+
+        Each dimension cycles through random permutations of its values, so
+        no value is repeated before every other value of the dimension has
+        been sampled. Duplicate combinations are redrawn, so fewer than
+        `count` combinations may be returned if sampling most of the grid.
+        """
+        rng = random.Random(seed)
+        count_ = min(count, len(self))
+
+        shape = self.shape
+        streams = [_iter_permutations(size, rng) for size in shape]
+        indices: set[int] = set()
+
+        for _ in range(count_ * STRATIFIED_ATTEMPTS):
+            if len(indices) == count_:
+                break
+
+            # combine index of each dimension, last varying fastest
+            index = 0
+            for size, stream in zip(shape, streams):
+                index = index * size + next(stream)
+
+            indices.add(index)
+
+        return _IndexGrid(self, sorted(indices))
+
+    @abstractmethod
+    def _get(self, index: int) -> ParamsValues:
+        """
+        Get combination at the given index, which has been validated.
+        """
+        ...
+
+
+class Axis(ParamsGrid):
+    """
+    Values for a single params field.
+    """
+
+    field: str
+    values: tuple[Any, ...]
+
+    def __init__(self, field: str, values: Iterable[Any]):
+        self.field = field
+        self.values = tuple(values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.field}, {list(self.values)})"
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return (self.field,)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return (len(self.values),)
+
+    def _get(self, index: int) -> ParamsValues:
+        return {self.field: self.values[index]}
+
+
+class BaseCompositeGrid(ParamsGrid):
+    """
+    Grid composed of other grids, each setting distinct fields.
+    """
+
+    grids: tuple[ParamsGrid, ...]
+
+    def __init__(self, *grids: ParamsGrid):
+        fields = [f for grid in grids for f in grid.fields]
+        assert len(fields) == len(set(fields)), f"Duplicate fields: {fields}"
+
+        self.grids = grids
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.grids))})"
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(f for grid in self.grids for f in grid.fields)
+
+
+class ProductGrid(BaseCompositeGrid):
+    """
+    Cartesian product of grids, with the last grid varying fastest.
+    """
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(n for grid in self.grids for n in grid.shape)
+
+    def _get(self, index: int) -> ParamsValues:
+        values: ParamsValues = {}
+        sub_indices: list[int] = []
+
+        # decompose index into index of each grid
+        for grid in reversed(self.grids):
+            index, sub_index = divmod(index, len(grid))
+            sub_indices.append(sub_index)
+
+        for grid, sub_index in zip(self.grids, reversed(sub_indices)):
+            values.update(grid._get(sub_index))
+
+        return values
+
+
+class ZipGrid(BaseCompositeGrid):
+    """
+    Grids combined in lockstep.
+    """
+
+    def __init__(self, *grids: ParamsGrid):
+        super().__init__(*grids)
+
+        lengths = {len(grid) for grid in grids}
+        assert len(lengths) <= 1, f"Grid lengths inconsistent: {grids}"
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return (len(self.grids[0]) if len(self.grids) else 0,)
+
+    def _get(self, index: int) -> ParamsValues:
+        values: ParamsValues = {}
+
+        for grid in self.grids:
+            values.update(grid._get(index))
+
+        return values
+
+
+class _IndexGrid(ParamsGrid):
+    """
+    Subset of another grid given by indices into it.
+    """
+
+    _grid: ParamsGrid
+    _indices: Sequence[int]
+
+    def __init__(self, grid: ParamsGrid, indices: Sequence[int]):
+        self._grid = grid
+        self._indices = indices
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return self._grid.fields
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return (len(self._indices),)
+
+    def _get(self, index: int) -> ParamsValues:
+        return self._grid._get(self._indices[index])
+
+
+def _get_axes(axes: dict[str, Sequence[Any]]) -> list[Axis]:
+    return [Axis(field, values) for field, values in axes.items()]
+
+
+def _iter_permutations(
+    size: int, rng: random.Random
+) -> Generator[int, None, None]:
+    """
+    Endlessly yield indices of a dimension, shuffled for each pass.
+    """
+    indices = list(range(size))
+
+    while True:
+        rng.shuffle(indices)
+        yield from indices
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Convert value to a hashable equivalent for comparison.
+    """
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
@@ -0,0 +1,221 @@
+"""
+Layout engine to compute positions of cells in a matrix, operating on all
+cells at once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = [
+    "LayoutMode",
+    "Layout",
+    "compute_layout",
+    "compute_sparse_layout",
+]
+
+type LayoutMode = Literal["uniform", "fit", "justified"]
+"""
+Mode in which to size cells:
+
+- `"uniform"`: All cells have the size of the largest cell
+- `"fit"`: Each column has the width of its widest cell and each row has
+  the height of its tallest cell
+- `"justified"`: Each row has the height of its tallest cell, and its
+  cells are placed with their own widths and spacing stretched so all rows
+  have the same width
+"""
+
+
+@dataclass(frozen=True)
+class Layout:
+    """
+    Computed positions of cells and overall size.
+    """
+
+    inserts: NDArray[np.float64]
+    """
+    Insert point of each cell, with shape `(rows, cols, 2)` for a dense
+    layout or `(n, 2)` for a sparse layout.
+    """
+
+    size: tuple[float, float]
+    """
+    Overall size including padding.
+    """
+
+
+def compute_layout(
+    sizes: NDArray[np.float64],
+    spacing: float = 0.0,
+    padding: float = 0.0,
+    center: bool = True,
+    mode: LayoutMode = "uniform",
+) -> Layout:
+    """
+    Compute layout of a dense matrix of cells given their sizes.
+
+    :param sizes: Size of each cell, with shape `(rows, cols, 2)`
+    :param spacing: Minimum spacing between cells
+    :param padding: Padding around edges
+    :param center: Whether to center each cell within the space allotted to it
+    :param mode: Mode in which to size cells
+    """
+
+    assert sizes.ndim == 3 and sizes.shape[2] == 2, f"Invalid shape: {sizes}"
+
+    row_count, col_count, _ = sizes.shape
+    coords = np.indices((row_count, col_count)).reshape(2, -1).T
+
+    layout = compute_sparse_layout(
+        coords,
+        sizes.reshape(-1, 2),
+        (row_count, col_count),
+        spacing=spacing,
+        padding=padding,
+        center=center,
+        mode=mode,
+    )
+
+    return Layout(layout.inserts.reshape(sizes.shape), layout.size)
+
+
+def compute_sparse_layout(
+    coords: NDArray[np.int64],
+    sizes: NDArray[np.float64],
+    shape: tuple[int, int],
+    spacing: float = 0.0,
+    padding: float = 0.0,
+    center: bool = True,
+    mode: LayoutMode = "uniform",
+) -> Layout:
+    """
+    Compute layout of a matrix of cells given the coordinates and sizes of
+    occupied cells; unoccupied cells have no size. Insert points are
+    returned for occupied cells only, with shape `(n, 2)`.
+
+    :param coords: Row and column of each occupied cell, with shape `(n, 2)`
+    :param sizes: Size of each occupied cell, with shape `(n, 2)`
+    :param shape: Number of rows and columns
+    """
+
+    assert coords.shape == sizes.shape, f"Inconsistent cells: {coords.shape}"
+
+    row_count, col_count = shape
+
+    if row_count == 0 or col_count == 0:
+        return Layout(np.zeros(sizes.shape), (0.0, 0.0))
+
+    row_idxs, col_idxs = coords[:, 0], coords[:, 1]
+    widths, heights = sizes[:, 0], sizes[:, 1]
+
+    cell_widths: NDArray[np.float64] | float
+    cell_heights: NDArray[np.float64] | float
+
+    # get space allotted to each cell and offset of each cell
+    if mode == "uniform":
+        max_width = widths.max(initial=0.0)
+        max_height = heights.max(initial=0.0)
+
+        cell_widths, cell_heights = max_width, max_height
+
+        offsets_x = col_idxs * (max_width + spacing)
+        offsets_y = row_idxs * (max_height + spacing)
+
+        width = max_width * col_count + spacing * (col_count - 1)
+        height = max_height * row_count + spacing * (row_count - 1)
+
+    elif mode in ("fit", "justified"):
+        row_heights = _reduce_at(np.maximum, row_idxs, heights, row_count)
+        cell_heights = row_heights[row_idxs]
+
+        offsets_y = _get_offsets(row_heights + spacing)[row_idxs]
+        height = row_heights.sum() + spacing * (row_count - 1)
+
+        if mode == "fit":
+            col_widths = _reduce_at(np.maximum, col_idxs, widths, col_count)
+            cell_widths = col_widths[col_idxs]
+
+            offsets_x = _get_offsets(col_widths + spacing)[col_idxs]
+            width = col_widths.sum() + spacing * (col_count - 1)
+        else:
+            cell_widths = widths
+
+            # stretch spacing in each row to the width of the widest row
+            row_widths = _reduce_at(np.add, row_idxs, widths, row_count)
+            width = row_widths.max() + spacing * (col_count - 1)
+            gaps = (
+                (width - row_widths) / (col_count - 1)
+                if col_count > 1
+                else np.zeros(row_count)
+            )
+
+            offsets_x = (
+                _get_preceding(row_idxs, col_idxs, widths)
+                + col_idxs * gaps[row_idxs]
+            )
+
+    else:
+        raise ValueError(f"Invalid layout mode: {mode}")
+
+    inserts = np.stack([offsets_x, offsets_y], axis=-1).astype(np.float64)
+
+    # adjust insert points if centered
+    if center:
+        inserts[:, 0] += (cell_widths - widths) / 2
+        inserts[:, 1] += (cell_heights - heights) / 2
+
+    # add padding
+    inserts += padding
+
+    return Layout(
+        inserts, (float(width + padding * 2), float(height + padding * 2))
+    )
+
+
+def _reduce_at(
+    ufunc: np.ufunc,
+    idxs: NDArray[np.int64],
+    values: NDArray[np.float64],
+    count: int,
+) -> NDArray[np.float64]:
+    """
+    Reduce values by index, with 0 for indices without any values.
+    """
+    result = np.zeros(count)
+    ufunc.at(result, idxs, values)
+    return result
+
+
+def _get_preceding(
+    row_idxs: NDArray[np.int64],
+    col_idxs: NDArray[np.int64],
+    widths: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Get total width of cells preceding each cell in its row.
+    """
+    order = np.lexsort((col_idxs, row_idxs))
+    rows_sorted, widths_sorted = row_idxs[order], widths[order]
+
+    # cumulative width before each cell, less that before its row's first
+    cumulative = np.cumsum(widths_sorted) - widths_sorted
+    row_starts = np.searchsorted(rows_sorted, rows_sorted)
+
+    preceding = np.empty(len(widths))
+    preceding[order] = cumulative - cumulative[row_starts]
+
+    return preceding
+
+
+def _get_offsets(extents: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Get offset of each element given the extent of each, starting at 0.
+    """
+    offsets = np.zeros(extents.shape)
+    np.cumsum(extents[:-1], out=offsets[1:])
+    return offsets
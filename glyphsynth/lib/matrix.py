@@ -1,16 +1,48 @@
-from ..drawing import BaseDrawing, BaseParams
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from ..drawing import BaseDrawing, BaseParams, DrawingFragment
+from .layout import Layout, LayoutMode, compute_sparse_layout
+from .reference import SymbolReference
 
 __all__ = [
+    "CellType",
     "MatrixParams",
     "MatrixDrawing",
 ]
 
 
+type CellType = BaseDrawing | DrawingFragment | SymbolReference
+"""
+Content of a matrix cell: a drawing, the output of one, or a reference to
+a drawing defined as a symbol which is placed as a single `<use>`.
+"""
+
+
 class MatrixParams(BaseParams):
-    rows: list[list[BaseDrawing]]
+    rows: list[list[CellType | None]] = []
+    """
+    Rows of drawings, with `None`{l=python} for empty cells.
+    """
+
+    cells: dict[tuple[int, int], CellType] | None = None
+    """
+    Drawings by `(row, col)`{l=python} as an alternative to `rows` for sparse
+    matrices, requiring `shape`.
+    """
+
+    shape: tuple[int, int] | None = None
+    """
+    Number of rows and columns if `cells` is provided.
+    """
+
     spacing: float = 0.0
     padding: float = 0.0
     center: bool = True
+    layout: LayoutMode = "uniform"
 
 
 class BaseMatrixDrawing(BaseDrawing[MatrixParams]):
@@ -18,119 +50,188 @@ class BaseMatrixDrawing(BaseDrawing[MatrixParams]):
     Base matrix class, used for matrix drawing and array glyphs.
     """
 
-    _rows: list[list[BaseDrawing]]
-    _cols: list[list[BaseDrawing]]
-
-    _max_width: float
-    _max_height: float
+    _shape: tuple[int, int]
+    _coords: list[tuple[int, int]]
+    _drawings: list[CellType]
+    _layout: Layout
 
     def init(self):
-        # validate rows
-        for i, row in enumerate(self.params.rows):
-            assert len(row) == len(
-                self.params.rows[i - 1]
-            ), f"Row lengths inconsistent: {self.params.rows}"
+        self._shape, self._coords, self._drawings = self._get_cells()
+        self._layout = self._get_layout()
 
-        self.canonical_size = self._get_size()
+        self.canonical_size = self._layout.size
 
     def draw(self):
-        if len(self.params.rows) == 0:
-            return
-
-        for row_idx, row in enumerate(self._rows):
-            for col_idx, drawing in enumerate(row):
-                insert_x: float
-                insert_y: float
-
-                # set insert point
-                insert_x = col_idx * (self._max_width + self.params.spacing)
-                insert_y = row_idx * (self._max_height + self.params.spacing)
-
-                # adjust insert point if centered
-                if self.params.center:
-                    insert_x += (self._max_width - drawing.size[0]) / 2
-                    insert_y += (self._max_height - drawing.size[1]) / 2
+        drawings: list[BaseDrawing | DrawingFragment] = []
+        inserts: list[tuple[float, float]] = []
 
-                # add padding
-                insert_x += self.params.padding
-                insert_y += self.params.padding
+        for cell, insert in zip(self._drawings, self._layout.inserts.tolist()):
+            if isinstance(cell, SymbolReference):
+                self.insert_reference(cell.href, cell.size, tuple(insert))
+            else:
+                drawings.append(cell)
+                inserts.append(insert)
 
-                # insert drawing
-                self.insert_drawing(drawing, (insert_x, insert_y))
+        self.insert_drawings(drawings, inserts)
 
-    def _get_size(self) -> tuple[float, float]:
+    def _get_cells(
+        self,
+    ) -> tuple[tuple[int, int], list[tuple[int, int]], list[CellType]]:
         """
-        Get the size of this matrix based on the sizes of the glyphs.
+        Get shape along with coordinates and drawings of occupied cells, in
+        row-major order.
         """
 
-        width: float
-        height: float
+        if self.params.cells is not None:
+            assert self.params.shape is not None, "Shape required for cells"
+            assert not self.params.rows, "Only one of rows/cells allowed"
 
-        if len(self.params.rows) == 0:
-            return (0.0, 0.0)
+            row_count, col_count = self.params.shape
 
-        rows: list[list[BaseDrawing]] = list(
-            [list(row) for row in self.params.rows]
-        )
-        cols: list[list[BaseDrawing]] = list(map(list, zip(*rows)))
+            for row_idx, col_idx in self.params.cells:
+                assert (
+                    0 <= row_idx < row_count and 0 <= col_idx < col_count
+                ), f"Cell out of bounds: {(row_idx, col_idx)}"
 
-        # get column widths
-        col_widths = [max([d.size[0] for d in col]) for col in cols]
+            coords = sorted(self.params.cells.keys())
 
-        # get row heights
-        row_heights = [max([d.size[1] for d in row]) for row in rows]
+            return (
+                self.params.shape,
+                coords,
+                [self.params.cells[c] for c in coords],
+            )
 
-        # set rows/cols
-        self._rows = rows
-        self._cols = cols
+        # validate rows
+        rows = self.params.rows
+        for i, row in enumerate(rows):
+            assert len(row) == len(
+                rows[i - 1]
+            ), f"Row lengths inconsistent: {rows}"
 
-        # get max width/height
-        self._max_width = max(col_widths)
-        self._max_height = max(row_heights)
+        shape = (len(rows), len(rows[0]) if len(rows) else 0)
+        coords: list[tuple[int, int]] = []
+        drawings: list[CellType] = []
 
-        # get total width
-        width = self._max_width * len(cols) + self.params.spacing * (
-            len(cols) - 1
-        )
+        for row_idx, row in enumerate(rows):
+            for col_idx, drawing in enumerate(row):
+                if drawing is not None:
+                    coords.append((row_idx, col_idx))
+                    drawings.append(drawing)
 
-        # get total height
-        height = self._max_height * len(rows) + self.params.spacing * (
-            len(rows) - 1
-        )
+        return (shape, coords, drawings)
 
-        # add padding
-        width += self.params.padding * 2
-        height += self.params.padding * 2
+    def _get_layout(self) -> Layout:
+        """
+        Get the layout of this matrix based on the sizes of the glyphs.
+        """
 
-        return (width, height)
+        count = len(self._drawings)
+
+        return compute_sparse_layout(
+            np.array(self._coords, dtype=np.int64).reshape(count, 2),
+            np.array(
+                [d.size for d in self._drawings], dtype=np.float64
+            ).reshape(count, 2),
+            self._shape,
+            spacing=self.params.spacing,
+            padding=self.params.padding,
+            center=self.params.center,
+            mode=self.params.layout,
+        )
 
 
 class MatrixDrawing(BaseMatrixDrawing):
     """
     Drawing encapsulating a matrix of glyphs with constant spacing between them
-    and padding around the edges.
+    and padding around the edges. Cells may be empty.
 
-    If `center` is `True`, glyphs are center aligned.
+    If `center` is `True`, glyphs are center aligned within their cells.
+
+    The `layout` determines the size of each cell; see {obj}`LayoutMode`.
     """
 
     @classmethod
     def new(
         cls,
-        rows: list[list[BaseDrawing]],
+        rows: list[list[CellType | None]],
         drawing_id: str | None = None,
         spacing: float = 0.0,
         padding: float = 0.0,
         center: bool = True,
+        layout: LayoutMode = "uniform",
     ):
         params = cls.get_params_cls()(
-            rows=rows, spacing=spacing, padding=padding, center=center
+            rows=rows,
+            spacing=spacing,
+            padding=padding,
+            center=center,
+            layout=layout,
+        )
+        return cls(drawing_id=drawing_id, params=params)
+
+    @classmethod
+    def from_cells(
+        cls,
+        cells: Mapping[tuple[int, int], CellType]
+        | Iterable[tuple[tuple[int, int], CellType]],
+        shape: tuple[int, int] | None = None,
+        drawing_id: str | None = None,
+        spacing: float = 0.0,
+        padding: float = 0.0,
+        center: bool = True,
+        layout: LayoutMode = "uniform",
+    ):
+        """
+        Create a sparse matrix from drawings by `(row, col)`{l=python},
+        without allocating empty cells. If `shape` is not provided, it's
+        derived from the largest row and column.
+        """
+        cells_: dict[tuple[int, int], CellType] = {}
+
+        for coord, drawing in (
+            cells.items() if isinstance(cells, Mapping) else cells
+        ):
+            assert coord not in cells_, f"Duplicate cell: {coord}"
+            cells_[coord] = drawing
+
+        shape_ = shape or (
+            max((r + 1 for r, _ in cells_), default=0),
+            max((c + 1 for _, c in cells_), default=0),
+        )
+
+        params = cls.get_params_cls()(
+            cells=cells_,
+            shape=shape_,
+            spacing=spacing,
+            padding=padding,
+            center=center,
+            layout=layout,
         )
         return cls(drawing_id=drawing_id, params=params)
 
     @property
-    def rows(self) -> list[list[BaseDrawing]]:
-        return self._rows
+    def shape(self) -> tuple[int, int]:
+        return self._shape
+
+    @property
+    def rows(self) -> list[list[CellType | None]]:
+        """
+        Rows of drawings, with `None`{l=python} for empty cells. Allocated
+        upon access for sparse matrices.
+        """
+        if self.params.cells is None:
+            return self.params.rows
+
+        row_count, col_count = self._shape
+        rows: list[list[CellType | None]] = [
+            [None] * col_count for _ in range(row_count)
+        ]
+
+        for (row_idx, col_idx), drawing in zip(self._coords, self._drawings):
+            rows[row_idx][col_idx] = drawing
+
+        return rows
 
     @property
-    def cols(self) -> list[list[BaseDrawing]]:
-        return self._cols
+    def cols(self) -> list[list[CellType | None]]:
+        return [list(col) for col in zip(*self.rows)]
@@ -0,0 +1,130 @@
+"""
+Drawings which reference other drawings defined as symbols, rather than
+containing their geometry.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..drawing import BaseDrawing, BaseParams, DrawingFragment
+from ..drawing.graphics.elements.containers import Symbol
+
+__all__ = [
+    "SymbolReference",
+    "ReferenceParams",
+    "ReferenceDrawing",
+    "SymbolLibraryParams",
+    "SymbolLibraryDrawing",
+]
+
+
+@dataclass(frozen=True)
+class SymbolReference:
+    """
+    Reference to a drawing defined as a symbol, to be placed in a matrix or
+    array as a single `<use>` rather than a nested drawing.
+    """
+
+    href: str
+    """
+    IRI of referenced symbol.
+    """
+
+    size: tuple[float, float]
+    """
+    Size of referenced drawing.
+    """
+
+    @classmethod
+    def new(
+        cls, drawing: BaseDrawing | DrawingFragment, library: str = ""
+    ) -> SymbolReference:
+        """
+        :param drawing: Drawing to reference, which must have a drawing id
+        :param library: Path to document defining the symbol, relative to the exported document, or empty if defined in the same document
+        """
+        return cls(f"{library}#{Symbol.get_id(drawing)}", drawing.size)
+
+
+class ReferenceParams(BaseParams):
+    href: str
+    """
+    IRI of referenced symbol.
+    """
+
+    ref_size: tuple[float, float]
+    """
+    Size of referenced drawing.
+    """
+
+
+class ReferenceDrawing(BaseDrawing[ReferenceParams]):
+    """
+    Drawing consisting of a reference to a drawing defined as a symbol,
+    either in the document containing this drawing or in a separate
+    library, e.g. exported from {obj}`SymbolLibraryDrawing`.
+
+    Example:
+
+    ```python
+    # reference symbol in containing document
+    drawing.create_symbol(glyph)
+    drawing.insert_drawing(ReferenceDrawing.new(glyph))
+
+    # reference symbol in library.svg
+    drawing.insert_drawing(ReferenceDrawing.new(glyph, library="library.svg"))
+    ```
+    """
+
+    @classmethod
+    def new(
+        cls,
+        drawing: BaseDrawing,
+        library: str = "",
+        drawing_id: str | None = None,
+    ):
+        """
+        :param drawing: Drawing to reference, which must have a drawing id
+        :param library: Path to document defining the symbol, relative to the exported document, or empty if defined in the same document
+        """
+        ref = SymbolReference.new(drawing, library=library)
+        params = cls.get_params_cls()(href=ref.href, ref_size=ref.size)
+
+        glyph_id_ = drawing_id or (
+            f"{drawing.drawing_id}-ref" if drawing.drawing_id else None
+        )
+
+        return cls(drawing_id=glyph_id_, params=params)
+
+    def init(self):
+        self.canonical_size = self.params.ref_size
+
+    def draw(self):
+        self.insert_reference(self.params.href, self.params.ref_size)
+
+
+class SymbolLibraryParams(BaseParams):
+    drawings: list[BaseDrawing | DrawingFragment]
+
+
+class SymbolLibraryDrawing(BaseDrawing[SymbolLibraryParams]):
+    """
+    Drawing which defines each of the provided drawings as a symbol, for
+    reference by {obj}`ReferenceDrawing` from other documents. It has no
+    visible content itself. Drawings may be provided as fragments, so a
+    large library needn't keep each drawing in memory.
+    """
+
+    @classmethod
+    def new(
+        cls,
+        drawings: list[BaseDrawing | DrawingFragment],
+        drawing_id: str | None = None,
+    ):
+        params = cls.get_params_cls()(drawings=drawings)
+        return cls(drawing_id=drawing_id, params=params)
+
+    def draw(self):
+        for drawing in self.params.drawings:
+            self.create_symbol(drawing)
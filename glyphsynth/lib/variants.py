@@ -4,14 +4,28 @@ For visualization, all variants can be represented as a matrix and a
 set of arrays.
 """
 
+from __future__ import annotations
+
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Generator
+from typing import Any, Generator, Iterable, Literal
 
-from ..drawing import BaseDrawing, BaseParams
+from svgwrite.base import BaseElement
+from svgwrite.utils import AutoID
+
+from ..drawing import BaseDrawing, BaseParams, DrawingFragment
 from ..drawing._utils import extract_type_param
-from ..drawing.export import ExportSpec
+from ..drawing.export import ExportSpec, FileExportSpec, LazyExportSpec
 from .array import HArrayDrawing, VArrayDrawing
-from .matrix import MatrixDrawing
+from .grid import ParamsGrid
+from .matrix import CellType, MatrixDrawing
+from .reference import SymbolLibraryDrawing, SymbolReference
 from .utils import PaddingDrawing
 
 __all__ = [
@@ -19,6 +33,21 @@ __all__ = [
     "BaseVariantFactory",
 ]
 
+VARIANTS_PATH = Path("variants")
+ALL_PATH = VARIANTS_PATH / "all"
+HARRAYS_PATH = VARIANTS_PATH / "harrays"
+VARRAYS_PATH = VARIANTS_PATH / "varrays"
+MATRIX_PATH = VARIANTS_PATH / "matrix"
+PAGES_PATH = VARIANTS_PATH / "pages"
+PAGES_INDEX_FILENAME = "index.json"
+ALIASES_FILENAME = "aliases.json"
+LIBRARY_PATH = VARIANTS_PATH / "library.svg"
+
+LIBRARY_HREF = Path(os.path.relpath(LIBRARY_PATH, MATRIX_PATH)).as_posix()
+"""
+Path of symbol library relative to the matrix and arrays.
+"""
+
 
 class BaseVariantFactory[DrawingT: BaseDrawing]:
     """
@@ -36,36 +65,32 @@ class BaseVariantFactory[DrawingT: BaseDrawing]:
         width: int = 1,
         spacing: float = 0.0,
         padding: float = 0.0,
+        jobs: int = 1,
     ) -> MatrixDrawing:
         """
         Creates a matrix drawing of the provided width by iterating over all
         variants.
         """
-        rows: list[list[DrawingT]] = []
-
         # get list of all glyphs
-        all_glyphs: list[DrawingT] = list(self.get_variants())
-
-        col_count = width
-        row_count = len(all_glyphs) // col_count
+        all_glyphs: list[DrawingT] = list(self.get_variants(jobs=jobs))
 
-        for row_idx in range(row_count):
-            rows.append(
-                all_glyphs[row_idx * col_count : (row_idx + 1) * col_count]
-            )
+        rows: list[list[DrawingT | None]] = _split_rows(all_glyphs, width)
 
         # create matrix drawing
         return MatrixDrawing.new(
             rows, drawing_id=drawing_id, spacing=spacing, padding=padding
         )
 
-    def get_variants(self) -> Generator[DrawingT, None, None]:
+    def get_variants(self, jobs: int = 1) -> Generator[DrawingT, None, None]:
         """
-        Yield all variants.
+        Yield all variants, in the order of their params.
+
+        If multiple jobs are requested, variants are constructed in a process
+        pool and transferred to this process. In this case, the factory and
+        params must be picklable and the drawing classes importable by
+        worker processes.
         """
-        for params in self.get_params_variants():
-            drawing_id = _derive_glyph_id(params)
-            yield self._glyph_cls(drawing_id=drawing_id, params=params)
+        yield from self._create_variants(self.get_params_variants(), jobs)
 
     def get_params_variants(self) -> Generator[BaseParams, None, None]:
         """
@@ -73,6 +98,29 @@ class BaseVariantFactory[DrawingT: BaseDrawing]:
         """
         yield self._glyph_cls.get_params_cls()()
 
+    def _create_variants(
+        self, params_iter: Iterable[BaseParams], jobs: int
+    ) -> Generator[DrawingT, None, None]:
+        if jobs <= 1:
+            for params in params_iter:
+                yield self._create_variant(params)
+            return
+
+        params_list = list(params_iter)
+        chunksize = max(1, len(params_list) // (jobs * 4))
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for variant in executor.map(
+                self._create_variant, params_list, chunksize=chunksize
+            ):
+                _reassign_ids(variant)
+                yield variant
+
+    def _create_variant(self, params: BaseParams) -> DrawingT:
+        return self._glyph_cls(
+            drawing_id=_derive_glyph_id(params), params=params
+        )
+
     def __init_subclass__(cls):
         """
         Populate _glyph_cls with the parameterized class.
@@ -91,12 +139,33 @@ class BaseVariantFactory[DrawingT: BaseDrawing](BaseVariantFactory[DrawingT]):
     Exports a hierarchy of drawing variants:
 
     - all/[drawing_id].[svg/png]
+        - aliases.json: If deduplicating, mapping of duplicate drawing ids
+          to the drawing id which was exported
     - matrix/
         - All glyphs combined in matrix
     - harrays/
         - Horizontal arrays
     - varrays/
         - Vertical arrays
+
+    If a symbol library is enabled:
+
+    - library.svg: Symbol for each variant, referenced by the matrix and
+      arrays
+
+    If paging is enabled, the matrix and arrays are replaced by:
+
+    - pages/
+        - page_[index].[svg/png]: Matrix of glyphs for each page
+        - index.json: Page size, total count, and drawing ids on each page
+    """
+
+    PARAMS_GRID: ParamsGrid | None = None
+    """
+    Grid of parameter values from which to create variants, as an
+    alternative to overriding `get_params_variants()`.
+
+    If a dynamic value is required, override the property `params_grid`.
     """
 
     MATRIX_WIDTH: int = 1
@@ -107,99 +176,596 @@ class BaseVariantFactory[DrawingT: BaseDrawing](BaseVariantFactory[DrawingT]):
     If set, should equal the number of elements in outermost dimension 
     of the drawing iterable output.
 
+    If a params grid with multiple dimensions is provided, the width is
+    instead derived from its last dimension.
+
     If a dynamic value is required, override the property `matrix_width`.
     """
 
+    JOBS: int = 1
+    """
+    Number of processes to use for constructing variants, useful if drawing
+    each variant is expensive. Results are the same as when constructing
+    serially.
+
+    As variants are constructed upon export, all of them are constructed in
+    the pool once any is needed. Not applicable in streaming mode, which
+    constructs each variant in turn.
+    """
+
     SPACING: int = 0
     """
     Spacing to use between variants.
     """
 
-    def __iter__(self) -> Generator[ExportSpec, None, None]:
+    SAMPLE_SIZE: int | None = None
+    """
+    If set, export a random sample of this many combinations from the params
+    grid, for previewing large grids in bounded time. Requires a params
+    grid.
+    """
+
+    SAMPLE_STRATEGY: Literal["uniform", "stratified"] = "uniform"
+    """
+    Strategy for sampling: uniformly random, or stratified so the values of
+    each grid dimension are represented as evenly as possible.
+    """
+
+    SAMPLE_SEED: int | None = 0
+    """
+    Seed for sampling, or `None`{l=python} to sample differently for each
+    export.
+    """
+
+    DEDUPE: bool = False
+    """
+    Whether to export only the first of variants with identical output,
+    according to a hash of their geometry, along with a mapping of the
+    omitted drawing ids to the exported ones. Saves rasterization time and
+    storage when different params produce the same output. Duplicates are
+    still included in the matrix and arrays.
+
+    Hashing requires constructing each variant, even if its export is
+    skipped when sharding or resuming.
+    """
+
+    PAGE_SIZE: tuple[int, int] | None = None
+    """
+    If set, as `(rows, cols)`{l=python}, split variants into matrix pages of
+    this size with an index of pages, rather than exporting a single matrix
+    and arrays. Each page is constructed only when it's exported, bounding
+    the size of each file and memory usage.
+    """
+
+    SYMBOL_LIBRARY: bool = False
+    """
+    Whether to export each variant once as a symbol to a library which the
+    matrix and arrays reference by relative path, rather than containing a
+    copy of its geometry, so each costs only a single `<use>` per cell.
+    Intended for .svg export, as rasterizers generally don't resolve
+    external references.
+
+    Not applicable in paged mode.
+    """
+
+    STREAMING: bool = False
+    """
+    Whether to export in streaming mode, bounding memory usage for large
+    numbers of variants.
+
+    By default, each variant is kept once constructed, to be shared by the
+    matrix and arrays. In streaming mode, each variant is constructed once,
+    exported and released in turn, keeping only its output as a
+    {obj}`DrawingFragment` from which the matrix, arrays and any symbol
+    library are composed. Full drawings are released after their own
+    export, but the fragments of all variants are kept until the export is
+    complete for these composite exports, so memory usage still grows with
+    the number of variants, by the size of their output.
+    """
+
+    def __iter__(
+        self,
+    ) -> Generator[LazyExportSpec | ExportSpec | FileExportSpec, None, None]:
         """
         Yield export specs for each variant given by
         concrete VariantFactory.
+
+        Drawings are constructed only upon export, so a variant whose export
+        is skipped when sharding or resuming is constructed only if another
+        export includes it.
         """
 
-        def wrap_padding(drawing: BaseDrawing):
-            return PaddingDrawing.new(drawing, padding=self.SPACING)
+        if self.PAGE_SIZE is not None:
+            yield from self._iter_paged(self.PAGE_SIZE)
+            return
 
-        # lists of arrays
-        harray_glyphs: list[HArrayDrawing] = []
-        varray_glyphs: list[VArrayDrawing] = []
+        variants = _Variants(
+            self, list(self.get_params_variants()), streaming=self.STREAMING
+        )
+        indices = list(range(len(variants)))
 
-        # relative paths for exporting
-        variants_path = Path("variants")
-        all_path = variants_path / "all"
-        harrays_path = variants_path / "harrays"
-        varrays_path = variants_path / "varrays"
-        matrix_path = variants_path / "matrix"
+        # export top-level glyphs
+        yield from self._iter_variant_specs(
+            variants, indices, dedupe := self._dedupe()
+        )
+        yield from self._iter_aliases(dedupe)
 
-        matrix_glyph = self.create_matrix_glyph(
-            drawing_id="matrix",
-            width=self.matrix_width,
-            spacing=self.SPACING,
-            padding=self.SPACING,
+        yield from self._iter_library(variants)
+        yield from self._iter_aggregates(
+            variants, _split_rows(indices, self.matrix_width)
         )
 
-        # create array glyphs
-        for i, row in enumerate(matrix_glyph.rows):
-            harray_glyphs.append(
-                HArrayDrawing.new(
-                    row,
-                    drawing_id=f"row_{i}",
-                    spacing=self.SPACING,
-                    padding=self.SPACING,
+    @property
+    def params_grid(self) -> ParamsGrid | None:
+        """
+        Accessor for the attribute `PARAMS_GRID`, but can be overridden if
+        a dynamic value is needed.
+        """
+        return self.PARAMS_GRID
+
+    @property
+    def matrix_width(self) -> int:
+        """
+        Accessor for the attribute `MATRIX_WIDTH`, or the last dimension of
+        the params grid if it has multiple dimensions and isn't sampled. Can
+        be overridden if a dynamic value is needed.
+        """
+        if (
+            (grid := self.params_grid) is not None
+            and len(grid.shape) > 1
+            and self.SAMPLE_SIZE is None
+        ):
+            return grid.shape[-1]
+        return self.MATRIX_WIDTH
+
+    def get_params_variants(self) -> Generator[BaseParams, None, None]:
+        """
+        Yield params for each combination in the params grid if provided.
+        Otherwise, override to yield parameter variants to export.
+        """
+        if (grid := self.params_grid) is None:
+            if self.SAMPLE_SIZE is not None:
+                raise ValueError(f"Sampling requires a params grid: {self}")
+
+            yield from super().get_params_variants()
+            return
+
+        if self.SAMPLE_SIZE is not None:
+            if self.SAMPLE_STRATEGY == "uniform":
+                grid = grid.sample(self.SAMPLE_SIZE, seed=self.SAMPLE_SEED)
+            else:
+                grid = grid.sample_stratified(
+                    self.SAMPLE_SIZE, seed=self.SAMPLE_SEED
                 )
+
+        params_cls = self._glyph_cls.get_params_cls()
+
+        for values in grid:
+            yield params_cls(**values)
+
+    def _iter_paged(
+        self, page_size: tuple[int, int]
+    ) -> Generator[LazyExportSpec | ExportSpec | FileExportSpec, None, None]:
+        """
+        Yield export specs for variants and pages, sharing the variants of
+        each page in turn, followed by the index of pages.
+        """
+
+        module = type(self).__module__
+        rows, cols = page_size
+
+        params_iter = self.get_params_variants()
+        pages: list[dict] = []
+        count = 0
+
+        dedupe = self._dedupe()
+
+        while page_params := list(islice(params_iter, rows * cols)):
+            variants = _Variants(self, page_params)
+            indices = list(range(len(variants)))
+            page_id = f"page_{len(pages):04}"
+
+            # export each variant on this page
+            yield from self._iter_variant_specs(variants, indices, dedupe)
+
+            yield LazyExportSpec(
+                partial(self._create_page, variants, page_id, cols),
+                PAGES_PATH,
+                page_id,
+                self._get_aggregate_values(
+                    variants, _split_rows(indices, cols)
+                ),
+                module=module,
             )
 
-        for i, col in enumerate(matrix_glyph.cols):
-            varray_glyphs.append(
-                VArrayDrawing.new(
-                    col,
-                    drawing_id=f"col_{i}",
-                    spacing=self.SPACING,
-                    padding=self.SPACING,
-                )
+            pages.append(
+                {
+                    "page": page_id,
+                    "variants": [_derive_padded_id(p) for p in page_params],
+                }
             )
+            count += len(variants)
 
-        # export top-level glyphs
-        yield from (
-            ExportSpec(wrap_padding(g), all_path, module=type(self).__module__)
-            for row in matrix_glyph.rows
-            for g in row
+        yield from self._iter_aliases(dedupe)
+
+        # export index of pages
+        yield FileExportSpec.from_json(
+            PAGES_PATH / PAGES_INDEX_FILENAME,
+            {"page_size": [rows, cols], "count": count, "pages": pages},
+            module=module,
         )
 
-        # export horizontal arrays
-        for harray_glyph in harray_glyphs:
-            yield ExportSpec(
-                harray_glyph,
-                harrays_path,
+    def _dedupe(self) -> _Deduplicator | None:
+        return _Deduplicator() if self.DEDUPE else None
+
+    def _iter_variant_specs(
+        self,
+        variants: _Variants[DrawingT],
+        indices: list[int],
+        dedupe: _Deduplicator | None,
+    ) -> Generator[LazyExportSpec | ExportSpec, None, None]:
+        """
+        Yield export specs for padded variants, omitting duplicates if
+        deduplicating.
+        """
+        module = type(self).__module__
+
+        for index in indices:
+            if dedupe is None:
+                yield LazyExportSpec(
+                    partial(self._create_padded, variants, index),
+                    ALL_PATH,
+                    _derive_padded_id(variants.params[index]),
+                    {
+                        "variant": variants.get_values(index),
+                        "padding": self.SPACING,
+                    },
+                    module=module,
+                )
+                continue
+
+            # hashing geometry requires constructing the variant
+            padded = self._create_padded(variants, index)
+
+            if dedupe.add(padded):
+                yield ExportSpec(padded, ALL_PATH, module=module)
+
+    def _iter_aliases(
+        self, dedupe: _Deduplicator | None
+    ) -> Generator[FileExportSpec, None, None]:
+        """
+        Yield export spec for mapping of omitted duplicates, if
+        deduplicating.
+        """
+        if dedupe is not None:
+            yield FileExportSpec.from_json(
+                ALL_PATH / ALIASES_FILENAME,
+                dedupe.aliases,
                 module=type(self).__module__,
             )
 
-        # export vertical arrays
-        for varray_glyph in varray_glyphs:
-            yield ExportSpec(
-                varray_glyph,
-                varrays_path,
+    def _iter_library(
+        self, variants: _Variants[DrawingT]
+    ) -> Generator[LazyExportSpec, None, None]:
+        """
+        Yield export spec for symbol library, if enabled.
+        """
+        if self.SYMBOL_LIBRARY:
+            yield LazyExportSpec(
+                partial(self._create_library, variants),
+                LIBRARY_PATH,
+                "library",
+                [variants.get_values(i) for i in range(len(variants))],
                 module=type(self).__module__,
             )
 
+    def _iter_aggregates(
+        self, variants: _Variants[DrawingT], rows: list[list[int | None]]
+    ) -> Generator[LazyExportSpec, None, None]:
+        """
+        Yield export specs for arrays and the matrix of the variants at the
+        given indices.
+        """
+        module = type(self).__module__
+
+        # export horizontal arrays
+        for i, row in enumerate(rows):
+            row_ = [v for v in row if v is not None]
+            yield LazyExportSpec(
+                partial(self._create_harray, variants, f"row_{i}", row_),
+                HARRAYS_PATH,
+                f"row_{i}",
+                self._get_aggregate_values(variants, [row_]),
+                module=module,
+            )
+
+        # export vertical arrays
+        for i, col in enumerate(zip(*rows)):
+            col_ = [v for v in col if v is not None]
+            yield LazyExportSpec(
+                partial(self._create_varray, variants, f"col_{i}", col_),
+                VARRAYS_PATH,
+                f"col_{i}",
+                self._get_aggregate_values(variants, [col_]),
+                module=module,
+            )
+
         # export matrix drawing
-        yield ExportSpec(
-            matrix_glyph,
-            matrix_path,
-            module=type(self).__module__,
+        yield LazyExportSpec(
+            partial(self._create_matrix, variants, rows),
+            MATRIX_PATH,
+            "matrix",
+            self._get_aggregate_values(variants, rows),
+            module=module,
         )
 
-    @property
-    def matrix_width(self) -> int:
+    def _get_aggregate_values(
+        self,
+        variants: _Variants[DrawingT],
+        rows: Iterable[Iterable[int | None]],
+    ) -> dict[str, Any]:
         """
-        Accessor for the attribute `MATRIX_WIDTH`, but can be overridden if
-        a dynamic value is needed.
+        Get values which determine the matrix or an array, for detecting
+        changes when resuming.
         """
-        return self.MATRIX_WIDTH
+        return {
+            "rows": [
+                [variants.get_values(i) if i is not None else None for i in row]
+                for row in rows
+            ],
+            "spacing": self.SPACING,
+            "library": self.SYMBOL_LIBRARY,
+        }
+
+    def _wrap_padding(self, drawing: BaseDrawing) -> PaddingDrawing:
+        return PaddingDrawing.new(drawing, padding=self.SPACING)
+
+    def _create_padded(
+        self, variants: _Variants[DrawingT], index: int
+    ) -> PaddingDrawing:
+        return self._wrap_padding(variants.get(index))
+
+    def _create_library(
+        self, variants: _Variants[DrawingT]
+    ) -> SymbolLibraryDrawing:
+        return SymbolLibraryDrawing.new(
+            [variants.get_cell(i) for i in range(len(variants))],
+            drawing_id="library",
+        )
+
+    def _create_harray(
+        self, variants: _Variants[DrawingT], drawing_id: str, row: list[int]
+    ) -> HArrayDrawing:
+        return HArrayDrawing.new(
+            self._get_cells(variants, row),
+            drawing_id=drawing_id,
+            spacing=self.SPACING,
+            padding=self.SPACING,
+        )
+
+    def _create_varray(
+        self, variants: _Variants[DrawingT], drawing_id: str, col: list[int]
+    ) -> VArrayDrawing:
+        return VArrayDrawing.new(
+            self._get_cells(variants, col),
+            drawing_id=drawing_id,
+            spacing=self.SPACING,
+            padding=self.SPACING,
+        )
+
+    def _create_matrix(
+        self, variants: _Variants[DrawingT], rows: list[list[int | None]]
+    ) -> MatrixDrawing:
+        return MatrixDrawing.new(
+            [self._get_cells(variants, row) for row in rows],
+            drawing_id="matrix",
+            spacing=self.SPACING,
+            padding=self.SPACING,
+        )
+
+    def _create_page(
+        self, variants: _Variants[DrawingT], page_id: str, cols: int
+    ) -> MatrixDrawing:
+        return MatrixDrawing.new(
+            _split_rows([variants.get(i) for i in range(len(variants))], cols),
+            drawing_id=page_id,
+            spacing=self.SPACING,
+            padding=self.SPACING,
+        )
+
+    def _get_cells(
+        self, variants: _Variants[DrawingT], indices: Iterable[int | None]
+    ) -> list[CellType | None]:
+        """
+        Get cells to place in the matrix or an array: the variants at the
+        given indices, or references to them if using a symbol library.
+        Empty cells are passed through.
+        """
+        cells = [
+            variants.get_cell(i) if i is not None else None for i in indices
+        ]
+
+        if not self.SYMBOL_LIBRARY:
+            return cells
+
+        return [
+            SymbolReference.new(c, library=LIBRARY_HREF)
+            if c is not None
+            else None
+            for c in cells
+        ]
+
+
+class _Variants[DrawingT: BaseDrawing]:
+    """
+    Variants constructed on demand by lazily exported specs, each at most
+    once. Unless streaming, each variant is kept once constructed to be
+    shared by the exports which include it; otherwise only its output is
+    kept.
+    """
+
+    params: list[BaseParams]
+
+    _factory: BaseVariantFactory[DrawingT]
+    _streaming: bool
+    _drawings: dict[int, DrawingT]
+    _fragments: dict[int, DrawingFragment]
+
+    def __init__(
+        self,
+        factory: BaseVariantFactory[DrawingT],
+        params: list[BaseParams],
+        streaming: bool = False,
+    ):
+        self.params = params
+
+        self._factory = factory
+        self._streaming = streaming
+        self._drawings = {}
+        self._fragments = {}
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def get(self, index: int) -> DrawingT:
+        """
+        Get the variant at the index, constructing it if not kept.
+        """
+        if (drawing := self._drawings.get(index)) is not None:
+            return drawing
+
+        if self._streaming:
+            drawing = self._factory._create_variant(self.params[index])
+            self._fragments[index] = DrawingFragment.new(drawing)
+            return drawing
+
+        if (jobs := self._factory.JOBS) > 1:
+            self._drawings.update(
+                enumerate(self._factory._create_variants(self.params, jobs))
+            )
+        else:
+            self._drawings[index] = self._factory._create_variant(
+                self.params[index]
+            )
+
+        return self._drawings[index]
+
+    def get_cell(self, index: int) -> DrawingT | DrawingFragment:
+        """
+        Get the variant at the index to place in another drawing: its
+        output if streaming, otherwise the variant itself.
+        """
+        if not self._streaming:
+            return self.get(index)
+
+        if index not in self._fragments:
+            self.get(index)
+
+        return self._fragments[index]
+
+    def get_values(self, index: int) -> dict[str, Any]:
+        """
+        Get values which determine the variant at the index, without
+        constructing it.
+        """
+        glyph_cls = self._factory._glyph_cls
+
+        return {
+            "cls": f"{glyph_cls.__module__}.{glyph_cls.__qualname__}",
+            "params": self.params[index].model_dump(exclude_unset=True),
+        }
+
+
+@dataclass
+class _Deduplicator:
+    """
+    Tracks variants by hash of their geometry to omit duplicates from
+    export.
+    """
+
+    exported_ids: dict[str, str] = field(default_factory=dict)
+    """
+    Mapping of geometry hash to id of the drawing exported with it.
+    """
+
+    aliases: dict[str, str] = field(default_factory=dict)
+    """
+    Mapping of omitted drawing ids to ids of exported drawings.
+    """
+
+    def add(self, drawing: BaseDrawing) -> bool:
+        """
+        Record drawing, returning whether it's the first with its geometry.
+        """
+        key = drawing.get_geometry_hash()
+
+        if (exported_id := self.exported_ids.get(key)) is not None:
+            self.aliases[drawing._id_norm] = exported_id
+            return False
+
+        self.exported_ids[key] = drawing._id_norm
+        return True
+
+
+def _split_rows[T](items: list[T], width: int) -> list[list[T | None]]:
+    """
+    Split items into rows of the given width, with any remainder in a last
+    row filled with empty cells.
+    """
+    rows: list[list[T | None]] = [
+        list(items[row_idx * width : (row_idx + 1) * width])
+        for row_idx in range(math.ceil(len(items) / width))
+    ]
+
+    if rows:
+        rows[-1] += [None] * (width - len(rows[-1]))
+
+    return rows
+
+
+def _reassign_ids(drawing: BaseDrawing):
+    """
+    Replace ids generated by svgwrite with new ones from this process, along
+    with references to them. Since svgwrite's id factory is per-process, ids
+    of drawings constructed in other processes may otherwise collide.
+    """
+
+    pattern = r"id\d+"
+    id_map: dict[str, str] = {}
+
+    # elements may be reachable from both the standalone drawing and the
+    # group used to insert it into a parent
+    elems = list(_traverse_elems([drawing._drawing, drawing._group], set()))
+
+    for elem in elems:
+        id_ = elem.attribs.get("id")
+
+        if isinstance(id_, str) and re.fullmatch(pattern, id_):
+            id_map[id_] = elem.attribs["id"] = AutoID.next_id()
+
+    # convert a value like "url(#id7)" to the remapped id
+    def replace_match(match: re.Match) -> str:
+        return f"#{id_map.get(match.group(1), match.group(1))}"
+
+    for elem in elems:
+        for attr, val in elem.attribs.items():
+            if attr != "id" and isinstance(val, str):
+                elem.attribs[attr] = re.sub(
+                    f"#({pattern})\\b", replace_match, val
+                )
+
+
+def _traverse_elems(
+    elems: Iterable[BaseElement], visited: set[int]
+) -> Generator[BaseElement, None, None]:
+    for elem in elems:
+        if not isinstance(elem, BaseElement) or id(elem) in visited:
+            continue
+
+        visited.add(id(elem))
+
+        yield elem
+        yield from _traverse_elems(elem.elements, visited)
 
 
 def _derive_glyph_id(params: BaseParams) -> str:
@@ -207,3 +773,12 @@ def _derive_glyph_id(params: BaseParams) -> str:
     Derive a drawing_id from params.
     """
     return params.desc
+
+
+def _derive_padded_id(params: BaseParams) -> str:
+    """
+    Derive the normalized drawing id of a padded variant, as given by
+    {obj}`PaddingDrawing.new`.
+    """
+    glyph_id = _derive_glyph_id(params)
+    return f"{glyph_id}-pad" if glyph_id else PaddingDrawing.__name__
@@ -1,7 +1,19 @@
 from __future__ import annotations
 
-from glyphsynth import BaseDrawing, BaseParams, Properties, ShapeProperties
+from pathlib import Path
+
+from glyphsynth import (
+    BaseDrawing,
+    BaseParams,
+    DeferredExportSpec,
+    Properties,
+    ShapeProperties,
+)
 from glyphsynth.drawing.graphics.elements.shapes import Circle
+from glyphsynth.glyph import BaseGlyph, GlyphParams
+from glyphsynth.lib.alphabets.latin.runic import A, M, Y
+from glyphsynth.lib.grid import ParamsGrid
+from glyphsynth.lib.variants import BaseVariantFactory
 
 __all__ = ["BasicDrawing", "ParentDrawing", "ParentDrawing2"]
 
@@ -77,7 +89,12 @@ class ParentDrawing2(ParentDrawing):
         )
 
 
-class GradientDrawing(BaseDrawing):
+class GradientParams(BaseParams):
+    color1: str = "red"
+    color2: str = "blue"
+
+
+class GradientDrawing(BaseDrawing[GradientParams]):
     canonical_size = (UNIT, UNIT)
 
     circle: Circle
@@ -88,7 +105,98 @@ class GradientDrawing(BaseDrawing):
         gradient = self.create_radial_gradient(
             center=CENTER,
             radius=HALF,
-            colors=["red", "blue"],
+            colors=[self.params.color1, self.params.color2],
         )
         self.circle = self.draw_circle(CENTER, HALF)
         self.circle.fill(gradient=gradient)
+
+
+COLORS = ["black", "red", "green", "blue", "orange", "purple"]
+
+
+def deferred_specs() -> list[DeferredExportSpec]:
+    """
+    Deferred specs for basic drawings, used to test parallel export.
+    """
+    return [
+        DeferredExportSpec.new(
+            BasicDrawing,
+            Path("deferred"),
+            drawing_id=f"basic-{color}",
+            params=BasicParams(color1=color),
+        )
+        for color in COLORS
+    ]
+
+
+VARIANT_LETTERS: list[type[BaseGlyph]] = [A, M, Y]
+VARIANT_STROKE_PCTS: list[float] = [2.5, 5.0, 7.5]
+
+
+class LetterParams(GlyphParams):
+    letter: type[BaseGlyph]
+
+
+class LetterGlyph(BaseGlyph[LetterParams]):
+    def draw(self):
+        self.draw_glyph(self.params.letter)
+
+
+class LetterVariantFactory(BaseVariantFactory[LetterGlyph]):
+    MATRIX_WIDTH = len(VARIANT_STROKE_PCTS)
+    SPACING = 10
+
+    def get_params_variants(self):
+        for letter in VARIANT_LETTERS:
+            for stroke_pct in VARIANT_STROKE_PCTS:
+                yield LetterParams(letter=letter, stroke_pct=stroke_pct)
+
+
+class StreamingLetterVariantFactory(LetterVariantFactory):
+    STREAMING = True
+
+
+class GridLetterVariantFactory(BaseVariantFactory[LetterGlyph]):
+    PARAMS_GRID = ParamsGrid.product(
+        letter=VARIANT_LETTERS, stroke_pct=VARIANT_STROKE_PCTS
+    )
+    SPACING = 10
+
+
+class PagedLetterVariantFactory(GridLetterVariantFactory):
+    PAGE_SIZE = (2, 2)
+
+
+class SampledLetterVariantFactory(GridLetterVariantFactory):
+    SAMPLE_SIZE = 4
+    SAMPLE_STRATEGY = "stratified"
+    MATRIX_WIDTH = 2
+
+
+class LabeledLetterParams(LetterParams):
+    label: str
+
+
+class LabeledLetterGlyph(BaseGlyph[LabeledLetterParams]):
+    """
+    Glyph with a label which doesn't affect its output.
+    """
+
+    def draw(self):
+        self.draw_glyph(self.params.letter)
+
+
+class DedupeLetterVariantFactory(BaseVariantFactory[LabeledLetterGlyph]):
+    PARAMS_GRID = ParamsGrid.product(
+        letter=VARIANT_LETTERS, label=["a", "b"], stroke_pct=[5.0, 7.5]
+    )
+    DEDUPE = True
+
+
+class LibraryLetterVariantFactory(GridLetterVariantFactory):
+    SYMBOL_LIBRARY = True
+
+
+class GradientVariantFactory(BaseVariantFactory[GradientDrawing]):
+    PARAMS_GRID = ParamsGrid.product(color1=COLORS[:3], color2=COLORS[3:])
+    JOBS = 2
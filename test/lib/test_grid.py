@@ -0,0 +1,126 @@
+import itertools
+
+from pytest import raises
+
+from glyphsynth.lib.grid import ParamsGrid
+
+from ..glyphs import GridLetterVariantFactory, LetterVariantFactory
+from .test_variants import _render_specs
+
+COLORS = ["red", "green", "blue"]
+STROKE_PCTS = [2.5, 5.0]
+LETTERS = ["A", "B", "C", "D"]
+
+
+def test_product():
+    grid = ParamsGrid.product(
+        color=COLORS, stroke_pct=STROKE_PCTS, letter=LETTERS
+    )
+
+    assert grid.fields == ("color", "stroke_pct", "letter")
+    assert grid.shape == (3, 2, 4)
+    assert len(grid) == 24
+
+    expected = [
+        {"color": c, "stroke_pct": s, "letter": l}
+        for c, s, l in itertools.product(COLORS, STROKE_PCTS, LETTERS)
+    ]
+
+    assert list(grid) == expected
+    assert [grid[i] for i in range(len(grid))] == expected
+    assert grid[-1] == expected[-1]
+    assert list(grid[5:20:3]) == expected[5:20:3]
+
+    with raises(IndexError):
+        grid[len(grid)]
+
+
+def test_zip():
+    grid = ParamsGrid.product(
+        ParamsGrid.zip(color=COLORS, letter=LETTERS[:3]),
+        stroke_pct=STROKE_PCTS,
+    )
+
+    assert grid.shape == (3, 2)
+    assert list(grid) == [
+        {"color": c, "letter": l, "stroke_pct": s}
+        for (c, l), s in itertools.product(
+            zip(COLORS, LETTERS[:3]), STROKE_PCTS
+        )
+    ]
+
+    with raises(AssertionError):
+        ParamsGrid.zip(color=COLORS, letter=LETTERS)
+
+    with raises(AssertionError):
+        ParamsGrid.product(ParamsGrid.product(color=COLORS), color=COLORS)
+
+
+def test_where_unique():
+    grid = ParamsGrid.product(letter1=LETTERS, letter2=LETTERS)
+
+    filtered = grid.where(lambda v: v["letter1"] != v["letter2"])
+    assert filtered.shape == (12,)
+    assert all(v["letter1"] != v["letter2"] for v in filtered)
+
+    dupes = ParamsGrid.product(color=COLORS + COLORS, letter=["A", "A"])
+    unique = dupes.unique()
+
+    assert len(dupes) == 12
+    assert list(unique) == [{"color": c, "letter": "A"} for c in COLORS]
+
+
+def test_partition():
+    grid = ParamsGrid.product(color=COLORS, letter=LETTERS, size=[1, 2, 3])
+    count = 5
+
+    partitions = [list(grid.partition(i, count)) for i in range(count)]
+
+    assert [len(p) for p in partitions] == [7, 7, 7, 7, 8]
+    assert list(itertools.chain(*partitions)) == list(grid)
+
+    with raises(ValueError):
+        grid.partition(count, count)
+
+
+def test_sample():
+    grid = ParamsGrid.product(color=COLORS, letter=LETTERS, size=[1, 2, 3])
+
+    sample = grid.sample(10, seed=1)
+    indices = [list(grid).index(v) for v in sample]
+
+    assert len(sample) == 10
+    assert indices == sorted(set(indices))
+    assert list(sample) == list(grid.sample(10, seed=1))
+
+    assert list(grid.sample(len(grid) + 1)) == list(grid)
+
+
+def test_sample_stratified():
+    grid = ParamsGrid.product(color=COLORS, letter=LETTERS, size=[1, 2, 3])
+
+    sample = grid.sample_stratified(6, seed=1)
+
+    assert len(sample) == 6
+    assert list(sample) == list(grid.sample_stratified(6, seed=1))
+
+    # each value of each axis is sampled at least once
+    assert {v["color"] for v in sample} == set(COLORS)
+    assert {v["size"] for v in sample} == {1, 2, 3}
+    assert len({v["letter"] for v in sample}) == len(LETTERS)
+
+    assert len(grid.sample_stratified(len(grid))) == len(grid)
+
+
+def test_factory():
+    """
+    Verify a factory with a grid exports the same as with hand-written
+    params and matrix width.
+    """
+
+    factory = GridLetterVariantFactory()
+
+    assert factory.matrix_width == LetterVariantFactory.MATRIX_WIDTH
+    assert _render_specs(list(factory)) == _render_specs(
+        list(LetterVariantFactory())
+    )
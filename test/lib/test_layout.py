@@ -0,0 +1,147 @@
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from glyphsynth.lib import MatrixDrawing, compute_layout
+
+from ..conftest import write_drawing
+from ..glyphs import UNIT, BasicDrawing
+
+SIZES = np.array(
+    [
+        [(10.0, 20.0), (30.0, 10.0), (20.0, 20.0)],
+        [(20.0, 40.0), (10.0, 10.0), (10.0, 30.0)],
+    ]
+)
+
+
+def test_uniform():
+    layout = compute_layout(SIZES, spacing=5.0, padding=1.0)
+
+    assert layout.size == (30.0 * 3 + 5.0 * 2 + 2.0, 40.0 * 2 + 5.0 + 2.0)
+    assert layout.inserts[0, 0].tolist() == [1.0 + 10.0, 1.0 + 10.0]
+    assert layout.inserts[1, 2].tolist() == [
+        1.0 + 70.0 + 10.0,
+        1.0 + 45.0 + 5.0,
+    ]
+
+    layout = compute_layout(SIZES, center=False)
+    assert layout.inserts[1, 2].tolist() == [60.0, 40.0]
+
+
+def test_fit():
+    layout = compute_layout(SIZES, spacing=5.0, center=False, mode="fit")
+
+    # column widths 20, 30, 20 and row heights 20, 40
+    assert layout.size == (80.0, 65.0)
+    assert layout.inserts[..., 0].tolist() == [[0.0, 25.0, 60.0]] * 2
+    assert layout.inserts[..., 1].tolist() == [[0.0] * 3, [25.0] * 3]
+
+    layout = compute_layout(SIZES, spacing=5.0, mode="fit")
+    assert layout.inserts[0, 0].tolist() == [5.0, 0.0]
+
+
+def test_justified():
+    layout = compute_layout(SIZES, spacing=5.0, mode="justified")
+
+    # rows have widths 60 and 40, so second row has spacing of 15
+    assert layout.size == (70.0, 65.0)
+    assert layout.inserts[..., 0].tolist() == [
+        [0.0, 15.0, 50.0],
+        [0.0, 35.0, 60.0],
+    ]
+    assert layout.inserts[1, :, 1].tolist() == [25.0, 40.0, 30.0]
+
+
+def test_matrix(output_dir: Path):
+    """
+    Create matrices of drawings with different sizes in each layout mode.
+    """
+
+    rows = [
+        [
+            BasicDrawing(size=(UNIT * (1 + (i + j) % 3) / 2, UNIT / 2))
+            for j in range(3)
+        ]
+        for i in range(3)
+    ]
+
+    for mode in ["uniform", "fit", "justified"]:
+        matrix = MatrixDrawing.new(
+            rows,
+            drawing_id=f"matrix-{mode}",
+            spacing=UNIT / 10,
+            padding=UNIT / 10,
+            layout=mode,
+        )
+
+        sizes = np.array([[d.size for d in row] for row in rows])
+        assert (
+            matrix.size
+            == compute_layout(
+                sizes, spacing=UNIT / 10, padding=UNIT / 10, mode=mode
+            ).size
+        )
+
+        write_drawing(output_dir, matrix)
+
+
+def test_benchmark():
+    """
+    Compare layout of 10^5 cells with an equivalent loop.
+    """
+
+    rng = np.random.default_rng(0)
+    sizes = rng.uniform(10.0, 100.0, (250, 400, 2))
+
+    start = time.perf_counter()
+    layout = compute_layout(sizes, spacing=10.0, padding=10.0)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    inserts = _compute_inserts_loop(sizes, spacing=10.0, padding=10.0)
+    elapsed_loop = time.perf_counter() - start
+
+    logging.info(
+        f"Layout of {sizes.shape[0] * sizes.shape[1]} cells: "
+        f"{elapsed * 1000:.1f}ms (loop: {elapsed_loop * 1000:.1f}ms)"
+    )
+
+    # timings are only logged, as they vary with load
+    assert layout.inserts.tolist() == inserts
+
+
+def _compute_inserts_loop(
+    sizes: NDArray[np.float64], spacing: float, padding: float
+) -> list[list[list[float]]]:
+    """
+    Compute uniform layout as previously done per cell.
+    """
+
+    rows = sizes.tolist()
+    cols = list(zip(*rows))
+
+    max_width = max(max(s[0] for s in col) for col in cols)
+    max_height = max(max(s[1] for s in row) for row in rows)
+
+    inserts: list[list[list[float]]] = []
+
+    for row_idx, row in enumerate(rows):
+        inserts.append([])
+
+        for col_idx, (width, height) in enumerate(row):
+            insert_x = col_idx * (max_width + spacing)
+            insert_y = row_idx * (max_height + spacing)
+
+            insert_x += (max_width - width) / 2
+            insert_y += (max_height - height) / 2
+
+            insert_x += padding
+            insert_y += padding
+
+            inserts[-1].append([insert_x, insert_y])
+
+    return inserts
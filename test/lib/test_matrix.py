@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import numpy as np
+
+from glyphsynth.lib import MatrixDrawing, compute_layout, compute_sparse_layout
+
+from ..conftest import write_drawing
+from ..glyphs import UNIT, BasicDrawing, BasicParams, LetterVariantFactory
+
+SPACING = UNIT / 10
+
+
+def test_empty_cells(output_dir: Path):
+    """
+    Create a matrix with empty cells.
+    """
+
+    drawings = [
+        BasicDrawing(drawing_id=f"basic-{i}", params=BasicParams(color1=color))
+        for i, color in enumerate(["red", "green", "blue"])
+    ]
+
+    matrix = MatrixDrawing.new(
+        [[drawings[0], None, drawings[1]], [None, drawings[2], None]],
+        drawing_id="matrix-empty-cells",
+        spacing=SPACING,
+        padding=SPACING,
+    )
+
+    assert matrix.shape == (2, 3)
+    assert matrix.size == (UNIT * 3 + SPACING * 4, UNIT * 2 + SPACING * 3)
+    assert matrix.cols[1] == [None, drawings[2]]
+
+    svg = matrix.render_svg()
+    assert svg.count("BasicDrawing-wrapper-insert") == 3
+
+    # same as sparse matrix with the same cells
+    sparse = MatrixDrawing.from_cells(
+        {(0, 0): drawings[0], (0, 2): drawings[1], (1, 1): drawings[2]},
+        drawing_id="matrix-empty-cells",
+        spacing=SPACING,
+        padding=SPACING,
+    )
+
+    assert sparse.rows == matrix.rows
+    assert sparse.render_svg() == svg
+
+    write_drawing(output_dir, matrix)
+
+
+def test_sparse():
+    """
+    Create a large, mostly empty matrix from coordinates.
+    """
+
+    shape = (1000, 1000)
+    cells = [((0, 0), BasicDrawing()), ((999, 500), BasicDrawing())]
+
+    matrix = MatrixDrawing.from_cells(cells, shape=shape, spacing=SPACING)
+
+    assert matrix.shape == shape
+    assert matrix.size == (
+        UNIT * 1000 + SPACING * 999,
+        UNIT * 1000 + SPACING * 999,
+    )
+    assert matrix.render_svg().count("BasicDrawing-wrapper-insert") == 2
+
+
+def test_sparse_layout():
+    """
+    Verify sparse layout matches a dense layout with empty cells having no
+    size.
+    """
+
+    rng = np.random.default_rng(0)
+
+    sizes = rng.uniform(10.0, 100.0, (20, 30, 2))
+    occupied = rng.uniform(size=(20, 30)) < 0.2
+    sizes[~occupied] = 0.0
+
+    coords = np.argwhere(occupied)
+
+    for mode in ["uniform", "fit", "justified"]:
+        dense = compute_layout(sizes, spacing=5.0, padding=5.0, mode=mode)
+        sparse = compute_sparse_layout(
+            coords,
+            sizes[occupied],
+            sizes.shape[:2],
+            spacing=5.0,
+            padding=5.0,
+            mode=mode,
+        )
+
+        assert sparse.size == dense.size
+        assert np.allclose(sparse.inserts, dense.inserts[occupied])
+
+
+def test_remainder():
+    """
+    Verify a matrix of variants includes variants which don't fill the last
+    row.
+    """
+
+    variants = list(LetterVariantFactory().get_variants())
+    matrix = LetterVariantFactory().create_matrix_glyph(width=4)
+
+    assert matrix.shape == (3, 4)
+    assert len([g for row in matrix.rows for g in row if g]) == len(variants)
+    assert matrix.rows[2][1:] == [None] * 3
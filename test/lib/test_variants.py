@@ -0,0 +1,381 @@
+import gc
+import json
+import weakref
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from glyphsynth import BaseDrawing
+from glyphsynth.drawing.export import (
+    ExportSpec,
+    FileExportSpec,
+    LazyExportSpec,
+    export_drawings,
+)
+from glyphsynth.lib.variants import BaseVariantFactory
+
+from ..glyphs import (
+    VARIANT_LETTERS,
+    VARIANT_STROKE_PCTS,
+    DedupeLetterVariantFactory,
+    GradientVariantFactory,
+    LetterVariantFactory,
+    PagedLetterVariantFactory,
+    SampledLetterVariantFactory,
+    StreamingLetterVariantFactory,
+)
+
+
+def _get_drawing(spec: ExportSpec | LazyExportSpec) -> BaseDrawing:
+    return (
+        spec.create_drawing()
+        if isinstance(spec, LazyExportSpec)
+        else spec.drawing
+    )
+
+
+def _record_constructions(monkeypatch: MonkeyPatch) -> list[str]:
+    """
+    Record the id of each variant constructed by factories.
+    """
+
+    create_variant = BaseVariantFactory._create_variant
+    created: list[str] = []
+
+    def create_variant_recorded(self, params):
+        created.append(params.desc)
+        return create_variant(self, params)
+
+    monkeypatch.setattr(
+        BaseVariantFactory, "_create_variant", create_variant_recorded
+    )
+
+    return created
+
+
+def _render_specs(
+    specs: list[ExportSpec | LazyExportSpec],
+) -> list[tuple[str, str, str]]:
+    return [
+        (spec.path.as_posix(), drawing._id_norm, drawing.render_svg())
+        for spec in specs
+        if (drawing := _get_drawing(spec))
+    ]
+
+
+def test_streaming():
+    """
+    Verify streaming mode yields the same exports as the default mode.
+    """
+
+    specs = list(LetterVariantFactory())
+    variant_count = len(VARIANT_LETTERS) * len(VARIANT_STROKE_PCTS)
+
+    # variants, rows, columns, matrix
+    assert (
+        len(specs)
+        == variant_count + len(VARIANT_LETTERS) + len(VARIANT_STROKE_PCTS) + 1
+    )
+
+    assert _render_specs(specs) == _render_specs(
+        list(StreamingLetterVariantFactory())
+    )
+
+
+def test_streaming_release():
+    """
+    Verify each variant is released once its spec is exported in streaming
+    mode, but kept for the matrix otherwise.
+    """
+
+    for factory, released in [
+        (StreamingLetterVariantFactory(), True),
+        (LetterVariantFactory(), False),
+    ]:
+        specs = iter(factory)
+
+        ref = weakref.ref(_get_drawing(next(specs)).params.drawing)
+
+        _get_drawing(next(specs))
+        gc.collect()
+
+        assert (ref() is None) == released
+
+
+def test_streaming_constructions(output_dir: Path, monkeypatch: MonkeyPatch):
+    """
+    Verify streaming mode constructs each variant once, with or without a
+    symbol library.
+    """
+
+    created = _record_constructions(monkeypatch)
+
+    for symbol_library in [False, True]:
+        monkeypatch.setattr(
+            StreamingLetterVariantFactory, "SYMBOL_LIBRARY", symbol_library
+        )
+        created.clear()
+
+        export_drawings(
+            "test.glyphs.StreamingLetterVariantFactory",
+            output_dir / str(symbol_library),
+            svg=True,
+        )
+
+        assert (
+            len(created)
+            == len(set(created))
+            == len(VARIANT_LETTERS) * len(VARIANT_STROKE_PCTS)
+        )
+
+
+def test_sharded_constructions(output_dir: Path, monkeypatch: MonkeyPatch):
+    """
+    Verify each shard constructs only the variants included in its exports.
+    """
+
+    shard_count = 8
+
+    params = list(LetterVariantFactory().get_params_variants())
+    rows = [
+        [p.desc for p in params[i : i + LetterVariantFactory.MATRIX_WIDTH]]
+        for i in range(0, len(params), LetterVariantFactory.MATRIX_WIDTH)
+    ]
+
+    def get_variant_ids(file: str) -> list[str]:
+        path = Path(file)
+
+        match path.parent.name:
+            case "all":
+                return [path.stem.removesuffix("-pad")]
+            case "harrays":
+                return rows[int(path.stem.removeprefix("row_"))]
+            case "varrays":
+                return [
+                    row[int(path.stem.removeprefix("col_"))] for row in rows
+                ]
+            case _:
+                return [p.desc for p in params]
+
+    created = _record_constructions(monkeypatch)
+    created_counts: list[int] = []
+
+    for index in range(shard_count):
+        created.clear()
+
+        export_drawings(
+            "test.glyphs.LetterVariantFactory",
+            output_dir,
+            svg=True,
+            shard=(index, shard_count),
+        )
+
+        files: list[str] = json.loads(
+            (output_dir / f"manifest-{index}-{shard_count}.json").read_text()
+        )["files"]
+
+        assert sorted(created) == sorted(
+            {id_ for file in files for id_ in get_variant_ids(file)}
+        )
+        created_counts.append(len(created))
+
+    assert min(created_counts) < len(params)
+
+
+def test_resumed_constructions(output_dir: Path, monkeypatch: MonkeyPatch):
+    """
+    Verify resuming a completed export constructs no variants, and resuming
+    a partial one constructs only those needed by the missing exports.
+    """
+
+    fqcn = "test.glyphs.LetterVariantFactory"
+    params = list(LetterVariantFactory().get_params_variants())
+
+    created = _record_constructions(monkeypatch)
+
+    export_drawings(fqcn, output_dir, svg=True)
+    assert len(created) == len(params)
+
+    created.clear()
+    export_drawings(fqcn, output_dir, svg=True, resume=True)
+    assert created == []
+
+    # remove a variant and the row including it
+    (output_dir / f"variants/all/{params[-1].desc}-pad.svg").unlink()
+    (output_dir / "variants/harrays/row_0.svg").unlink()
+
+    export_drawings(fqcn, output_dir, svg=True, resume=True)
+    assert sorted(created) == sorted(
+        [p.desc for p in params[: LetterVariantFactory.MATRIX_WIDTH]]
+        + [params[-1].desc]
+    )
+
+    # changed spacing is detected without constructing to compare
+    created.clear()
+    monkeypatch.setattr(LetterVariantFactory, "SPACING", 20)
+
+    export_drawings(fqcn, output_dir, svg=True, resume=True)
+    assert len(created) == len(params)
+
+
+def test_parallel():
+    """
+    Verify constructing variants in multiple processes yields the same
+    exports as constructing them serially, including distinct gradient ids.
+    """
+
+    for factory_cls in [LetterVariantFactory, GradientVariantFactory]:
+        factory_parallel = factory_cls()
+        factory_parallel.JOBS = 2
+
+        factory_serial = factory_cls()
+        factory_serial.JOBS = 1
+
+        assert _render_specs(list(factory_parallel)) == _render_specs(
+            list(factory_serial)
+        )
+
+
+def test_paged(output_dir: Path):
+    """
+    Verify paged mode exports each variant, a matrix per page and an index
+    of pages.
+    """
+
+    specs = list(PagedLetterVariantFactory())
+
+    variant_ids = [
+        _get_drawing(s)._id_norm for s in specs if s.path.name == "all"
+    ]
+    pages = [
+        _get_drawing(s)
+        for s in specs
+        if isinstance(s, LazyExportSpec) and s.path.name == "pages"
+    ]
+
+    assert len(variant_ids) == len(VARIANT_LETTERS) * len(VARIANT_STROKE_PCTS)
+    assert [p._id_norm for p in pages] == [
+        "page_0000",
+        "page_0001",
+        "page_0002",
+    ]
+
+    # last page is partial, with a filled row
+    assert [len(p.params.rows) for p in pages] == [2, 2, 1]
+
+    assert isinstance(index_spec := specs[-1], FileExportSpec)
+
+    index = json.loads(index_spec.content)
+
+    assert index["page_size"] == [2, 2]
+    assert index["count"] == len(variant_ids)
+    assert [v for page in index["pages"] for v in page["variants"]] == (
+        variant_ids
+    )
+
+    # index is written alongside pages
+    export_drawings(
+        "test.glyphs.PagedLetterVariantFactory", output_dir, svg=True
+    )
+
+    assert (output_dir / "variants/pages/page_0002.svg").is_file()
+    assert (
+        json.loads((output_dir / "variants/pages/index.json").read_text())
+        == index
+    )
+
+
+def test_sampled():
+    """
+    Verify a sampled factory exports the requested number of variants,
+    deterministically.
+    """
+
+    specs = list(SampledLetterVariantFactory())
+    variants = [_get_drawing(s) for s in specs if s.path.name == "all"]
+
+    assert len(variants) == SampledLetterVariantFactory.SAMPLE_SIZE
+    assert _render_specs(specs) == _render_specs(
+        list(SampledLetterVariantFactory())
+    )
+
+
+def test_dedupe(output_dir: Path):
+    """
+    Verify variants with identical output are exported once, with aliases
+    for the duplicates.
+    """
+
+    export_drawings(
+        "test.glyphs.DedupeLetterVariantFactory", output_dir, svg=True
+    )
+
+    all_path = output_dir / "variants/all"
+    aliases: dict[str, str] = json.loads(
+        (all_path / "aliases.json").read_text()
+    )
+
+    assert len(aliases) == 2 * len(VARIANT_LETTERS)
+    assert len(
+        [
+            s
+            for s in DedupeLetterVariantFactory()
+            if isinstance(s, ExportSpec) and s.path.name == "all"
+        ]
+    ) == 2 * len(VARIANT_LETTERS)
+
+    for alias, drawing_id in aliases.items():
+        assert "label-b" in alias
+        assert drawing_id == alias.replace("label-b", "label-a")
+        assert not (all_path / f"{alias}.svg").exists()
+        assert (all_path / f"{drawing_id}.svg").is_file()
+
+    # duplicates are still included in matrix
+    matrix = next(
+        _get_drawing(s)
+        for s in DedupeLetterVariantFactory()
+        if s.path.name == "matrix"
+    )
+    assert len(matrix.rows) == 2 * len(VARIANT_LETTERS)
+    assert all(len(row) == 2 for row in matrix.rows)
+
+
+def test_symbol_library(output_dir: Path):
+    """
+    Verify matrix and arrays reference variants as symbols in a library,
+    with a single `<use>` per cell.
+    """
+
+    variant_count = len(VARIANT_LETTERS) * len(VARIANT_STROKE_PCTS)
+
+    def get_svgs(fqcn: str) -> dict[str, str]:
+        path = output_dir / fqcn.rsplit(".", 1)[1]
+        export_drawings(fqcn, path, svg=True)
+
+        return {
+            p.relative_to(path / "variants").as_posix(): p.read_text()
+            for p in (path / "variants").glob("**/*.svg")
+        }
+
+    default = get_svgs("test.glyphs.GridLetterVariantFactory")
+    library = get_svgs("test.glyphs.LibraryLetterVariantFactory")
+
+    # variants are unchanged
+    assert {k: v for k, v in library.items() if k.startswith("all/")} == {
+        k: v for k, v in default.items() if k.startswith("all/")
+    }
+
+    # library defines each variant once
+    assert library["library.svg"].count("<symbol") == variant_count
+
+    # matrix references each variant without copying its geometry or
+    # nesting a drawing per cell, leaving only its own root and canonical
+    # <svg>
+    matrix = library["matrix/matrix.svg"]
+    assert matrix.count('xlink:href="../library.svg#') == variant_count
+    assert matrix.count("<use") == variant_count
+    assert matrix.count("<svg") == 2
+    assert "<polyline" not in matrix
+
+    row = library["harrays/row_0.svg"]
+    assert row.count("<use") == len(VARIANT_STROKE_PCTS)
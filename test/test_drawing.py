@@ -2,15 +2,29 @@ from pathlib import Path
 
 from pytest import mark, raises
 
-from glyphsynth import RASTER_SUPPORT, Drawing, Properties
+from glyphsynth import (
+    RASTER_SUPPORT,
+    BaseDrawing,
+    Drawing,
+    DrawingFragment,
+    ExportOptions,
+    Properties,
+    output_scale,
+)
 from glyphsynth.drawing.export import export_drawings
 
 from .conftest import write_drawing
 from .glyphs import (
+    CENTER,
+    HALF,
+    ORIGIN,
+    SIZE,
     UNIT,
+    ZERO,
     BasicDrawing,
     BasicParams,
     GradientDrawing,
+    GradientParams,
     ParentDrawing,
     ParentDrawing2,
 )
@@ -107,6 +121,36 @@ def test_composition_rescaled(output_dir: Path):
     write_drawing(output_dir, parent)
 
 
+def test_fragment():
+    """
+    Verify inserting the output of drawings as fragments is equivalent to
+    inserting the drawings.
+    """
+
+    def create(use_fragments: bool) -> Drawing:
+        drawing = Drawing(drawing_id="parent", size=(UNIT * 2, UNIT))
+
+        for i, color in enumerate(["red", "green"]):
+            child = GradientDrawing(
+                drawing_id=f"child-{i}", params=GradientParams(color1=color)
+            )
+            drawing.insert_drawing(
+                DrawingFragment.new(child) if use_fragments else child,
+                (UNIT * i, ZERO),
+            )
+
+        return drawing
+
+    drawing = create(False)
+    drawing_fragments = create(True)
+
+    assert drawing_fragments.render_svg() == drawing.render_svg()
+    assert drawing_fragments.bbox == drawing.bbox is not None
+
+    # fragments are unchanged by export
+    assert drawing_fragments.render_svg() == drawing.render_svg()
+
+
 @mark.skipif(
     RASTER_SUPPORT is False, reason="Rasterizing only supported on linux"
 )
@@ -120,6 +164,48 @@ def test_raster(output_dir):
     parent.export_png(output_dir)
 
 
+@mark.skipif(
+    RASTER_SUPPORT is False, reason="Rasterizing only supported on linux"
+)
+def test_tiles(output_dir: Path):
+    """
+    Export tile pyramid and verify tiles are cropped views of the drawing.
+    """
+
+    drawing = BasicDrawing()
+    drawing.export_tiles(output_dir, tile_size=UNIT // 4, jobs=4)
+
+    for z, count in enumerate([1, 2, 4]):
+        for x in range(count):
+            for y in range(count):
+                assert (output_dir / str(z) / str(x) / f"{y}.png").is_file()
+
+        assert not (output_dir / str(z) / str(count)).exists()
+
+    assert not (output_dir / "3").exists()
+    assert (output_dir / "overview.svg").is_file()
+
+    # tiles at the highest zoom level are rendered at full scale
+    drawing_tile = drawing._rescale_drawing(
+        (f"{UNIT // 4}px", f"{UNIT // 4}px"),
+        region=(UNIT / 4, UNIT / 2, UNIT / 4, UNIT / 4),
+    )
+    assert [float(v) for v in drawing_tile["viewBox"].split(",")] == [
+        UNIT / 4,
+        UNIT / 2,
+        UNIT / 4,
+        UNIT / 4,
+    ]
+    assert "viewBox" not in drawing._drawing.attribs
+
+    # limit zoom levels
+    drawing.export_tiles(
+        output_dir / "limited", tile_size=UNIT // 4, zoom_levels=2
+    )
+    assert (output_dir / "limited" / "1" / "3" / "3.png").is_file()
+    assert not (output_dir / "limited" / "2").exists()
+
+
 def test_empty(output_dir: Path):
     """
     Verify Drawing, with and without explicit size.
@@ -165,3 +251,79 @@ def test_export(output_dir: Path):
 def test_gradient(output_dir: Path):
     drawing = GradientDrawing()
     write_drawing(output_dir, drawing)
+
+
+class DetailedDrawing(BaseDrawing):
+    """
+    Drawing which omits detail at small output scales.
+    """
+
+    canonical_size = SIZE
+
+    def draw(self):
+        self.draw_rect(ORIGIN, SIZE)
+
+        if self.output_scale >= 0.5:
+            self.draw_circle(CENTER, HALF / 2)
+
+
+class LodParentDrawing(BaseDrawing):
+    canonical_size = SIZE
+
+    def draw(self):
+        self.insert_drawing(DetailedDrawing(size=(HALF, HALF)), ORIGIN)
+        self.insert_drawing(DetailedDrawing(size=(HALF / 4, HALF / 4)))
+
+
+def test_output_scale(output_dir: Path):
+    """
+    Verify drawings receive their output scale, including nested drawings.
+    """
+
+    drawing = LodParentDrawing()
+    assert drawing.output_scale == 1.0
+
+    large, small = drawing._nested_glyphs
+    assert large.output_scale == 0.5
+    assert small.output_scale == 0.125
+
+    assert len(large._elements) == 2
+    assert len(small._elements) == 1
+
+    with output_scale(0.5):
+        drawing = LodParentDrawing()
+
+    assert drawing.output_scale == 0.5
+    assert [len(d._elements) for d in drawing._nested_glyphs] == [1, 1]
+
+    # scale is only set within context
+    assert LodParentDrawing().output_scale == 1.0
+
+    drawing.export_svg(output_dir / "lod.svg")
+
+
+def test_lod_threshold():
+    """
+    Verify elements below the threshold in output pixels are dropped.
+    """
+
+    drawing = Drawing(size=SIZE)
+    drawing.draw_rect(ORIGIN, SIZE)
+    drawing.draw_circle(CENTER, 1)
+
+    group = drawing.create_group()
+    group.draw_circle(CENTER, 4)
+    group.scale(0.1)
+
+    def get_count(svg: str) -> int:
+        return svg.count("<rect") + svg.count("<circle")
+
+    assert get_count(drawing.render_svg()) == 3
+    assert (
+        get_count(drawing.render_svg(options=ExportOptions(lod_threshold=1)))
+        == 2
+    )
+    assert (
+        get_count(drawing.render_svg(options=ExportOptions(lod_threshold=3)))
+        == 1
+    )
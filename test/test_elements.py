@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from glyphsynth import Drawing, ShapeProperties
+import numpy as np
+from pytest import approx
+
+from glyphsynth import Affine, BBox, Drawing, ShapeProperties
 
 from .conftest import write_drawing
 from .glyphs import HALF, ORIGIN, UNIT, BasicDrawing, BasicParams
@@ -50,3 +53,82 @@ def test_fill(output_dir: Path):
     circle.fill(gradient=gradient2)
 
     write_drawing(output_dir, drawing)
+
+
+def test_transform():
+    """
+    Verify transforms are composed into a single matrix.
+    """
+
+    drawing = BasicDrawing()
+    drawing.rotate(90).scale(2).translate(10, 5)
+
+    assert drawing._group["transform"] == "matrix(0,2,-2,0,90,20)"
+    assert drawing.transform.apply(0, 0) == approx((90, 20))
+    assert drawing.transform.invert().apply(90, 20) == approx((0, 0))
+
+    # transforms on elements are composed in the same way
+    line = drawing.draw_line((0, 0), (UNIT, 0)).translate(5).translate(5)
+    assert line._element["transform"] == "matrix(1,0,0,1,10,0)"
+
+    line.set_transform(Affine())
+    assert "transform" not in line._element.attribs
+
+    # opt in to chain of transforms
+    line.preserve_transform_chain = True
+    line.rotate(90, center=(HALF, HALF)).translate(10)
+
+    assert line._element["transform"] == "rotate(90,50.0,50.0) translate(10)"
+    assert line.transform.apply(0, 0) == approx((UNIT, 10))
+
+
+def test_batch(output_dir: Path):
+    """
+    Verify drawing primitives in bulk from arrays, sharing properties.
+    """
+
+    drawing = Drawing(size=(UNIT, UNIT))
+    properties = ShapeProperties(stroke="black", stroke_width=0.5)
+
+    # hatching
+    xs = np.linspace(0, UNIT, 11)
+    lines = drawing.draw_lines(
+        np.stack([xs, np.zeros(11)], axis=1),
+        np.stack([xs, np.full(11, UNIT)], axis=1),
+        properties=properties,
+    )
+
+    assert len(lines) == 11
+    assert lines[1]._element.attribs["x1"] == "10"
+    assert lines[1]._element.attribs["stroke-width"] == 0.5
+
+    # halftone
+    centers = np.stack(np.meshgrid(xs, xs), axis=-1).reshape(-1, 2)
+    circles = drawing.draw_circles(centers, np.linspace(0.5, 2, len(centers)))
+    assert len(circles) == len(centers)
+    assert circles[-1].bbox == BBox(98, 98, 102, 102)
+
+    # single radius given as numpy scalar
+    dots = drawing.draw_circles(centers[:3], np.int64(3))
+    assert dots[0]._element.attribs["r"] == "3"
+
+    polylines = drawing.draw_polylines(
+        [
+            np.array([[0, 0], [HALF, HALF], [UNIT, 0]]),
+            [(0, UNIT), (HALF, HALF)],
+        ],
+        properties=properties,
+    )
+    assert polylines[0].bbox is not None
+    assert polylines[0].bbox.x_max == approx(UNIT + 0.25, abs=0.1)
+
+    svg = drawing.render_svg()
+
+    assert '<polyline points="0,0 50,50 100,0"' in svg
+    assert '<polyline points="0,100 50,50"' in svg
+    assert svg.count("<circle") == len(centers) + 3
+
+    # elements are tracked for hit-testing
+    assert lines[0] in drawing.get_children_at(0, HALF)
+
+    write_drawing(output_dir, drawing)
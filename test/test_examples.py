@@ -146,7 +146,7 @@ def test_letter_combination_variants(output_dir: Path):
                 )
 
     for spec in LetterVariantFactory():
-        write_drawing(output_dir / spec.path, spec.drawing, scale=2)
+        write_drawing(output_dir / spec.path, spec.create_drawing(), scale=2)
 
 
 def test_sunset_gradients(output_dir: Path):
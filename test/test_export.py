@@ -0,0 +1,202 @@
+import json
+import pickle
+import subprocess
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+from pytest import raises
+
+from glyphsynth import DeferredExportSpec
+from glyphsynth.drawing.export import export_drawings, merge_manifests
+
+from .glyphs import COLORS, BasicDrawing, BasicParams
+
+
+def test_deferred_spec():
+    """
+    Verify deferred specs are compact and construct the expected drawing.
+    """
+
+    spec = DeferredExportSpec.new(
+        BasicDrawing,
+        Path(),
+        drawing_id="basic",
+        params=BasicParams(color1="red"),
+        size=(200, 200),
+    )
+
+    assert len(pickle.dumps(spec)) < 500
+
+    drawing = pickle.loads(pickle.dumps(spec)).create_drawing()
+
+    assert isinstance(drawing, BasicDrawing)
+    assert drawing.drawing_id == "basic"
+    assert drawing.params.color1 == "red"
+    assert drawing.size == (200.0, 200.0)
+
+
+def test_export_parallel(output_dir: Path):
+    """
+    Export deferred specs serially and in parallel, verifying the outputs
+    are identical.
+    """
+
+    serial_path = output_dir / "serial"
+    parallel_path = output_dir / "parallel"
+
+    export_drawings("test.glyphs.deferred_specs", serial_path, svg=True)
+    export_drawings(
+        "test.glyphs.deferred_specs", parallel_path, svg=True, jobs=2
+    )
+
+    for color in COLORS:
+        filename = Path("deferred") / f"basic-{color}.svg"
+
+        serial_svg = (serial_path / filename).read_text()
+        parallel_svg = (parallel_path / filename).read_text()
+
+        assert serial_svg == parallel_svg
+
+
+def test_export_shards(output_dir: Path):
+    """
+    Export shards in separate processes and verify they're disjoint and
+    together cover the unsharded export.
+    """
+
+    shard_count = 3
+
+    full_path = output_dir / "full"
+    sharded_path = output_dir / "sharded"
+
+    export_drawings("test.glyphs.deferred_specs", full_path, svg=True)
+
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "glyphsynth.cli.export",
+                "test.glyphs.deferred_specs",
+                str(sharded_path),
+                "--svg",
+                "--shard",
+                f"{index}/{shard_count}",
+            ]
+        )
+        for index in range(shard_count)
+    ]
+
+    for process in processes:
+        assert process.wait() == 0
+
+    files = merge_manifests(sharded_path, shard_count)
+
+    full_files = sorted(
+        p.relative_to(full_path).as_posix() for p in full_path.rglob("*.svg")
+    )
+    sharded_files = sorted(
+        p.relative_to(sharded_path).as_posix()
+        for p in sharded_path.rglob("*.svg")
+    )
+
+    assert files == full_files == sharded_files
+
+    manifest = json.loads((sharded_path / "manifest.json").read_text())
+    assert manifest["files"] == files
+
+    # missing shard manifest
+    with raises(ValueError):
+        merge_manifests(sharded_path, shard_count + 1)
+
+
+def test_export_resume(output_dir: Path):
+    """
+    Interrupt an export by removing an output and truncating the journal,
+    then verify only the missing drawing is exported upon resume.
+    """
+
+    export_drawings("test.glyphs.deferred_specs", output_dir, svg=True)
+
+    svg_paths = [
+        output_dir / "deferred" / f"basic-{color}.svg" for color in COLORS
+    ]
+    mtimes = [p.stat().st_mtime_ns for p in svg_paths]
+
+    journal_path = output_dir / "journal.jsonl"
+    entries = journal_path.read_text().splitlines()
+    assert len(entries) == len(COLORS)
+
+    # drop last entry and leave a partially written line
+    journal_path.write_text("\n".join(entries[:-1]) + "\n" + entries[-1][:10])
+    svg_paths[-1].unlink()
+
+    export_drawings(
+        "test.glyphs.deferred_specs", output_dir, svg=True, resume=True
+    )
+
+    assert svg_paths[-1].exists()
+    assert [p.stat().st_mtime_ns for p in svg_paths[:-1]] == mtimes[:-1]
+
+    # export without resuming starts a new journal
+    export_drawings("test.glyphs.deferred_specs", output_dir, svg=True)
+    assert len(journal_path.read_text().splitlines()) == len(COLORS)
+
+
+def test_export_archive(output_dir: Path):
+    """
+    Export to archives and verify they have the same layout and content as
+    an export to a folder.
+    """
+
+    folder_path = output_dir / "folder"
+
+    export_drawings(
+        "test.glyphs.deferred_specs",
+        folder_path,
+        output_modpath=True,
+        svg=True,
+        png=True,
+    )
+
+    folder_files: dict[str, bytes] = {
+        p.relative_to(folder_path).as_posix(): p.read_bytes()
+        for p in folder_path.rglob("*")
+        if p.suffix in (".svg", ".png")
+    }
+    assert len(folder_files) == len(COLORS) * 2
+
+    for filename, jobs in [("out.tar", 1), ("out.tar.gz", 2), ("out.zip", 2)]:
+        archive_path = output_dir / filename
+
+        export_drawings(
+            "test.glyphs.deferred_specs",
+            archive_path,
+            output_modpath=True,
+            svg=True,
+            png=True,
+            jobs=jobs,
+        )
+
+        archive_files: dict[str, bytes]
+
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as zf:
+                archive_files = {n: zf.read(n) for n in zf.namelist()}
+        else:
+            with tarfile.open(archive_path) as tf:
+                archive_files = {
+                    m.name: tf.extractfile(m).read() for m in tf.getmembers()
+                }
+
+        assert archive_files == folder_files
+
+    with raises(ValueError):
+        export_drawings(
+            "test.glyphs.deferred_specs",
+            output_dir / "out.tar",
+            svg=True,
+            resume=True,
+        )
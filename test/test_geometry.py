@@ -0,0 +1,279 @@
+import math
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+from pytest import approx, raises
+from svgwrite.container import SVG, Group
+from svgwrite.shapes import Circle, Line, Polyline, Rect
+
+from glyphsynth import (
+    Affine,
+    BBox,
+    Drawing,
+    Properties,
+    cull,
+    get_bbox,
+    get_version,
+    parse_transform,
+    simplify_points,
+)
+from glyphsynth.lib import MatrixDrawing
+
+from .glyphs import UNIT, BasicDrawing
+
+SPACING = UNIT / 10
+
+
+def test_affine():
+    """
+    Verify composition, inversion and parsing of transforms.
+    """
+
+    transform = parse_transform("translate(10,20) rotate(90)")
+
+    assert transform.apply(1, 0) == approx((10, 21))
+    assert (transform.invert() @ transform).apply(3, 4) == approx((3, 4))
+
+    # rotation about a center
+    rotation = Affine.rotation(180, center=(5, 5))
+    assert rotation.apply(0, 0) == approx((10, 10))
+    assert parse_transform("rotate(180,5,5)") == rotation
+
+    assert Affine.scaling(2, 3).max_scale == approx(3)
+
+    with raises(ValueError):
+        Affine.scaling(0).invert()
+
+
+def test_bbox():
+    """
+    Verify bounding boxes of elements, including stroke, transforms and
+    nested viewports.
+    """
+
+    line = Line((0, 0), (10, 0), stroke="black", stroke_width=2)
+    assert get_bbox(line) == BBox(0, -1, 10, 1)
+
+    line["stroke-linecap"] = "square"
+    assert get_bbox(line) == BBox(-1, -1, 11, 1)
+
+    # sharp join is beveled unless within miter limit
+    polyline = Polyline(
+        [(0, 0), (10, 0), (0, 5)], stroke="black", stroke_width=2
+    )
+    bbox = get_bbox(polyline)
+    assert bbox is not None
+    assert bbox.x_max == approx(10 + 1 / math.sqrt(5))
+
+    polyline["stroke-miterlimit"] = 10
+    bbox = get_bbox(polyline)
+    assert bbox is not None
+    assert bbox.x_max > 14
+
+    rect = Rect((0, 0), (10, 10))
+    rect.rotate(45, center=(5, 5))
+
+    bbox = get_bbox(rect)
+    assert bbox is not None
+    assert bbox.width == approx(10 * math.sqrt(2))
+    assert bbox.center == approx((5, 5))
+
+    # stroke properties are inherited
+    group = Group(stroke="black", stroke_width=4)
+    group.add(Circle((0, 0), 5))
+    group.translate(10, 10)
+    assert get_bbox(group) == BBox(3, 3, 17, 17)
+
+    # nested viewport scales and clips its content
+    svg = SVG(insert=(10, 0), size=(20, 20))
+    svg.viewbox(0, 0, 10, 10)
+    svg.add(Rect((5, 5), (10, 10)))
+    assert get_bbox(svg) == BBox(20, 10, 30, 20)
+
+    # empty groups have no extent
+    assert get_bbox(Group()) is None
+
+
+def test_drawing_bbox():
+    """
+    Verify bounding boxes of drawings, nested drawings and elements.
+    """
+
+    child = BasicDrawing()
+    content_bbox = child.content_bbox
+
+    # round caps extend to the inset
+    assert content_bbox is not None
+    assert content_bbox.rect == approx((0.1, 0.1, UNIT - 0.2, UNIT - 0.2))
+    assert child.bbox == content_bbox
+
+    parent = Drawing()
+    parent.insert_drawing(child, (10, 20))
+
+    bbox = child.bbox
+    assert bbox is not None
+    assert bbox.rect == approx((10.1, 20.1, UNIT - 0.2, UNIT - 0.2))
+
+    # cached bounding box is invalidated upon transform
+    child.scale(2)
+
+    bbox = child.bbox
+    assert bbox is not None
+    assert bbox.rect == approx((10.2, 20.2, (UNIT - 0.2) * 2, (UNIT - 0.2) * 2))
+
+    line = parent.draw_line(
+        (0, 0), (0, 10), properties=Properties(stroke="black", stroke_width=2)
+    )
+    assert line.bbox == BBox(-1, 0, 1, 10)
+
+
+def test_fit_to_content():
+    """
+    Verify drawings without a size are fit to their content.
+    """
+
+    drawing = Drawing()
+    drawing.insert_drawing(BasicDrawing(), (10, 20))
+    drawing.fit_to_content(padding=5)
+
+    assert drawing.size == approx((UNIT - 0.2 + 10, UNIT - 0.2 + 10))
+
+    svg = drawing.render_svg()
+    assert 'viewBox="5.1,15.1' in svg
+
+    class AutoDrawing(Drawing):
+        auto_size = True
+
+        def draw(self):
+            self.draw_circle((0, 0), 10)
+
+    assert AutoDrawing().size == (20, 20)
+
+
+def test_cull():
+    """
+    Verify elements outside a region are omitted.
+    """
+
+    group = Group()
+    group.add(Rect((0, 0), (10, 10)))
+    group.add(Rect((100, 100), (10, 10)))
+
+    culled = cull(group, BBox(0, 0, 50, 50))
+    assert len(culled.elements) == 1
+    assert len(group.elements) == 2
+
+
+def test_region(output_dir: Path):
+    """
+    Export a region of a matrix containing a single cell.
+    """
+
+    matrix = MatrixDrawing.new(
+        [
+            [BasicDrawing(drawing_id=f"basic-{r}-{c}") for c in range(10)]
+            for r in range(10)
+        ],
+        drawing_id="matrix-region",
+        spacing=SPACING,
+    )
+
+    # region around cell (3, 4)
+    region = (
+        4 * (UNIT + SPACING) - SPACING / 2,
+        3 * (UNIT + SPACING) - SPACING / 2,
+        UNIT + SPACING,
+        UNIT + SPACING,
+    )
+
+    matrix.export_svg(output_dir / "region.svg", region=region)
+    svg = (output_dir / "region.svg").read_text()
+
+    assert svg.count("BasicDrawing-wrapper-insert") == 1
+
+    # ids of drawings are kept
+    assert 'id="matrix-region"' in svg
+    assert 'id="basic-3-4"' in svg
+    assert f'x="{4 * (UNIT + SPACING)}" y="{3 * (UNIT + SPACING)}"' in svg
+    assert len(svg) * 20 < len(matrix.render_svg())
+
+    # regions overlapping adjacent cells include them
+    svg = matrix.render_svg(region=(0, 0, UNIT * 2, UNIT))
+    assert svg.count("BasicDrawing-wrapper-insert") == 2
+
+
+def get_deviation(
+    points: NDArray[np.float64], simplified: NDArray[np.float64]
+) -> float:
+    """
+    Get maximum distance of points from a simplified polyline.
+    """
+    starts, ends = simplified[:-1], simplified[1:]
+    direction = ends - starts
+    length_sq = np.maximum((direction**2).sum(axis=1), 1e-12)
+
+    # distance of each point from each segment
+    offsets = points[:, None, :] - starts[None, :, :]
+    t = np.clip((offsets * direction).sum(axis=2) / length_sq, 0, 1)
+    distances = np.hypot(
+        *(offsets - t[..., None] * direction).transpose(2, 0, 1)
+    )
+
+    return float(distances.min(axis=1).max())
+
+
+def test_simplify():
+    """
+    Verify simplified points are within the tolerance of the original.
+    """
+
+    xs = np.linspace(0, UNIT, 5000)
+    points = np.stack([xs, UNIT / 2 + UNIT / 4 * np.sin(xs / 10)], axis=1)
+
+    for tolerance in (0.01, 0.1, 1.0):
+        simplified = simplify_points(points, tolerance)
+
+        assert len(simplified) < len(points) / 10
+        assert simplified[0] == approx(points[0])
+        assert simplified[-1] == approx(points[-1])
+        assert get_deviation(points, simplified) <= tolerance
+
+    # collinear points are omitted
+    assert simplify_points([(0, 0), (1, 1), (2, 2), (3, 3)], 0).tolist() == [
+        [0, 0],
+        [3, 3],
+    ]
+    assert len(simplify_points([], 1)) == 0
+
+
+def test_invalidate():
+    """
+    Verify mutations only invalidate state of the mutated drawing and its
+    ancestors.
+    """
+
+    parent = Drawing(size=(UNIT * 2, UNIT * 2))
+    child = parent.insert_drawing(BasicDrawing(), (0, 0))
+    other = BasicDrawing()
+
+    index = parent.spatial_index
+    index_other = other.spatial_index
+    version = get_version(parent._group)
+
+    # mutating the nested drawing invalidates its parent
+    child.draw_polyline([(0, 0), (UNIT * 1.5, UNIT * 1.5)])
+
+    assert get_version(parent._group) > version
+    assert parent.spatial_index is not index
+
+    bbox = child.bbox
+    assert bbox is not None and bbox.x_max == approx(UNIT, abs=3)
+
+    child.translate(UNIT / 2)
+
+    bbox = child.bbox
+    assert bbox is not None and bbox.x_max == approx(UNIT * 1.5, abs=3)
+
+    # unrelated drawings keep their state
+    assert other.spatial_index is index_other
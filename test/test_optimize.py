@@ -0,0 +1,369 @@
+import re
+from pathlib import Path
+from xml.etree import ElementTree
+
+import numpy as np
+from pytest import approx
+
+from glyphsynth import (
+    Drawing,
+    ExportOptions,
+    ShapeProperties,
+    get_content_bbox,
+    simplify_points,
+)
+from glyphsynth.drawing.graphics.optimize import INHERITED_PROPERTIES
+from glyphsynth.lib import MatrixDrawing
+from glyphsynth.lib.alphabets.latin.runic import LETTER_CLASSES
+
+from .glyphs import HALF, UNIT, BasicDrawing, GradientDrawing, GradientParams
+from .test_geometry import get_deviation
+
+FLATTEN = ExportOptions(flatten=True)
+
+
+class NestedDrawing(Drawing):
+    """
+    Drawing with transformed nested drawings and groups.
+    """
+
+    def draw(self):
+        child = self.insert_drawing(BasicDrawing(), (UNIT / 2, UNIT / 2))
+        child.scale(0.5)
+
+        group = self.create_group()
+        group.draw_circle(
+            (HALF, HALF), UNIT / 4, properties=ShapeProperties(fill="blue")
+        )
+        group.draw_ellipse((HALF, HALF), (UNIT / 4, UNIT / 8))
+        group.draw_rect((HALF - 10, HALF - 5), (20, 10), radius_x=2)
+        group.rotate(45, center=(HALF, HALF))
+
+
+def _parse(svg: str) -> ElementTree.Element:
+    xml = ElementTree.fromstring(svg)
+
+    # strip namespace
+    for elem in xml.iter():
+        elem.tag = elem.tag.rpartition("}")[2]
+
+    return xml
+
+
+def test_flatten(output_dir: Path):
+    """
+    Verify flattened documents have no transforms or nested viewports and
+    have the same extent.
+    """
+
+    drawing = NestedDrawing(size=(UNIT * 2, UNIT * 2))
+    drawing.export_svg(output_dir / "flatten.svg", options=FLATTEN)
+
+    xml = _parse((output_dir / "flatten.svg").read_text())
+    xml_orig = _parse(drawing.render_svg())
+
+    assert not any("transform" in e.attrib for e in xml.iter())
+    assert [e.tag for e in xml.iter()].count("svg") == 1
+
+    # content fits in each viewport, so no clipping is needed
+    assert [e.tag for e in xml] == [
+        "defs",
+        "polyline",
+        "polyline",
+        "circle",
+        "path",
+        "path",
+    ]
+
+    # stroke is scaled along with coordinates
+    assert {e.get("stroke-width") for e in xml[1:3]} == {"2.5"}
+
+    # bounds of curved paths may be loose, so only compare the rest
+    for elem in [xml, xml_orig]:
+        for path in elem.iter():
+            path[:] = [
+                e for e in path if e.tag not in ("path", "ellipse", "rect")
+            ]
+
+    bbox = get_content_bbox(xml)
+    bbox_orig = get_content_bbox(xml_orig)
+
+    assert bbox is not None and bbox_orig is not None
+    assert bbox.rect == approx(bbox_orig.rect)
+
+
+def test_flatten_aligned():
+    """
+    Verify shapes are adjusted in place if only scaled and translated.
+    """
+
+    drawing = Drawing(size=(UNIT, UNIT))
+
+    group = drawing.create_group()
+    group.draw_circle((1, 2), 3)
+    group.draw_rect((1, 2), (3, 4), radius_x=1)
+    group.draw_polyline(
+        [(0, 0), (1, 1)], properties=ShapeProperties(stroke="black")
+    )
+    group.translate(10, 20)
+    group.scale(2, 3)
+
+    xml = _parse(drawing.render_svg(options=FLATTEN))
+    circle, rect, polyline = xml[1:]
+
+    # scaled non-uniformly
+    assert circle.tag == "ellipse"
+    assert circle.attrib == {"cx": "12", "cy": "26", "rx": "6", "ry": "9"}
+
+    assert rect.attrib == {
+        "x": "12",
+        "y": "26",
+        "width": "6",
+        "height": "12",
+        "rx": "2",
+        "ry": "3",
+    }
+    assert polyline.get("points") == "10,20 12,23"
+    assert float(polyline.get("stroke-width", "")) == approx(6**0.5)
+
+
+def test_flatten_gradient():
+    """
+    Verify gradients in user space are transformed along with shapes.
+    """
+
+    drawing = Drawing(size=(UNIT, UNIT))
+
+    gradient = drawing.create_linear_gradient(
+        start=(0, 0), end=(UNIT, 0), colors=["red", "blue"]
+    )
+
+    group = drawing.create_group()
+    group.draw_rect(
+        (0, 0),
+        (UNIT, UNIT),
+        properties=ShapeProperties(fill=gradient.get_paint_server()),
+    )
+    group.rotate(90, center=(HALF, HALF))
+
+    xml = _parse(drawing.render_svg(options=FLATTEN))
+    path = xml.find("path")
+    assert path is not None
+
+    match = re.match(r"url\(#(\w+)\)", path.get("fill", ""))
+    assert match is not None
+
+    id_ = match.group(1)
+
+    gradient_ = xml.find(f"defs/linearGradient[@id='{id_}']")
+    assert gradient_ is not None
+    assert gradient_.get("gradientTransform") == "matrix(0,1,-1,0,100,0)"
+
+    # original gradient is no longer referenced
+    assert len(xml.findall("defs/linearGradient")) == 1
+
+
+def test_flatten_reference():
+    """
+    Verify references to symbols are inlined.
+    """
+
+    drawing = Drawing(size=(UNIT, UNIT))
+    symbol = drawing.create_symbol(BasicDrawing(drawing_id="flatten-symbol"))
+
+    drawing.insert_reference(symbol, (HALF, HALF))
+    drawing.insert_reference(symbol, (HALF, HALF), insert=(HALF, HALF))
+
+    xml = _parse(drawing.render_svg(options=FLATTEN))
+
+    # symbol is omitted as it's no longer referenced
+    assert [e.tag for e in xml] == ["defs"] + ["polyline"] * 4
+    assert not len(xml[0])
+
+    assert xml[1].get("points") == "1.3,1.3 48.7,48.7"
+    assert xml[3].get("points") == "51.3,51.3 98.7,98.7"
+
+
+def test_coalesce():
+    """
+    Verify same-styled strokes are merged into a single path.
+    """
+
+    drawing = Drawing(size=(UNIT, UNIT))
+    properties = ShapeProperties(fill="none", stroke="black", stroke_width=2)
+
+    drawing.draw_line((0, 0), (UNIT, UNIT), properties=properties)
+    drawing.draw_polyline([(0, UNIT), (HALF, HALF), (UNIT, 0)], properties)
+    drawing.draw_line((0, HALF), (UNIT, HALF), properties=properties)
+
+    # differently styled, so not merged
+    drawing.draw_line(
+        (HALF, 0),
+        (HALF, UNIT),
+        properties=ShapeProperties(stroke="red", stroke_width=2),
+    )
+
+    xml = _parse(drawing.render_svg(options=ExportOptions(coalesce_paths=True)))
+    shapes = [e for e in xml.iter() if e.tag not in ("svg", "g", "defs")]
+    assert [e.tag for e in shapes] == ["path", "line"]
+
+    path = shapes[0]
+    assert path.get("d") == "M0 0 100 100M0 100 50 50 100 0M0 50H100"
+    assert path.get("stroke-width") == "2"
+
+
+def test_simplify():
+    """
+    Verify polylines are simplified within the tolerance in output pixels.
+    """
+
+    xs = np.linspace(0, UNIT, 2000)
+    points = np.stack([xs, HALF + UNIT / 4 * np.sin(xs / 10)], axis=1)
+
+    drawing = Drawing(size=(UNIT, UNIT))
+    group = drawing.create_group()
+    group.draw_polyline(
+        points.tolist(), properties=ShapeProperties(stroke="black")
+    )
+    group.scale(0.5)
+
+    tolerance = 0.1
+    xml = _parse(
+        drawing.render_svg(options=ExportOptions(simplify_tolerance=tolerance))
+    )
+    polyline = xml.find(".//polyline")
+    assert polyline is not None
+
+    simplified = np.array(
+        re.split(r"[\s,]+", polyline.get("points", "")), dtype=np.float64
+    ).reshape(-1, 2)
+
+    assert len(simplified) < len(points) / 10
+
+    # tolerance is doubled in local coordinates as they're scaled by half
+    assert get_deviation(points, simplified) <= tolerance * 2
+    assert get_deviation(points, simplified) > tolerance
+
+    # simplified when drawn
+    polyline_ = drawing.draw_polyline(points.tolist(), simplify=tolerance)
+    assert len(polyline_._element.points) == len(
+        simplify_points(points, tolerance)
+    )
+
+
+def test_dedupe_gradients():
+    """
+    Verify identical gradients are defined once per document.
+    """
+
+    drawing = Drawing(size=(UNIT * 4, UNIT))
+
+    for i in range(4):
+        params = GradientParams(color2="red" if i == 3 else "blue")
+        drawing.insert_drawing(GradientDrawing(params=params), (UNIT * i, 0))
+
+    xml = _parse(drawing.render_svg())
+    gradients = xml.findall(".//radialGradient")
+    assert len(gradients) == 2
+
+    ids = {g.get("id") for g in gradients}
+    fills = [c.get("fill", "") for c in xml.iter("circle")]
+    assert len(fills) == 4
+
+    # references are rewritten to the gradients which are kept
+    assert all(re.sub(r"url\(#(\w+)\)", r"\1", f) in ids for f in fills)
+    assert fills[0] == fills[1] == fills[2] != fills[3]
+
+
+def test_dedupe_gradients_lod():
+    """
+    Verify gradients shared with a drawing dropped for its size remain
+    defined.
+    """
+
+    drawing = Drawing(size=(1000, 1000))
+    drawing.insert_drawing(GradientDrawing(size=(0.5, 0.5)), (0, 0))
+    drawing.insert_drawing(GradientDrawing(size=(500, 500)), (100, 100))
+
+    xml = _parse(drawing.render_svg(options=ExportOptions(lod_threshold=1)))
+    assert len(list(xml.iter("circle"))) == 1
+
+    ids = {e.get("id") for e in xml.iter()}
+    refs = {
+        m.group(1)
+        for e in xml.iter()
+        for v in e.attrib.values()
+        if (m := re.match(r"url\(#(\w+)\)", v))
+    }
+    assert refs and refs <= ids
+
+
+def _get_resolved(xml: ElementTree.Element) -> list[dict[str, str]]:
+    """
+    Get inherited properties of each shape in document order, resolving
+    classes from a generated style sheet.
+    """
+
+    style = xml.find("style")
+    rules: dict[str, dict[str, str]] = {
+        name: dict(d.split(":", 1) for d in decls.split(";"))
+        for name, decls in re.findall(
+            r"\.([\w-]+)\{([^}]*)\}",
+            style.text or "" if style is not None else "",
+        )
+    }
+
+    resolved: list[dict[str, str]] = []
+
+    def resolve(elem: ElementTree.Element, inherited: dict[str, str]):
+        props = inherited | {
+            k: v for k, v in elem.attrib.items() if k in INHERITED_PROPERTIES
+        }
+
+        for name in elem.get("class", "").split():
+            props |= rules.get(name, {})
+
+        if elem.tag in ("line", "polyline", "path", "rect", "circle"):
+            resolved.append(props)
+
+        for child in elem:
+            resolve(child, props)
+
+    resolve(xml, {})
+    return resolved
+
+
+def test_hoist_properties():
+    """
+    Verify properties are hoisted or replaced by classes without affecting
+    the properties of any shape.
+    """
+
+    rows = [[letter_cls() for letter_cls in LETTER_CLASSES]]
+    matrix = MatrixDrawing.new(rows, spacing=10)
+
+    svg = matrix.render_svg()
+    resolved = _get_resolved(_parse(svg))
+
+    for options in [
+        ExportOptions(hoist_properties=True),
+        ExportOptions(style_classes=True),
+        ExportOptions(hoist_properties=True, style_classes=True),
+    ]:
+        svg_ = matrix.render_svg(options=options)
+        xml = _parse(svg_)
+
+        assert len(svg_) < len(svg) * 0.8
+        assert _get_resolved(xml) == resolved
+
+    # all shapes share the same properties, so they're set on the root
+    xml = _parse(
+        matrix.render_svg(options=ExportOptions(hoist_properties=True))
+    )
+
+    assert xml.get("stroke") == "black"
+    assert not any(
+        "stroke" in e.attrib
+        for e in xml.iter()
+        if e.tag in ("line", "polyline")
+    )
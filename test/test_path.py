@@ -0,0 +1,84 @@
+from pytest import approx, raises
+
+from glyphsynth import (
+    Affine,
+    Drawing,
+    ShapeProperties,
+    encode_path,
+    parse_path,
+    transform_path,
+)
+
+from .glyphs import UNIT
+
+
+def test_parse():
+    """
+    Verify path data is parsed with implicit commands made explicit.
+    """
+
+    assert parse_path("M10,10l5-5 5 5zm1 2 3 4a5 5 0 01 10 10") == [
+        ("M", 10, 10),
+        ("l", 5, -5),
+        ("l", 5, 5),
+        ("z",),
+        ("m", 1, 2),
+        ("l", 3, 4),
+        ("a", 5, 5, 0, 0, 1, 10, 10),
+    ]
+
+    with raises(ValueError):
+        parse_path("L 10")
+
+
+def test_encode():
+    """
+    Verify paths are encoded compactly and decode to the same points.
+    """
+
+    d = "M 10 10 L 20 10 L 20 20 L 10 20 Z M 30 30 L 40 40 L 50 50"
+    encoded = encode_path(d)
+
+    assert encoded == "M10 10H20V20H10ZM30 30 40 40 50 50"
+    assert transform_path(encoded, Affine()) == transform_path(d, Affine())
+
+    # relative form is shorter for small offsets from large coordinates
+    assert (
+        encode_path([("M", 1000, 1000), ("L", 1001, 1002)]) == "M1000 1000l1 2"
+    )
+
+
+def test_transform():
+    """
+    Verify arcs have their radii and orientation transformed.
+    """
+
+    # scaled and reflected horizontally
+    path = transform_path("M0 0A10 5 0 0 1 20 0", Affine.scaling(-2, 1))
+
+    assert path[0] == ("M", 0, 0)
+
+    letter, rx, ry, angle, large, sweep, x, y = path[1]
+    assert letter == "A"
+    assert (rx, ry) == approx((20, 5))
+    assert angle % 180 == approx(0, abs=1e-9)
+    assert (large, sweep) == (0, 0)
+    assert (x, y) == approx((-40, 0))
+
+
+def test_bbox():
+    """
+    Verify bounding boxes of paths contain their curves.
+    """
+
+    drawing = Drawing(size=(UNIT, UNIT))
+    path = drawing.draw_path(
+        [("M", 10, 50), ("Q", 50, 10, 90, 50), ("L", 90, 90)],
+        properties=ShapeProperties(fill="none", stroke="black"),
+    )
+
+    bbox = path.bbox
+    assert bbox is not None
+
+    assert bbox.x_min <= 10 and bbox.x_max >= 90
+    assert bbox.y_min <= 30 and bbox.y_max >= 90
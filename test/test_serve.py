@@ -0,0 +1,127 @@
+import threading
+from typing import Generator
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from pytest import MonkeyPatch, fixture, raises
+
+from glyphsynth import RenderService
+from glyphsynth.drawing.serve import RenderError, create_server
+
+from .glyphs import BasicDrawing, BasicParams
+
+
+@fixture
+def base_url() -> Generator[str, None, None]:
+    server = create_server("127.0.0.1", 0, RenderService(allow=["test"]))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_render(base_url: str):
+    """
+    Render a drawing with params and verify caching headers.
+    """
+
+    url = f"{base_url}/test.glyphs.BasicDrawing.svg?color1=red&scale=2"
+
+    with urlopen(url) as response:
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "image/svg+xml"
+
+        etag = response.headers["ETag"]
+        content = response.read()
+
+    drawing = BasicDrawing(params=BasicParams(color1="red"))
+    assert content == drawing.render_svg(size=("200.0", "200.0")).encode()
+
+    # cached content is unchanged
+    with urlopen(url) as response:
+        assert response.headers["ETag"] == etag
+        assert response.read() == content
+
+    # not modified if etag matches
+    with raises(HTTPError) as e:
+        urlopen(Request(url, headers={"If-None-Match": etag}))
+    assert e.value.code == 304
+
+
+def test_render_errors(base_url: str):
+    cases = [
+        ("/test.glyphs.BasicDrawing.svg?scale=0", 400),
+        ("/test.glyphs.BasicDrawing.svg?scale=inf", 400),
+        ("/test.glyphs.BasicDrawing.png?scale=1000", 400),
+        ("/test.glyphs.BasicDrawing.svg?invalid=1", 400),
+        ("/test.glyphs.BasicDrawing.jpg", 400),
+        ("/test.glyphs.Missing.svg", 404),
+        ("/test.glyphs.BasicParams.svg", 404),
+        ("/glyphsynth.lib.alphabets.latin.runic.A.svg", 403),
+    ]
+
+    for path, status in cases:
+        with raises(HTTPError) as e:
+            urlopen(f"{base_url}{path}")
+        assert e.value.code == status, path
+
+
+def test_cache_limit():
+    """
+    Verify least recently used content is evicted.
+    """
+
+    service = RenderService(cache_limit=1200, allow=["test"])
+
+    for color in ["red", "green", "blue"]:
+        service.render("/test.glyphs.BasicDrawing.svg", {"color1": [color]})
+
+    assert 0 < service._cache_size <= 1200
+    assert len(service._cache) == 2
+
+    # most recently rendered are kept
+    assert [k[3] for k in service._cache] == [
+        (("color1", "green"), ("color2", "blue")),
+        (("color1", "blue"), ("color2", "blue")),
+    ]
+
+    # equivalent queries are cached once
+    service.render(
+        "/test.glyphs.BasicDrawing.svg",
+        {"color1": ["blue"], "color2": ["blue"]},
+    )
+    assert len(service._cache) == 2
+
+
+def test_loopback():
+    """
+    Verify the server can't be bound to non-local addresses.
+    """
+
+    for host in ["0.0.0.0", "192.168.0.1", "example.com"]:
+        with raises(ValueError):
+            create_server(host, 0, RenderService())
+
+    # only allowed modules are imported by default
+    with raises(RenderError) as e:
+        RenderService().render("/test.glyphs.BasicDrawing.svg", {})
+    assert e.value.status == 403
+
+
+def test_raster_unavailable(base_url: str, monkeypatch: MonkeyPatch):
+    """
+    Verify PNG requests fail without rsvg-convert, while SVG requests are
+    still served.
+    """
+
+    monkeypatch.setenv("PATH", "")
+
+    with raises(HTTPError) as e:
+        urlopen(f"{base_url}/test.glyphs.BasicDrawing.png")
+    assert e.value.code == 503
+
+    with urlopen(f"{base_url}/test.glyphs.BasicDrawing.svg") as response:
+        assert response.status == 200
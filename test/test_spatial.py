@@ -0,0 +1,69 @@
+import random
+
+from glyphsynth import BBox, Drawing, SpatialIndex
+from glyphsynth.lib import MatrixDrawing
+
+from .glyphs import UNIT, BasicDrawing
+
+SPACING = UNIT / 10
+
+
+def test_spatial_index():
+    """
+    Verify queries match a brute-force search.
+    """
+
+    rng = random.Random(0)
+    boxes: list[BBox] = []
+
+    for _ in range(5000):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        boxes.append(BBox(x, y, x + rng.uniform(0, 20), y + rng.uniform(0, 20)))
+
+    index = SpatialIndex((bbox, i) for i, bbox in enumerate(boxes))
+    assert len(index) == len(boxes)
+
+    for _ in range(100):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        query = BBox(x, y, x + 50, y + 50)
+
+        assert index.query_point(x, y) == [
+            i for i, bbox in enumerate(boxes) if bbox.contains_point(x, y)
+        ]
+        assert index.query_rect(query) == [
+            i for i, bbox in enumerate(boxes) if bbox.intersects(query)
+        ]
+
+    assert SpatialIndex([]).query_point(0, 0) == []
+
+
+def test_drawing_queries():
+    """
+    Verify hit-testing of nested drawings and elements.
+    """
+
+    cells = [
+        [BasicDrawing(drawing_id=f"basic-{r}-{c}") for c in range(20)]
+        for r in range(20)
+    ]
+    matrix = MatrixDrawing.new(cells, spacing=SPACING)
+
+    point = (3 * (UNIT + SPACING) + UNIT / 2, 7 * (UNIT + SPACING) + UNIT / 2)
+    assert matrix.get_children_at(*point) == [cells[7][3]]
+
+    # point in spacing between cells
+    assert matrix.get_children_at(UNIT + SPACING / 2, UNIT / 2) == []
+
+    region = BBox(0, 0, UNIT * 1.5, UNIT / 2)
+    assert matrix.get_children_in(region) == [cells[0][0], cells[0][1]]
+
+    # index is rebuilt after mutation
+    drawing = Drawing()
+    child = drawing.insert_drawing(BasicDrawing(), (0, 0))
+    circle = drawing.draw_circle((50, 50), 10)
+
+    assert drawing.get_children_at(50, 50) == [child, circle]
+
+    child.translate(200, 0)
+    assert drawing.get_children_at(50, 50) == [circle]
+    assert drawing.get_children_at(250, 50) == [child]